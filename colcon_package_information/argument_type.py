@@ -0,0 +1,68 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+import argparse
+
+
+def argument_collapse_by(value):
+    """
+    Check if an argument is a valid criteria to group packages by.
+
+    Used as a ``type`` callback in ``add_argument()`` calls.
+
+    :param str value: The command line argument
+    :returns: The criteria, either `path`, `prefix` or `metadata:<key>`
+    :raises argparse.ArgumentTypeError: if the value isn't a valid criteria
+    """
+    if value in ('path', 'prefix'):
+        return value
+    if value.startswith('metadata:') and len(value) > len('metadata:'):
+        return value
+    raise argparse.ArgumentTypeError(
+        "invalid choice: '{value}' (choose from 'path', 'prefix', "
+        "'metadata:KEY')".format_map(locals()))
+
+
+def argument_positive_int(value):
+    """
+    Check if an argument is a positive integer.
+
+    Used as a ``type`` callback in ``add_argument()`` calls.
+
+    :param str value: The command line argument
+    :returns: The integer
+    :rtype: int
+    :raises argparse.ArgumentTypeError: if the value isn't a positive integer
+    """
+    try:
+        value = int(value)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(
+            "invalid positive int value: '{value}'".format_map(locals()))
+    return value
+
+
+def argument_shard(value):
+    """
+    Check if an argument is a valid shard.
+
+    Used as a ``type`` callback in ``add_argument()`` calls.
+
+    :param str value: The command line argument in the form `K/N`
+    :returns: The one-based index of the shard and the number of shards
+    :rtype: tuple
+    :raises argparse.ArgumentTypeError: if the value isn't a valid shard
+    """
+    index, _, count = value.partition('/')
+    try:
+        index = int(index)
+        count = int(count)
+    except ValueError:
+        index = count = 0
+    if count < 1 or not (1 <= index <= count):
+        raise argparse.ArgumentTypeError(
+            "invalid shard: '{value}' (expected K/N with 1 <= K <= N)"
+            .format_map(locals()))
+    return index, count
@@ -0,0 +1,216 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+from collections import defaultdict
+from collections import namedtuple
+import re
+
+from colcon_package_information.reachability import iterate_bits
+from colcon_package_information.reachability import ReachabilityIndex
+
+"""The schedule of building packages with an unlimited number of workers."""
+BuildSchedule = namedtuple(
+    'BuildSchedule',
+    (
+        # the decorators of the longest chain of dependencies
+        'critical_path',
+        # the duration of the packages on the critical path
+        'critical_duration',
+        # the number of packages of each topological level
+        'level_widths',
+        # the largest number of packages being built at the same time
+        'max_workers',
+        # the sum of the durations of all packages
+        'total_duration',
+        # the durations of all packages indexed by decorator
+        'durations',
+    ))
+
+# a line of the event log written by colcon-output
+_EVENT_PATTERN = re.compile(
+    r'^\[(?P<time>[0-9.]+)s?\] \((?P<job>[^)]+)\) '
+    r'(?P<event>JobStarted|JobEnded):')
+
+
+def read_durations(path):
+    """
+    Read the durations of packages.
+
+    The file is either a JSON object mapping package names to durations in
+    seconds or the `events.log` file of a previous build, e.g.
+    `log/latest_build/events.log`, which contains the times when each job
+    started and ended.
+
+    :param str path: The path of the file
+    :returns: The durations in seconds indexed by package name
+    :rtype: dict
+    :raises OSError: if the file can't be read
+    :raises ValueError: if the file content isn't valid
+    """
+    with open(path, 'r') as h:
+        content = h.read()
+
+    if content.lstrip().startswith('{'):
+        import json
+        data = json.loads(content)
+        durations = {}
+        for name, duration in data.items():
+            if not isinstance(duration, (int, float)) or duration < 0:
+                raise ValueError(
+                    "Invalid duration '{duration}' of package '{name}'"
+                    .format_map(locals()))
+            durations[name] = float(duration)
+        return durations
+
+    start_times = {}
+    durations = {}
+    for line in content.splitlines():
+        match = _EVENT_PATTERN.match(line)
+        if match is None:
+            continue
+        job = match.group('job')
+        time = float(match.group('time'))
+        if match.group('event') == 'JobStarted':
+            start_times[job] = time
+        elif job in start_times:
+            durations[job] = time - start_times.pop(job)
+    if not durations and content.strip():
+        raise ValueError('Neither a JSON object nor an event log')
+    return durations
+
+
+def get_topological_levels(decorators):
+    """
+    Group the selected packages into levels.
+
+    Each package only depends on packages of earlier levels, therefore all
+    packages of a level can be processed in parallel once the earlier
+    levels have been processed.
+    The levels are computed with a single pass of Kahn's algorithm over the
+    recursive dependencies between the selected packages.
+    Packages which are part of a cycle between packages with the same name
+    are appended as a last level.
+
+    :param decorators: The topologically ordered package decorators
+    :returns: The levels, each a list of decorators in the order they were
+      passed
+    :rtype: list
+    """
+    shown_decorators = [d for d in decorators if d.selected]
+    positions_by_name = defaultdict(list)
+    for i, deco in enumerate(shown_decorators):
+        positions_by_name[deco.descriptor.name].append(i)
+
+    dependents = [[] for _ in shown_decorators]
+    in_degrees = [0] * len(shown_decorators)
+    for i, deco in enumerate(shown_decorators):
+        for name in deco.recursive_dependencies:
+            for j in positions_by_name.get(name, ()):
+                if j != i:
+                    dependents[j].append(i)
+                    in_degrees[i] += 1
+
+    levels = []
+    level = [i for i, in_degree in enumerate(in_degrees) if not in_degree]
+    count = 0
+    while level:
+        levels.append([shown_decorators[i] for i in level])
+        count += len(level)
+        next_level = []
+        for i in level:
+            for j in dependents[i]:
+                in_degrees[j] -= 1
+                if not in_degrees[j]:
+                    next_level.append(j)
+        level = sorted(next_level)
+
+    if count < len(shown_decorators):
+        levels.append([
+            shown_decorators[i] for i, in_degree in enumerate(in_degrees)
+            if in_degree])
+    return levels
+
+
+def get_build_schedule(decorators, *, durations=None):
+    """
+    Schedule the selected packages as early as their dependencies allow.
+
+    A package can only be built after all its recursive dependencies which
+    are selected have been built, the same way the executors of colcon order
+    the jobs.
+    Packages without a duration are assumed to take the average of the
+    passed durations.
+
+    :param decorators: The topologically ordered package decorators
+    :param dict durations: The durations in seconds indexed by package name,
+      if `None` every package takes one unit of time
+    :returns: The schedule
+    :rtype: :class:`BuildSchedule`
+    """
+    index = ReachabilityIndex(decorators)
+    shown_decorators = [d for d in decorators if d.selected]
+    shown_mask = index.get_mask(shown_decorators)
+    default_duration = 1.0
+    if durations:
+        default_duration = sum(durations.values()) / len(durations)
+
+    # the level, the finish time and the predecessor on the longest chain
+    # of dependencies by position
+    levels = {}
+    finish_times = {}
+    predecessors = {}
+    package_durations = {}
+    for deco in shown_decorators:
+        position = index.get_position(deco)
+        level = 0
+        start_time = 0.0
+        predecessor = None
+        for i in iterate_bits(
+            index.recursive_dependencies[position] & shown_mask
+        ):
+            # ignore packages with the same name ordered later
+            if i not in finish_times:
+                continue
+            level = max(level, levels[i] + 1)
+            if predecessor is None or finish_times[i] > start_time:
+                start_time = finish_times[i]
+                predecessor = i
+        duration = default_duration
+        if durations is not None:
+            duration = durations.get(deco.descriptor.name, default_duration)
+        package_durations[deco] = duration
+        levels[position] = level
+        finish_times[position] = start_time + duration
+        predecessors[position] = predecessor
+
+    critical_path = []
+    critical_duration = 0.0
+    if finish_times:
+        position = max(finish_times.keys(), key=finish_times.get)
+        critical_duration = finish_times[position]
+        while position is not None:
+            critical_path.append(index.decorators[position])
+            position = predecessors[position]
+        critical_path.reverse()
+
+    level_widths = [0] * (max(levels.values()) + 1 if levels else 0)
+    for level in levels.values():
+        level_widths[level] += 1
+
+    # count the packages being built at the same time, a package ending at
+    # the same time another one starts doesn't overlap
+    events = []
+    for position, finish_time in finish_times.items():
+        duration = package_durations[index.decorators[position]]
+        events.append((finish_time - duration, 1))
+        events.append((finish_time, -1))
+    events.sort()
+    max_workers = 0
+    workers = 0
+    for _, change in events:
+        workers += change
+        max_workers = max(max_workers, workers)
+
+    return BuildSchedule(
+        critical_path, critical_duration, level_widths, max_workers,
+        sum(package_durations.values()), package_durations)
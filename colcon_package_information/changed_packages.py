@@ -0,0 +1,119 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+import os
+
+
+class PathTrie:
+    """
+    Map paths to the packages containing them.
+
+    The trie is keyed by the components of the package paths, therefore
+    looking up a path only takes one step per component of the path
+    independent of the number of packages.
+    """
+
+    __slots__ = ('_root', )
+
+    def __init__(self, decorators):
+        """
+        Add the paths of all decorators.
+
+        Each package is added with its absolute path as well as with the
+        path after resolving symbolic links.
+
+        :param decorators: The package decorators
+        """
+        # each node maps path components to child nodes and `None` to the
+        # packages located at the path of the node
+        self._root = {}
+        for deco in decorators:
+            path = str(deco.descriptor.path)
+            for p in {os.path.abspath(path), os.path.realpath(path)}:
+                node = self._root
+                for part in _split_path(p):
+                    node = node.setdefault(part, {})
+                node.setdefault(None, []).append(deco)
+
+    def get_decorators(self, path):
+        """
+        Get the packages containing a path.
+
+        When packages are nested the innermost packages contain the path.
+
+        :param str path: The absolute path
+        :returns: The package decorators, usually only one unless multiple
+          packages share the same path
+        :rtype: list
+        """
+        node = self._root
+        decorators = node.get(None, [])
+        for part in _split_path(path):
+            node = node.get(part)
+            if node is None:
+                break
+            decorators = node.get(None, decorators)
+        return decorators
+
+
+def _split_path(path):
+    # normalize the separators, e.g. git uses forward slashes on Windows
+    return [part for part in os.path.normpath(path).split(os.sep) if part]
+
+
+def get_changed_paths(ref, *, cwd=None):
+    """
+    Get the paths of the files changed since a git reference.
+
+    The changes include committed and uncommitted changes to tracked files,
+    both the old and the new path of renamed files as well as untracked
+    files which aren't ignored.
+
+    :param str ref: The git reference, e.g. a branch name or a commit hash
+    :param str cwd: The directory within the git repository, defaults to the
+      current working directory
+    :returns: The absolute paths
+    :rtype: list
+    :raises RuntimeError: if invoking git failed
+    """
+    toplevel = _run_git(['rev-parse', '--show-toplevel'], cwd=cwd).strip()
+    output = _run_git(
+        ['diff', '--name-only', '--no-renames', '-z', ref, '--'],
+        cwd=toplevel)
+    output += _run_git(
+        ['ls-files', '--others', '--exclude-standard', '-z'], cwd=toplevel)
+    return [
+        os.path.normpath(os.path.join(toplevel, p))
+        for p in output.split('\0') if p]
+
+
+def _run_git(args, *, cwd):
+    import subprocess
+    try:
+        result = subprocess.run(
+            ['git'] + args, cwd=cwd, stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE, universal_newlines=True)
+    except OSError as e:  # noqa: F841
+        raise RuntimeError(
+            "Failed to invoke 'git': {e}".format_map(locals()))
+    if result.returncode:
+        message = result.stderr.strip()
+        raise RuntimeError(
+            "Failed to invoke 'git {args[0]}': {message}"
+            .format_map(locals()))
+    return result.stdout
+
+
+def read_changed_paths(stream):
+    """
+    Read the paths of changed files, one per line.
+
+    :param stream: The stream to read from
+    :returns: The absolute and normalized paths, relative paths are
+      considered to be relative to the current working directory
+    :rtype: list
+    """
+    return [
+        os.path.abspath(line) for line in (
+            line.rstrip('\r\n') for line in stream)
+        if line]
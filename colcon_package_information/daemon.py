@@ -0,0 +1,399 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+"""
+Long running process answering queries of the information verbs.
+
+The daemon keeps the identified package descriptors and their topological
+order in memory and answers `list`, `info` and `graph` queries received over
+a Unix domain socket with the same output as the verbs.
+Changes to the packages are detected on every query by comparing the
+fingerprints of all crawled locations, queries always use the descriptor
+cache.
+
+Start the daemon in the root of a workspace::
+
+  python -m colcon_package_information.daemon serve &
+
+and query it from the same directory::
+
+  python -m colcon_package_information.daemon query list --names-only
+
+If no daemon is running, or the platform doesn't support Unix domain
+sockets, the query is executed in the client process.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+
+# the client is intended to start quickly, therefore only the modules needed
+# for the communication are imported at module level
+
+"""The environment variable to override the default socket path."""
+SOCKET_ENVIRONMENT_VARIABLE = 'COLCON_PACKAGE_INFORMATION_SOCKET'
+
+"""The default socket path relative to the current working directory."""
+DEFAULT_SOCKET_PATH = os.path.join(
+    'build', '.colcon_package_information_daemon.sock')
+
+"""The names of the verbs which can be queried."""
+VERB_NAMES = ('graph', 'info', 'list')
+
+"""The global options of the command which can precede the verb name."""
+GLOBAL_OPTIONS = ('--log-base', '--log-level')
+
+"""The timeout in seconds of receiving a request and sending a response."""
+CONNECTION_TIMEOUT = 10.0
+
+
+def is_supported():
+    """
+    Check if the platform supports the daemon.
+
+    :returns: True if Unix domain sockets are available
+    :rtype: bool
+    """
+    return hasattr(socket, 'AF_UNIX')
+
+
+def get_default_socket_path():
+    """
+    Get the default path of the socket.
+
+    :returns: The value of the environment variable
+      `COLCON_PACKAGE_INFORMATION_SOCKET` if set, otherwise a path in the
+      default build base
+    :rtype: str
+    """
+    return os.environ.get(SOCKET_ENVIRONMENT_VARIABLE) or DEFAULT_SOCKET_PATH
+
+
+def query(socket_path, argv, *, cwd=None):
+    """
+    Send a query to a running daemon.
+
+    :param str socket_path: The path of the socket
+    :param list argv: The command line arguments starting with the global
+      options or the verb name
+    :param str cwd: The working directory to evaluate the query in, if
+      `None` the current working directory is used
+    :returns: The response containing the keys `stdout`, `stderr` and
+      `returncode`
+    :rtype: dict
+    :raises OSError: if no daemon is listening on the socket or the platform
+      doesn't support Unix domain sockets
+    """
+    request = {'argv': list(argv), 'cwd': cwd or os.getcwd()}
+    return _send(socket_path, request)
+
+
+def stop(socket_path):
+    """
+    Stop a running daemon.
+
+    :param str socket_path: The path of the socket
+    :raises OSError: if no daemon is listening on the socket or the platform
+      doesn't support Unix domain sockets
+    """
+    _send(socket_path, {'stop': True})
+
+
+def get_verb_error(argv):
+    """
+    Check if the command line arguments invoke a verb which can be queried.
+
+    :param list argv: The command line arguments starting with the global
+      options, see :data:`GLOBAL_OPTIONS`, or the verb name
+    :returns: An error message or `None` if the verb can be queried
+    :rtype: str
+    """
+    index = 0
+    while index < len(argv) and argv[index].startswith('-'):
+        option = argv[index].split('=', 1)[0]
+        if option not in GLOBAL_OPTIONS:
+            return 'Only the global options ' + ', '.join(GLOBAL_OPTIONS) + \
+                ' can precede the verb name'
+        # skip the separate value of the option
+        index += 1 if '=' in argv[index] else 2
+    if index >= len(argv) or argv[index] not in VERB_NAMES:
+        return 'Only the verbs ' + ', '.join(VERB_NAMES) + ' can be queried'
+    return None
+
+
+def _send(socket_path, request):
+    if not is_supported():
+        raise OSError('Unix domain sockets are not supported')
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode() + b'\n')
+        sock.shutdown(socket.SHUT_WR)
+        with sock.makefile('rb') as h:
+            return json.loads(h.read().decode())
+
+
+class QueryDaemon:
+    """Answer queries of the information verbs received over a socket."""
+
+    def __init__(self, socket_path, *, command_name='colcon'):
+        """
+        Prepare the argument parser for the verbs.
+
+        :param str socket_path: The path of the socket
+        :param str command_name: The name of the command
+        """
+        from colcon_core.command import add_subparsers
+        from colcon_core.command import create_parser
+        from colcon_package_information.descriptor_cache \
+            import keep_caches_in_memory
+        from colcon_package_information.topological_order \
+            import enable_memoization
+        from colcon_package_information.verb.graph import GraphVerb
+        from colcon_package_information.verb.info import InfoVerb
+        from colcon_package_information.verb.list import ListVerb
+
+        self.socket_path = socket_path
+        self.command_name = command_name
+
+        verb_extensions = {
+            'graph': GraphVerb(),
+            'info': InfoVerb(),
+            'list': ListVerb(),
+        }
+        for name, extension in verb_extensions.items():
+            extension.VERB_NAME = name
+        self._parser = create_parser()
+        self._parser.prog = command_name
+        add_subparsers(
+            self._parser, command_name, verb_extensions,
+            attribute='verb_name')
+
+        keep_caches_in_memory()
+        enable_memoization()
+
+    def serve(self):
+        """
+        Accept and answer queries until a stop request is received.
+
+        :raises RuntimeError: if another daemon is listening on the socket or
+          the platform doesn't support Unix domain sockets
+        """
+        if not is_supported():
+            raise RuntimeError(
+                'The daemon requires Unix domain sockets which are not '
+                'supported on this platform')
+        if os.path.exists(self.socket_path):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                try:
+                    sock.connect(self.socket_path)
+                except OSError:
+                    # remove stale socket of a previous daemon
+                    os.remove(self.socket_path)
+                else:
+                    socket_path = self.socket_path
+                    raise RuntimeError(
+                        'Another daemon is already listening on '
+                        "'{socket_path}'".format_map(locals()))
+        os.makedirs(
+            os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+
+        from colcon_core.logging import colcon_logger
+        logger = colcon_logger.getChild(__name__)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(self.socket_path)
+            try:
+                # only allow the current user to connect, independent of the
+                # umask, before accepting any connection
+                os.chmod(self.socket_path, 0o600)
+                sock.listen()
+                while True:
+                    connection, _ = sock.accept()
+                    with connection:
+                        connection.settimeout(CONNECTION_TIMEOUT)
+                        try:
+                            if self._handle_connection(connection):
+                                break
+                        except OSError as e:  # noqa: F841
+                            # a failing client must not stop the daemon
+                            logger.warning(
+                                'Failed to answer a query: {e}'
+                                .format_map(locals()))
+            finally:
+                os.remove(self.socket_path)
+
+    def _handle_connection(self, connection):
+        # returns True if the daemon should stop
+        with connection.makefile('rb') as h:
+            line = h.readline()
+        # ignore connections which only probe the socket
+        if not line:
+            return False
+        try:
+            request = json.loads(line.decode())
+            if not isinstance(request, dict):
+                raise ValueError('expected a JSON object')
+            if request.get('stop'):
+                connection.sendall(b'{}')
+                return True
+            argv = request.get('argv')
+            cwd = request.get('cwd')
+            if (
+                not isinstance(argv, list) or
+                not all(isinstance(arg, str) for arg in argv)
+            ):
+                raise ValueError("expected a list of strings as 'argv'")
+            if not isinstance(cwd, str):
+                raise ValueError("expected a string as 'cwd'")
+        except ValueError as e:  # noqa: F841
+            response = {
+                'stdout': '',
+                'stderr': '',
+                'returncode': 'Invalid request: {e}'.format_map(locals()),
+            }
+        else:
+            response = self.handle_query(argv, cwd)
+        connection.sendall(json.dumps(response).encode())
+        return False
+
+    def handle_query(self, argv, cwd):
+        """
+        Invoke a verb within the daemon process.
+
+        Since the working directory and the standard streams are process wide
+        state queries are handled sequentially.
+
+        :param list argv: The command line arguments starting with the global
+          options or the verb name
+        :param str cwd: The working directory to evaluate the query in
+        :returns: The response containing the keys `stdout`, `stderr` and
+          `returncode`
+        :rtype: dict
+        """
+        from contextlib import redirect_stderr
+        from contextlib import redirect_stdout
+        import io
+        import logging
+
+        from colcon_core.command import CommandContext
+        from colcon_core.command import verb_main
+        from colcon_core.logging import colcon_logger
+        from colcon_core.logging import get_numeric_log_level
+
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        previous_cwd = os.getcwd()
+        # forward log messages of this query to the client
+        handler = logging.StreamHandler(stderr)
+        handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+        colcon_logger.addHandler(handler)
+        previous_propagate = colcon_logger.propagate
+        colcon_logger.propagate = False
+        previous_level = colcon_logger.level
+        try:
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                try:
+                    os.chdir(cwd)
+                    error = get_verb_error(argv)
+                    if error is not None:
+                        raise ValueError(error)
+                    args = self._parser.parse_args(args=argv)
+                    args.cache = True
+                    colcon_logger.setLevel(
+                        get_numeric_log_level(args.log_level)
+                        if args.log_level else logging.WARNING)
+                    context = CommandContext(
+                        command_name=self.command_name, args=args)
+                    rc = verb_main(context, colcon_logger)
+                except SystemExit as e:
+                    rc = e.code
+                except Exception as e:  # noqa: B902
+                    rc = str(e)
+        finally:
+            os.chdir(previous_cwd)
+            colcon_logger.setLevel(previous_level)
+            colcon_logger.propagate = previous_propagate
+            colcon_logger.removeHandler(handler)
+
+        if not isinstance(rc, (int, str, type(None))):
+            rc = int(rc)
+        return {
+            'stdout': stdout.getvalue(),
+            'stderr': stderr.getvalue(),
+            'returncode': rc,
+        }
+
+
+def main(argv=None):
+    """
+    Run the daemon or a client.
+
+    :param list argv: The command line arguments
+    :returns: The return code
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m colcon_package_information.daemon',
+        description='Answer queries of the information verbs from a long '
+                    'running process')
+    parser.add_argument(
+        '--socket',
+        default=get_default_socket_path(),
+        help='The path of the Unix domain socket (default: {default}, '
+             'can be overridden by the environment variable {env})'.format(
+                 default=DEFAULT_SOCKET_PATH, env=SOCKET_ENVIRONMENT_VARIABLE))
+    subparsers = parser.add_subparsers(dest='action')
+    subparsers.required = True
+    subparsers.add_parser('serve', help='Start the daemon')
+    subparsers.add_parser('stop', help='Stop the daemon')
+    query_parser = subparsers.add_parser(
+        'query',
+        help='Query the daemon, falls back to invoking the verb in this '
+             'process if no daemon is running')
+    # the global options of the command are passed before the verb name
+    for option in GLOBAL_OPTIONS:
+        query_parser.add_argument(
+            option, help='Passed to the command, see its help')
+    query_parser.add_argument(
+        'verb_argv', nargs=argparse.REMAINDER, metavar='VERB_ARGS',
+        help='The verb name followed by its arguments')
+    args = parser.parse_args(argv)
+
+    if args.action == 'serve':
+        try:
+            QueryDaemon(args.socket).serve()
+        except RuntimeError as e:
+            return str(e)
+        return 0
+
+    if args.action == 'stop':
+        try:
+            stop(args.socket)
+        except OSError:
+            return 'No daemon is listening on ' + args.socket
+        return 0
+
+    verb_argv = []
+    for option in GLOBAL_OPTIONS:
+        value = getattr(args, option[2:].replace('-', '_'))
+        if value is not None:
+            verb_argv += [option, value]
+    verb_argv += args.verb_argv
+    error = get_verb_error(verb_argv)
+    if error is not None:
+        return error
+
+    try:
+        response = query(args.socket, verb_argv)
+    except OSError:
+        # invoke the verb without a daemon
+        from colcon_core.command import main as colcon_main
+        return colcon_main(argv=verb_argv)
+    sys.stdout.write(response['stdout'])
+    sys.stderr.write(response['stderr'])
+    return response['returncode']
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,464 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+from contextlib import ExitStack
+import os
+from pathlib import Path
+
+from colcon_core.logging import colcon_logger
+from colcon_core.package_identification \
+    import get_package_identification_extensions
+from colcon_core.package_selection import get_package_descriptors \
+    as get_package_descriptors_uncached
+from colcon_package_information import __version__
+from colcon_package_information.package_augmentation.\
+    check_dependency_constraint import reuse_dependency_constraints
+from colcon_package_information.package_identification \
+    import IdentificationRecord
+from colcon_package_information.package_identification \
+    import wrap_identification_extensions
+from colcon_package_information.parallel_identification \
+    import ParallelPackageIdentification
+
+logger = colcon_logger.getChild(__name__)
+
+"""The filename of the cache within the build base."""
+CACHE_FILENAME = '.colcon_package_information_cache'
+
+# the caches indexed by their path, only kept for long running processes
+_caches_in_memory = None
+
+
+def keep_caches_in_memory():
+    """
+    Keep the loaded caches in memory for the lifetime of the process.
+
+    This is only useful for long running processes which get the package
+    descriptors repeatedly, like the query daemon.
+    """
+    global _caches_in_memory
+    if _caches_in_memory is None:
+        _caches_in_memory = {}
+
+
+def add_descriptor_cache_arguments(parser):
+    """
+    Add the command line arguments to control the descriptor cache.
+
+    :param parser: The argument parser
+    """
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        default=False,
+        help='Reuse the identified packages of previous invocations from a '
+             'cache in the build base, the cache is only written if the '
+             'build base already exists')
+    parser.add_argument(
+        '--refresh-cache',
+        action='store_true',
+        default=False,
+        help='Identify all packages again and update the cache (implies '
+             '--cache), e.g. after changing files in subdirectories of a '
+             'package or environment variables which the identification or '
+             'augmentation reads, since only changes to the files directly '
+             'within a package directory and to the versions of the '
+             'identification and augmentation extensions are detected')
+
+
+def get_package_descriptors(args, *, additional_argument_names=None):
+    """
+    Get the package descriptors using the descriptor cache.
+
+    The function has the same semantic as
+    :func:`colcon_core.package_selection.get_package_descriptors`.
+    If the argument `cache` or `refresh_cache` is set the identification
+    extensions are only invoked for locations which changed since the
+    previous invocation.
+    If the argument `discovery_workers` is set the locations are identified
+    concurrently.
+    Both require a version of colcon-core which accepts the identification
+    extensions as an argument, otherwise a warning is logged and the
+    packages are identified sequentially without the cache.
+
+    :param args: The parsed command line arguments
+    :param additional_argument_names: A list of additional arguments to
+      consider
+    :returns: set of
+      :py:class:`colcon_core.package_descriptor.PackageDescriptor`
+    :rtype: set
+    """
+    use_cache = \
+        getattr(args, 'cache', False) or getattr(args, 'refresh_cache', False)
+    workers = getattr(args, 'discovery_workers', None)
+    if (use_cache or workers) and not _accepts_identification_extensions():
+        logger.warning(
+            "The options '--cache', '--refresh-cache' and "
+            "'--discovery-workers' require colcon-core 0.18.3 or newer")
+        use_cache = workers = None
+    if not use_cache and not workers:
+        return get_package_descriptors_uncached(
+            args, additional_argument_names=additional_argument_names)
+
+    identification_extensions = get_package_identification_extensions()
+    cache = None
+    if use_cache:
+        cache = _get_cache(
+            args, _get_extensions_key(identification_extensions))
+
+    with ExitStack() as stack:
+        parallel = None
+        if workers:
+            parallel = stack.enter_context(ParallelPackageIdentification(
+                identification_extensions, workers,
+                skip_location=cache.contains if cache is not None else None))
+        recorder = IdentificationRecorder(cache=cache, parallel=parallel)
+        if cache is not None:
+            stack.enter_context(reuse_dependency_constraints(recorder))
+        descriptors = get_package_descriptors_uncached(
+            args, additional_argument_names=additional_argument_names,
+            identification_extensions=wrap_identification_extensions(
+                identification_extensions, recorder.get_record))
+
+    if cache is not None:
+        recorder.update_cache(descriptors)
+        cache.save()
+    return descriptors
+
+
+def _accepts_identification_extensions():
+    # the argument was added in colcon-core 0.18.3
+    import inspect
+    parameters = inspect.signature(
+        get_package_descriptors_uncached).parameters.values()
+    return any(
+        p.name == 'identification_extensions' or p.kind == p.VAR_KEYWORD
+        for p in parameters)
+
+
+def _get_cache(args, key):
+    cache_path = Path(args.build_base).resolve() / CACHE_FILENAME
+    cache = None
+    if _caches_in_memory is not None and not args.refresh_cache:
+        cache = _caches_in_memory.get(cache_path)
+        if cache is not None and cache.key != key:
+            cache = None
+    if cache is None:
+        cache = DescriptorCache(cache_path, key=key)
+        if not args.refresh_cache:
+            cache.load()
+        if _caches_in_memory is not None:
+            _caches_in_memory[cache_path] = cache
+    return cache
+
+
+def _get_extensions_key(identification_extensions):
+    # the cached results are only valid for the same set of extensions in the
+    # same versions, the augmentation extensions are considered too since
+    # they can modify the dependencies whose constraints are cached
+    from colcon_core.extension_point import get_all_extension_points
+    all_entry_points = get_all_extension_points()
+    entry_points = all_entry_points.get(
+        'colcon_core.package_identification', {})
+    augmentation_entry_points = all_entry_points.get(
+        'colcon_core.package_augmentation', {})
+    return (__version__, ) + tuple(
+        (
+            priority, name, getattr(extension, '__module__', None),
+            entry_points.get(name, (None, None, None))[1:],
+        )
+        for priority, extensions in identification_extensions.items()
+        for name, extension in extensions.items()
+    ) + tuple(sorted(
+        (name, ) + entry_point[1:]
+        for name, entry_point in augmentation_entry_points.items()))
+
+
+class DescriptorCache:
+    """
+    Persisted records of the package identification for each location.
+
+    Each entry is keyed by the absolute path of the location and stores a
+    fingerprint of the files in that directory.
+    The record and the dependency constraints of the package in that location
+    are only considered valid as long as the fingerprint matches.
+    Entries of locations which don't exist anymore are evicted when the cache
+    is saved.
+    """
+
+    def __init__(self, path, *, key=None):
+        """
+        Create an empty cache.
+
+        :param Path path: The path of the cache file
+        :param key: A picklable value identifying the producer of the entries,
+          cache files with a different key are discarded when being loaded
+        """
+        self.path = path
+        self.key = key
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._modified = False
+
+    def load(self):
+        """Load the entries from the cache file if it is valid."""
+        import pickle
+        try:
+            with self.path.open('rb') as h:
+                key, entries = pickle.load(h)
+        except FileNotFoundError:
+            return
+        except Exception as e:  # noqa: B902 F841
+            logger.warning(
+                "Failed to load the descriptor cache '{self.path}': {e}"
+                .format_map(locals()))
+            return
+        if key != self.key:
+            logger.debug(
+                "Discarding the descriptor cache '{self.path}' created by "
+                'different identification extensions'.format_map(locals()))
+            self._modified = True
+            return
+        self._entries = entries
+
+    def save(self):
+        """
+        Save the entries to the cache file if any changed.
+
+        The cache file is only written if its parent directory exists, so
+        that commands which only query information don't create the build
+        base.
+        """
+        # evict entries of locations which have been removed as well as
+        # records which can't be replayed
+        for location, (_, record, _) in list(self._entries.items()):
+            if not os.path.isdir(location) or not record.replayable:
+                del self._entries[location]
+                self._modified = True
+
+        if not self._modified:
+            return
+
+        if not self.path.parent.is_dir():
+            logger.debug(
+                "Not saving the descriptor cache '{self.path}' since the "
+                'directory does not exist'.format_map(locals()))
+            return
+
+        try:
+            # write to a temporary file first to replace the cache atomically
+            temp_path = self.path.with_name(
+                self.path.name + '.' + str(os.getpid()))
+            import pickle
+            with temp_path.open('wb') as h:
+                pickle.dump(
+                    (self.key, self._entries), h,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(str(temp_path), str(self.path))
+        except Exception as e:  # noqa: B902 F841
+            # e.g. metadata added by augmentation extensions can't be pickled
+            logger.warning(
+                "Failed to save the descriptor cache '{self.path}': {e}"
+                .format_map(locals()))
+            return
+        self._modified = False
+
+    def get(self, location, fingerprint):
+        """
+        Get the cached record for a location.
+
+        :param str location: The absolute path of the location
+        :param fingerprint: The current fingerprint of the location
+        :returns: The cached record
+        :rtype: IdentificationRecord
+        :raises KeyError: if there is no entry with a matching fingerprint
+        """
+        entry = self._entries.get(location)
+        if entry is None or entry[0] != fingerprint:
+            self.misses += 1
+            raise KeyError(location)
+        self.hits += 1
+        return entry[1]
+
+    def get_constraints(self, location):
+        """
+        Get the cached dependency constraints for a location.
+
+        :param str location: The absolute path of the location
+        :returns: The constraints passed to :meth:`put` or `None`
+        """
+        entry = self._entries.get(location)
+        return entry[2] if entry is not None else None
+
+    def contains(self, location):
+        """
+        Check if the cache has a valid entry for a location.
+
+        :param str location: The path of the location
+        :returns: True if the entry matches the current fingerprint
+        :rtype: bool
+        """
+        location = os.path.abspath(location)
+        entry = self._entries.get(location)
+        return entry is not None and \
+            entry[0] == get_location_fingerprint(location)
+
+    def put(self, location, fingerprint, record, *, constraints=None):
+        """
+        Store the record for a location.
+
+        :param str location: The absolute path of the location
+        :param fingerprint: The current fingerprint of the location
+        :param record: The :class:`IdentificationRecord`
+        :param constraints: The dependency constraints of the package in the
+          location, see
+          :func:`colcon_package_information.package_augmentation.check_dependency_constraint.reuse_dependency_constraints`
+        """
+        self._entries[location] = (fingerprint, record, constraints)
+        self._modified = True
+
+
+class IdentificationRecorder:
+    """
+    Provide the records of the locations identified in one invocation.
+
+    The record of a location is taken from the cache if its fingerprint
+    matches, otherwise from the worker processes identifying locations ahead
+    of time.
+    If neither has a record the identification extensions are invoked in this
+    process and their outcomes are recorded.
+
+    The recorder also provides the dependency constraints of packages whose
+    record was taken from the cache unchanged, see
+    :func:`colcon_package_information.package_augmentation.check_dependency_constraint.reuse_dependency_constraints`.
+    """
+
+    def __init__(self, *, cache=None, parallel=None):
+        """
+        Create a recorder.
+
+        :param cache: An optional :class:`DescriptorCache`
+        :param parallel: An optional
+          :class:`colcon_package_information.parallel_identification.ParallelPackageIdentification`
+        """
+        self._cache = cache
+        self._parallel = parallel
+        # the fingerprint, record and number of cached outcomes indexed by
+        # location
+        self._records = {}
+        # the dependency constraints indexed by location
+        self._constraints = {}
+        self._modified_constraints = set()
+
+    def get_record(self, location):
+        """
+        Get the record of a location.
+
+        :param str location: The absolute path of the location
+        :returns: The record
+        :rtype: IdentificationRecord
+        """
+        entry = self._records.get(location)
+        if entry is not None:
+            return entry[1]
+
+        fingerprint = None
+        record = None
+        outcome_count = None
+        if self._cache is not None:
+            fingerprint = get_location_fingerprint(location)
+            if fingerprint is not None:
+                try:
+                    record = self._cache.get(location, fingerprint)
+                except KeyError:
+                    pass
+        if record is not None:
+            # the record is only stored again if outcomes are added
+            outcome_count = len(record.outcomes)
+            self._constraints[location] = \
+                self._cache.get_constraints(location)
+            if self._parallel is not None and not record.is_package:
+                self._parallel.speculate_below(location)
+        elif self._parallel is not None:
+            record = self._parallel.get_record(location)
+        if record is None or not record.replayable:
+            record = IdentificationRecord()
+
+        self._records[location] = (fingerprint, record, outcome_count)
+        return record
+
+    def get_constraints(self, location):
+        """
+        Get the dependency constraints of an unchanged package.
+
+        :param str location: The absolute path of the location
+        :returns: The constraints or `None` if the identification of the
+          location wasn't taken from the cache unchanged
+        """
+        entry = self._records.get(location)
+        if entry is None:
+            return None
+        _, record, outcome_count = entry
+        if outcome_count != len(record.outcomes):
+            return None
+        return self._constraints.get(location)
+
+    def set_constraints(self, location, constraints):
+        """
+        Set the dependency constraints of a package.
+
+        :param str location: The absolute path of the location
+        :param constraints: The constraints
+        """
+        if constraints != self._constraints.get(location):
+            self._constraints[location] = constraints
+            self._modified_constraints.add(location)
+
+    def update_cache(self, descriptors):
+        """
+        Store the new and extended records in the cache.
+
+        :param descriptors: The discovered package descriptors
+        """
+        package_locations = {
+            os.path.abspath(str(d.path)) for d in descriptors}
+        for location, (fingerprint, record, outcome_count) in \
+                self._records.items():
+            if fingerprint is None:
+                continue
+            record.is_package = location in package_locations
+            if (
+                outcome_count != len(record.outcomes) or
+                location in self._modified_constraints
+            ):
+                self._cache.put(
+                    location, fingerprint, record,
+                    constraints=self._constraints.get(location))
+
+
+def get_location_fingerprint(path):
+    """
+    Get the fingerprint of a location.
+
+    The fingerprint contains the name, modification time and size of every
+    file directly within the directory as well as the modification time of the
+    directory itself, which changes when entries are added or removed.
+
+    :param str path: The path of the location
+    :returns: The fingerprint or `None` if the location can't be read
+    :rtype: tuple
+    """
+    files = []
+    try:
+        st = os.stat(path)
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    entry_st = entry.stat()
+                    files.append(
+                        (entry.name, entry_st.st_mtime_ns, entry_st.st_size))
+    except OSError:
+        return None
+    files.sort()
+    return (st.st_mtime_ns, tuple(files))
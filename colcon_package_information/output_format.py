@@ -0,0 +1,91 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+import sys
+
+"""The supported output formats."""
+OUTPUT_FORMATS = ('text', 'json', 'jsonl')
+
+"""The number of packages written to the output at once."""
+BUFFERED_PACKAGES = 256
+
+
+def add_format_argument(parser):
+    """
+    Add the command line argument to choose the output format.
+
+    :param parser: The argument parser
+    """
+    parser.add_argument(
+        '--format',
+        choices=OUTPUT_FORMATS,
+        default='text',
+        help='The output format, either human readable text, a JSON array '
+             'or one JSON object per line (default: text)')
+
+
+def get_package_data(pkg):
+    """
+    Get the information of a package as JSON serializable data.
+
+    :param pkg: The package descriptor
+    :returns: The path, type, name, dependencies by category, hooks and
+      metadata of the package
+    :rtype: dict
+    """
+    return {
+        'path': str(pkg.path),
+        'type': pkg.type,
+        'name': pkg.name,
+        'dependencies': {
+            category: sorted(pkg.dependencies[category])
+            for category in sorted(pkg.dependencies.keys())},
+        'hooks': list(pkg.hooks),
+        'metadata': {
+            key: pkg.metadata[key] for key in sorted(pkg.metadata.keys())},
+    }
+
+
+def write_json(objects, output_format, *, file=None):
+    """
+    Write objects as JSON.
+
+    Each object is encoded once and the encoded objects are written in
+    batches of :data:`BUFFERED_PACKAGES`.
+    Values which aren't JSON serializable are converted, sets to sorted lists
+    and everything else to its string representation.
+
+    :param objects: An iterable of objects
+    :param str output_format: Either `json` to write a single array
+      containing all objects or `jsonl` to write one object per line
+    :param file: The stream to write to, defaults to `sys.stdout`
+    """
+    if file is None:
+        file = sys.stdout
+    import json
+    encode = json.JSONEncoder(default=_get_serializable).encode
+
+    chunk = []
+    count = 0
+    for obj in objects:
+        data = encode(obj)
+        if output_format == 'json':
+            chunk.append((',\n' if count else '[\n') + data)
+        else:
+            chunk.append(data + '\n')
+        count += 1
+        if len(chunk) >= BUFFERED_PACKAGES:
+            file.write(''.join(chunk))
+            chunk.clear()
+    if output_format == 'json':
+        chunk.append('\n]\n' if count else '[]\n')
+    file.write(''.join(chunk))
+
+
+def _get_serializable(value):
+    if isinstance(value, (set, frozenset)):
+        try:
+            return sorted(value)
+        except TypeError:
+            return list(value)
+    return str(value)
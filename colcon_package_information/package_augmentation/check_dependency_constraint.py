@@ -1,16 +1,87 @@
 # Copyright 2019 Dirk Thomas
 # Licensed under the Apache License, Version 2.0
 
+from collections import namedtuple
+from contextlib import contextmanager
 import operator
+import os
 
+from colcon_core.environment_variable import EnvironmentVariable
 from colcon_core.package_augmentation import logger as \
     package_augmentation_logger
 from colcon_core.package_augmentation import PackageAugmentationExtensionPoint
 from colcon_core.plugin_system import satisfies_version
-from packaging.version import Version
 
 logger = package_augmentation_logger.getChild('check_dependency_constraint')
 
+"""Environment variable to report all violated constraints in one summary"""
+CONSTRAINT_REPORT_ENVIRONMENT_VARIABLE = EnvironmentVariable(
+    'COLCON_DEPENDENCY_CONSTRAINT_REPORT',
+    'Report all violated dependency constraints in a single summary instead '
+    'of one warning each')
+
+"""Environment variable to write the violated constraints to a JSON file"""
+CONSTRAINT_REPORT_FILE_ENVIRONMENT_VARIABLE = EnvironmentVariable(
+    'COLCON_DEPENDENCY_CONSTRAINT_REPORT_FILE',
+    'Write the violated dependency constraints grouped by the depended-on '
+    'package to a JSON file (implies the summary report)')
+
+"""A violated dependency constraint."""
+ConstraintViolation = namedtuple(
+    'ConstraintViolation',
+    (
+        'package', 'package_path', 'dependency', 'dependency_path', 'version',
+        'operator', 'constraint'))
+
+"""The outcomes of checking a single constraint."""
+INVALID_CONSTRAINT = 'invalid'
+VIOLATED_CONSTRAINT = 'violated'
+SATISFIED_CONSTRAINT = 'satisfied'
+
+"""The supported version operators and their description by metadata key."""
+OPERATORS = {
+    'version_lt': (operator.lt, 'less than'),
+    'version_lte': (operator.le, 'less than or equal to'),
+    'version_eq': (operator.eq, 'equal to'),
+    'version_neq': (operator.ne, 'not equal to'),
+    'version_gte': (operator.ge, 'greater than or equal to'),
+    'version_gt': (operator.gt, 'greater than'),
+    # a PEP 440 version specifier, e.g. '>=1.2,<2.0,!=1.5.*'
+    'version_specifier': (None, 'in the range'),
+}
+
+"""The metadata key of a dependency containing a version specifier."""
+SPECIFIER_KEY = 'version_specifier'
+
+# the provider of the constraints of unchanged packages, see
+# reuse_dependency_constraints()
+_constraints_provider = None
+
+
+@contextmanager
+def reuse_dependency_constraints(provider):
+    """
+    Reuse the dependency constraints of unchanged packages.
+
+    While the context is active the dependencies of a package are only
+    collected if the provider doesn't have the constraints of the package
+    from a previous invocation.
+    The outcome of checking a constraint is reused as long as the version of
+    the depended-on package is unchanged.
+
+    :param provider: An object with a method `get_constraints(location)`
+      returning the constraints of the package in the absolute path of the
+      location previously passed to `set_constraints(location, constraints)`
+      or `None` if the package changed since then
+    """
+    global _constraints_provider
+    previous_provider = _constraints_provider
+    _constraints_provider = provider
+    try:
+        yield
+    finally:
+        _constraints_provider = previous_provider
+
 
 class CheckDependencyConstraintPackageAugmentation(
     PackageAugmentationExtensionPoint
@@ -29,64 +100,275 @@ class CheckDependencyConstraintPackageAugmentation(
     def augment_packages(  # noqa: D102
         self, descs, *, additional_argument_names=None
     ):
-        descs_dict = {desc.name: desc for desc in descs}
-        for name, desc in descs_dict.items():
-            deps = desc.get_dependencies()
-            for dep in deps:
-                # skip dependencies which don't have a descriptor
-                if dep.name not in descs_dict:
-                    continue
+        # multiple packages can have the same name, a dependency on that name
+        # is checked against all of them like the topological order does
+        descs_by_name = {}
+        for desc in descs:
+            descs_by_name.setdefault(desc.name, []).append(desc)
+        # the parsed versions and specifiers, shared by all packages
+        parsed = _ParsedConstraints()
+        report_file = os.environ.get(
+            CONSTRAINT_REPORT_FILE_ENVIRONMENT_VARIABLE.name)
+        # collect the violations instead of logging each one
+        violations = None
+        if report_file or os.environ.get(
+            CONSTRAINT_REPORT_ENVIRONMENT_VARIABLE.name
+        ):
+            violations = []
+        provider = _constraints_provider
+        for desc in descs:
+            location = os.path.abspath(str(desc.path))
+            constraints = None
+            if provider is not None:
+                constraints = provider.get_constraints(location)
+            if constraints is None:
+                constraints = (_get_dependency_constraints(desc), {})
+            dependency_constraints, previous_outcomes = constraints
 
-                self._check_version_constraints(
-                    desc, dep, descs_dict[dep.name])
+            outcomes_by_edge = {}
+            outcomes = []
+            for dep_name, dep_constraints in dependency_constraints:
+                # skip dependencies which don't have a descriptor
+                for dep_desc in descs_by_name.get(dep_name, ()):
+                    dep_path = str(dep_desc.path)
+                    dep_version_str = dep_desc.metadata.get('version')
+                    edge = (dep_name, dep_path, dep_version_str)
+                    try:
+                        edge_outcomes = previous_outcomes.get(edge)
+                    except TypeError:
+                        # unhashable versions are checked every time
+                        edge = edge_outcomes = None
+                    if edge_outcomes is None:
+                        edge_outcomes = self._check_version_constraints(
+                            [(
+                                dep_name, dep_path, dep_constraints,
+                                dep_version_str)],
+                            parsed)
+                    if edge is not None:
+                        outcomes_by_edge[edge] = edge_outcomes
+                    outcomes += edge_outcomes
+            if provider is not None:
+                provider.set_constraints(
+                    location, (dependency_constraints, outcomes_by_edge))
+            if outcomes:
+                _report_outcomes(
+                    (desc.name, str(desc.path)), outcomes, violations)
 
-    def _check_version_constraints(self, desc, dep, dep_desc):
-        # if the dependency descriptor doesn't have a version there is nothing
-        # to compare to
-        if 'version' not in dep_desc.metadata:
+        if violations is None:
             return
-        try:
-            dep_version = Version(dep_desc.metadata['version'])
-        except Exception:  # noqa: B902
-            # skip check if the version fails to parse
-            return
-
-        def lte(a, b):
-            return operator.lt(a, b) or operator.eq(a, b)
-
-        def gte(a, b):
-            return operator.gt(a, b) or operator.eq(a, b)
-
-        operators = {
-            'version_lt': (operator.lt, 'less than'),
-            'version_lte': (lte, 'less than or equal to'),
-            'version_eq': (operator.eq, 'equal to'),
-            'version_neq': (operator.ne, 'not equal to'),
-            'version_gte': (gte, 'greater than or equal to'),
-            'version_gt': (operator.gt, 'greater than'),
-        }
-        for key, value in dep.metadata.items():
-            # only consider version operator metadata
-            if key not in operators:
-                continue
-            op, msg = operators[key]
+        report = get_violation_report(violations)
+        if report:
+            logger.warning(format_violation_report(report))
+        if report_file:
+            import json
             try:
-                version_constraint = Version(value)
-            except Exception:  # noqa: B902
+                with open(report_file, 'w') as h:
+                    json.dump(report, h, indent=2)
+                    h.write('\n')
+            except OSError as e:  # noqa: F841
                 logger.error(
-                    "Failed to parse version '" + value + "' with " +
-                    "constraint '" + msg + "' for dependency " + dep.name +
-                    ' in package ' + desc.name)
+                    'Failed to write the dependency constraint report to '
+                    "'{report_file}': {e}".format_map(locals()))
+
+    def _check_version_constraints(self, edges, parsed):
+        outcomes = []
+        for dep_name, dep_path, constraints, dep_version_str in edges:
+            # if the dependency descriptor doesn't have a version there is
+            # nothing to compare to
+            if dep_version_str is None:
+                continue
+            dep_version = parsed.get_version(dep_version_str)
+            if dep_version is None:
                 # skip check if the version fails to parse
                 continue
 
-            if not op(dep_version, version_constraint):
-                logger.warning(
-                    desc.name + ' depends on ' + dep.name +
-                    ' which has version ' + dep_desc.metadata['version'] +
-                    ' but expects it to be ' + msg + ' ' + value)
-            else:
-                logger.debug(
-                    desc.name + ' depends on ' + dep.name +
-                    ' which has version ' + dep_desc.metadata['version'] +
-                    ' which satisfies to be ' + msg + ' ' + value)
+            for key, value in constraints:
+                if key == SPECIFIER_KEY:
+                    specifier = parsed.get_specifier(value)
+                    satisfied = None if specifier is None else \
+                        parsed.contains(specifier, dep_version)
+                else:
+                    version_constraint = parsed.get_version(value)
+                    satisfied = None if version_constraint is None else \
+                        OPERATORS[key][0](dep_version, version_constraint)
+                if satisfied is None:
+                    # skip check if the version fails to parse
+                    outcome = INVALID_CONSTRAINT
+                elif not satisfied:
+                    outcome = VIOLATED_CONSTRAINT
+                else:
+                    outcome = SATISFIED_CONSTRAINT
+                outcomes.append((
+                    outcome, dep_name, dep_path, dep_version_str, key,
+                    value))
+        return outcomes
+
+
+def _get_dependency_constraints(desc):
+    constraints = []
+    for dep in desc.get_dependencies():
+        # only consider version operator metadata
+        dep_constraints = [
+            (key, value) for key, value in dep.metadata.items()
+            if key in OPERATORS]
+        if dep_constraints:
+            constraints.append((dep.name, dep_constraints))
+    return constraints
+
+
+def _report_outcomes(package, outcomes, violations):
+    name, path = package
+    for outcome, dep_name, dep_path, dep_version_str, key, value in outcomes:
+        msg = OPERATORS[key][1]
+        if outcome == INVALID_CONSTRAINT:
+            logger.error(
+                "Failed to parse version '%s' with constraint '%s' for "
+                'dependency %s in package %s', value, msg, dep_name, name)
+        elif outcome == VIOLATED_CONSTRAINT:
+            if violations is not None:
+                violations.append(ConstraintViolation(
+                    name, path, dep_name, dep_path, dep_version_str, key,
+                    value))
+                continue
+            logger.warning(
+                '%s depends on %s which has version %s but expects it to '
+                'be %s %s', name, dep_name, dep_version_str, msg, value)
+        else:
+            logger.debug(
+                '%s depends on %s which has version %s which satisfies '
+                'to be %s %s', name, dep_name, dep_version_str, msg, value)
+
+
+def get_violation_report(violations):
+    """
+    Group violated dependency constraints by the depended-on package.
+
+    :param violations: An iterable of :class:`ConstraintViolation`
+    :returns: A list with one dictionary per depended-on package sorted by
+      name and path with the keys `dependency`, `path`, `version` and
+      `dependents`, the latter being a list of dictionaries with the keys
+      `package`, `path`, `operator` and `constraint` sorted by package name
+      and path
+    :rtype: list
+    """
+    report = []
+    entries = {}
+    for violation in sorted(violations, key=lambda v: (
+        v.dependency, v.dependency_path, v.package, v.package_path,
+        v.operator,
+    )):
+        dependency = (violation.dependency, violation.dependency_path)
+        entry = entries.get(dependency)
+        if entry is None:
+            entry = entries[dependency] = {
+                'dependency': violation.dependency,
+                'path': violation.dependency_path,
+                'version': violation.version,
+                'dependents': [],
+            }
+            report.append(entry)
+        entry['dependents'].append({
+            'package': violation.package,
+            'path': violation.package_path,
+            'operator': violation.operator,
+            'constraint': violation.constraint,
+        })
+    return report
+
+
+def format_violation_report(report):
+    """
+    Format a report of violated dependency constraints.
+
+    The paths of packages are only included if multiple packages with the
+    same name are part of the report.
+
+    :param report: The report as returned by :func:`get_violation_report`
+    :returns: A message with one line per depended-on package
+    :rtype: str
+    """
+    paths_by_name = {}
+    for entry in report:
+        paths_by_name.setdefault(entry['dependency'], set()).add(
+            entry['path'])
+        for dependent in entry['dependents']:
+            paths_by_name.setdefault(dependent['package'], set()).add(
+                dependent['path'])
+
+    def get_label(name, path):
+        if len(paths_by_name[name]) > 1:
+            return name + ' in ' + path
+        return name
+
+    count = sum(len(entry['dependents']) for entry in report)
+    lines = [
+        '{count} dependency constraints are violated:'.format_map(locals())]
+    for entry in report:
+        label = get_label(entry['dependency'], entry['path'])
+        dependents = ', '.join(
+            get_label(d['package'], d['path']) + ' (' +
+            OPERATORS[d['operator']][1] + ' ' + d['constraint'] + ')'
+            for d in entry['dependents'])
+        lines.append(
+            '- {label} {entry[version]} is expected by {dependents}'
+            .format_map(locals()))
+    return '\n'.join(lines)
+
+
+# the parsers are only imported when a constraint needs to be checked
+def _parse_version(value):
+    from packaging.version import Version
+    return Version(value)
+
+
+def _parse_specifier(value):
+    from packaging.specifiers import SpecifierSet
+    return SpecifierSet(value)
+
+
+class _ParsedConstraints:
+    """Parse each version and specifier only once."""
+
+    def __init__(self):
+        # the parsed values indexed by their string, None if they are invalid
+        self._versions = {}
+        self._specifiers = {}
+        # a single instance for all equivalent specifiers
+        self._unique_specifiers = {}
+        # the result of checking a version against a specifier
+        self._contains = {}
+
+    def get_version(self, value):
+        return self._parse(self._versions, _parse_version, value)
+
+    def get_specifier(self, value):
+        specifier = self._parse(self._specifiers, _parse_specifier, value)
+        if specifier is None:
+            return None
+        return self._unique_specifiers.setdefault(specifier, specifier)
+
+    def contains(self, specifier, version):
+        key = (specifier, version)
+        try:
+            return self._contains[key]
+        except KeyError:
+            pass
+        # consider pre-releases like the version operators do
+        result = self._contains[key] = specifier.contains(
+            version, prereleases=True)
+        return result
+
+    def _parse(self, cache, parser, value):
+        try:
+            return cache[value]
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable values can't be valid
+            return None
+        try:
+            result = parser(value)
+        except Exception:  # noqa: B902
+            result = None
+        cache[value] = result
+        return result
@@ -0,0 +1,151 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+from collections import OrderedDict
+import copy
+import os
+
+from colcon_core.package_descriptor import PackageDescriptor
+from colcon_core.package_identification import IgnoreLocationException
+
+"""The attributes of a descriptor which are populated by identification."""
+PACKAGE_DATA_ATTRIBUTES = tuple(
+    name for name in PackageDescriptor.__slots__ if name != 'path')
+
+"""The recorded outcome of an extension which ignored the location."""
+IGNORED = False
+
+
+def dump_package_data(desc):
+    """
+    Serialize the identified information of a package descriptor.
+
+    :param desc: The package descriptor
+    :returns: The pickled information
+    :rtype: bytes
+    :raises Exception: if the information can't be pickled, e.g. because the
+      metadata contains callables
+    """
+    import pickle
+    return pickle.dumps(
+        _get_package_data(desc), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_package_data(desc, data):
+    """
+    Restore the identified information of a package descriptor.
+
+    :param desc: The package descriptor being updated
+    :param bytes data: The information as returned by
+      :func:`dump_package_data`
+    """
+    import pickle
+    for name, value in zip(PACKAGE_DATA_ATTRIBUTES, pickle.loads(data)):
+        setattr(desc, name, value)
+
+
+def _get_package_data(desc):
+    return tuple(getattr(desc, name) for name in PACKAGE_DATA_ATTRIBUTES)
+
+
+def wrap_identification_extensions(extensions, get_record):
+    """
+    Wrap identification extensions to record and replay their outcomes.
+
+    The wrapped extensions are passed to the unmodified identification
+    functions of colcon-core, therefore the order of the extensions, the
+    handling of ambiguous results and of ignored locations is preserved.
+
+    :param extensions: The identification extensions grouped by priority
+    :param get_record: A callable which is passed the absolute path of a
+      location and returns the :class:`IdentificationRecord` of that location
+      or `None` to invoke the extensions without recording their outcomes
+    :returns: The wrapped extensions grouped by priority
+    :rtype: OrderedDict
+    """
+    return OrderedDict(
+        (priority, OrderedDict(
+            (name, RecordingPackageIdentification(name, extension, get_record))
+            for name, extension in group.items()))
+        for priority, group in extensions.items())
+
+
+class IdentificationRecord:
+    """
+    The recorded outcomes of the identification extensions in one location.
+
+    Each outcome is a tuple of the extension name, the identified information
+    of the descriptor passed to the extension and the result, which is either
+    `None` if the extension didn't change the descriptor, the changed
+    information as returned by :func:`dump_package_data` or :attr:`IGNORED`.
+    """
+
+    __slots__ = ('outcomes', 'replayable', 'is_package')
+
+    def __init__(self):
+        """Create an empty record."""
+        self.outcomes = []
+        # False if an outcome couldn't be recorded, e.g. since the changed
+        # information can't be pickled
+        self.replayable = True
+        # if the location contains a package, None if not known yet
+        self.is_package = None
+
+
+class RecordingPackageIdentification:
+    """
+    Identification extension recording or replaying another extension.
+
+    The class implements the interface of
+    :class:`colcon_core.package_identification.PackageIdentificationExtensionPoint`.
+    If the record of the location contains an outcome of the wrapped extension
+    for the same descriptor information it is replayed, otherwise the wrapped
+    extension is invoked and its outcome is added to the record.
+    """
+
+    def __init__(self, name, extension, get_record):
+        """
+        Wrap an identification extension.
+
+        :param str name: The name of the extension
+        :param extension: The identification extension
+        :param get_record: The callable providing the record of a location,
+          see :func:`wrap_identification_extensions`
+        """
+        self.PACKAGE_IDENTIFICATION_NAME = name
+        self._extension = extension
+        self._get_record = get_record
+
+    def identify(self, desc):  # noqa: D102
+        record = self._get_record(os.path.abspath(str(desc.path)))
+        if record is None or not record.replayable:
+            self._extension.identify(desc)
+            return
+
+        name = self.PACKAGE_IDENTIFICATION_NAME
+        data = _get_package_data(desc)
+        for outcome_name, outcome_data, result in record.outcomes:
+            if outcome_name == name and outcome_data == data:
+                if result is IGNORED:
+                    raise IgnoreLocationException()
+                if result is not None:
+                    load_package_data(desc, result)
+                return
+
+        # the extension might modify the passed information in place
+        data = copy.deepcopy(data)
+        try:
+            self._extension.identify(desc)
+        except IgnoreLocationException:
+            record.outcomes.append((name, data, IGNORED))
+            raise
+        result = None
+        if _get_package_data(desc) != data:
+            try:
+                result = dump_package_data(desc)
+            except Exception:  # noqa: B902
+                # descriptors with e.g. callables in their metadata are
+                # identified again on every invocation
+                record.replayable = False
+                return
+        record.outcomes.append((name, data, result))
@@ -0,0 +1,232 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+import os
+
+from colcon_core.logging import colcon_logger
+from colcon_core.package_identification import identify
+from colcon_core.package_identification import IgnoreLocationException
+from colcon_package_information.argument_type import argument_positive_int
+from colcon_package_information.package_identification \
+    import IdentificationRecord
+from colcon_package_information.package_identification \
+    import wrap_identification_extensions
+
+logger = colcon_logger.getChild(__name__)
+
+
+def add_discovery_workers_argument(parser):
+    """
+    Add the command line argument to identify packages in parallel.
+
+    :param parser: The argument parser
+    """
+    parser.add_argument(
+        '--discovery-workers',
+        type=argument_positive_int,
+        metavar='N',
+        default=None,
+        help='Identify the packages in up to N directories concurrently '
+             'using worker processes (default: one directory at a time)')
+
+
+class ParallelPackageIdentification:
+    """
+    Identify locations and their subdirectories ahead of time.
+
+    The worker processes record the outcomes of the identification
+    extensions for each location, see
+    :class:`colcon_package_information.package_identification.IdentificationRecord`.
+    Whenever a directory doesn't contain a package its subdirectories (except
+    hidden ones) are identified by a pool of worker processes, recursively,
+    in the same way the discovery extensions crawl them.
+    The speculation is limited to a number of levels below the locations
+    which the discovery extensions requested, since not every discovery
+    extension crawls recursively, e.g. the `path` extension only visits the
+    passed paths.
+    The discovery extensions still visit the locations in their own order and
+    the recorded outcomes are replayed by the identification functions of
+    colcon-core, therefore the discovered packages are identical to a
+    sequential identification.
+
+    Worker processes are used instead of threads since identification
+    extensions aren't required to be thread-safe, e.g. reading a `setup.cfg`
+    file changes the current working directory of the process.
+    Locations whose outcomes can't be pickled are identified again in this
+    process.
+
+    The instance must be used as a context manager which shuts down the
+    worker processes on exit.
+    """
+
+    def __init__(
+        self, identification_extensions, workers, *, skip_location=None,
+        speculation_depth=2,
+    ):
+        """
+        Start the worker processes.
+
+        :param identification_extensions: The identification extensions
+          grouped by priority, they must be picklable
+        :param int workers: The maximum number of worker processes
+        :param skip_location: An optional callable which is passed the path
+          of a location and returns True if the location shouldn't be
+          identified ahead of time, e.g. because a cached result is available
+        :param int speculation_depth: The number of directory levels below a
+          requested location which are identified ahead of time
+        """
+        self._extensions = identification_extensions
+        self._skip_location = skip_location
+        self._speculation_depth = speculation_depth
+        # the process pool is only imported when parallel identification is
+        # requested since it is costly to import
+        from concurrent.futures import ProcessPoolExecutor
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        # the futures of all submitted locations indexed by absolute path
+        self._futures = {}
+        # the paths and depths below the requested location of submitted
+        # futures whose subdirectories haven't been submitted yet
+        self._unexpanded_futures = {}
+        # the futures of locations without a package which reached the
+        # speculation depth indexed by absolute path
+        self._deferred_futures = {}
+        self._submitted_paths = set()
+
+    def __enter__(self):  # noqa: D105
+        return self
+
+    def __exit__(self, *args):  # noqa: D105
+        for future in self._unexpanded_futures.keys():
+            future.cancel()
+        self._futures.clear()
+        self._unexpanded_futures.clear()
+        self._deferred_futures.clear()
+        self._executor.shutdown(wait=True)
+
+    def get_record(self, location):
+        """
+        Get the record of a location requested by a discovery extension.
+
+        If the location hasn't been identified ahead of time it is submitted
+        now.
+        If it doesn't contain a package the speculation continues below it.
+
+        :param str location: The absolute path of the location
+        :returns: The record or `None` if the location couldn't be identified
+          in a worker process
+        :rtype: IdentificationRecord
+        """
+        future = self._futures.pop(location, None)
+        if future is None:
+            self._submitted_paths.add(os.path.realpath(location))
+            future = self._executor.submit(
+                _identify_location, self._extensions, location)
+
+        from concurrent.futures import FIRST_COMPLETED
+        from concurrent.futures import wait
+        # expand the completed locations while waiting for this one
+        while not future.done():
+            done, _ = wait(
+                list(self._unexpanded_futures.keys()) + [future],
+                return_when=FIRST_COMPLETED)
+            self._expand(done)
+        self._expand([future])
+        try:
+            record, subdirectory_names = future.result()
+        except Exception as e:  # noqa: B902 F841
+            logger.debug(
+                "Failed to identify '{location}' in a worker process: {e}"
+                .format_map(locals()))
+            return None
+
+        if subdirectory_names is not None:
+            # continue the speculation below the requested location
+            self._submit_subdirectories(location, subdirectory_names)
+        return record
+
+    def speculate_below(self, location):
+        """
+        Identify the subdirectories of a location ahead of time.
+
+        This is used for requested locations without a package which have
+        been identified without the worker processes, e.g. from a cache.
+
+        :param str location: The absolute path of the location
+        """
+        self._submitted_paths.add(os.path.realpath(location))
+        self._submit_subdirectories(
+            location, _get_subdirectory_names(location))
+
+    def _expand(self, futures):
+        for future in futures:
+            path, depth = self._unexpanded_futures.pop(future, (None, None))
+            if path is None or future.cancelled() or future.exception():
+                continue
+            _, subdirectory_names = future.result()
+            if subdirectory_names is None:
+                continue
+            if depth >= self._speculation_depth:
+                self._deferred_futures[os.path.abspath(path)] = future
+                continue
+            self._submit_subdirectories(
+                path, subdirectory_names, depth=depth + 1)
+
+    def _submit_subdirectories(self, path, names, *, depth=1):
+        for name in names:
+            subdirectory = os.path.join(path, name)
+            # avoid identifying the same directory twice through symlinks
+            real_path = os.path.realpath(subdirectory)
+            if real_path in self._submitted_paths:
+                self._update_depth(subdirectory, depth)
+                continue
+            self._submitted_paths.add(real_path)
+            if self._skip_location and self._skip_location(subdirectory):
+                continue
+            future = self._executor.submit(
+                _identify_location, self._extensions, subdirectory)
+            self._futures[os.path.abspath(subdirectory)] = future
+            self._unexpanded_futures[future] = (subdirectory, depth)
+
+    def _update_depth(self, subdirectory, depth):
+        # the location has been submitted further below another requested
+        # location, therefore the speculation continues further below it
+        location = os.path.abspath(subdirectory)
+        future = self._deferred_futures.pop(location, None)
+        if future is not None:
+            self._unexpanded_futures[future] = (subdirectory, depth)
+            self._expand([future])
+            return
+        future = self._futures.get(location)
+        if future in self._unexpanded_futures:
+            _, previous_depth = self._unexpanded_futures[future]
+            self._unexpanded_futures[future] = (
+                subdirectory, min(depth, previous_depth))
+
+
+def _identify_location(extensions, path):
+    # invoked in a worker process, returns the record or None if it can't be
+    # replayed as well as the names of the subdirectories if the location
+    # neither contains a package nor is ignored
+    record = IdentificationRecord()
+    extensions = wrap_identification_extensions(
+        extensions, lambda location: record)
+    subdirectory_names = None
+    try:
+        desc = identify(extensions, path)
+    except IgnoreLocationException:
+        record.is_package = False
+    else:
+        record.is_package = bool(desc)
+        if not desc:
+            subdirectory_names = _get_subdirectory_names(path)
+    return record if record.replayable else None, subdirectory_names
+
+
+def _get_subdirectory_names(path):
+    try:
+        with os.scandir(path) as entries:
+            return sorted(
+                entry.name for entry in entries
+                if not entry.name.startswith('.') and entry.is_dir())
+    except OSError:
+        return []
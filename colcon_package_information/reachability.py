@@ -0,0 +1,140 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+from collections import defaultdict
+
+
+class ReachabilityIndex:
+    """
+    Transitive closure of the dependencies between package decorators.
+
+    Each decorator is identified by its position in the passed sequence.
+    The dependencies of each decorator are stored as a bitset, an ``int``
+    where bit ``i`` represents the decorator at position ``i``.
+    A dependency on a name which is shared by multiple packages refers to all
+    of them.
+
+    The recursive dependencies are taken from the decorators, therefore they
+    reflect the categories which were used to populate them, e.g. by
+    :func:`colcon_core.topological_order.topological_order_packages`.
+    """
+
+    __slots__ = (
+        'decorators',
+        'direct_dependencies',
+        'recursive_dependencies',
+        '_dependents',
+        '_name_masks',
+        '_positions',
+    )
+
+    def __init__(self, decorators):
+        """
+        Compute the bitsets of all decorators in a single pass.
+
+        :param decorators: The package decorators with populated recursive
+          dependencies
+        """
+        self.decorators = list(decorators)
+        self._positions = {
+            deco: i for i, deco in enumerate(self.decorators)}
+        self._dependents = None
+
+        name_masks = defaultdict(int)
+        for i, deco in enumerate(self.decorators):
+            name_masks[deco.descriptor.name] |= 1 << i
+        self._name_masks = dict(name_masks)
+
+        self.direct_dependencies = []
+        self.recursive_dependencies = []
+        for deco in self.decorators:
+            direct = 0
+            for deps in deco.descriptor.dependencies.values():
+                for dep in deps:
+                    direct |= self._name_masks.get(dep, 0)
+            recursive = direct
+            for dep in deco.recursive_dependencies:
+                recursive |= self._name_masks.get(dep, 0)
+            # ignore circular dependencies
+            own_mask = self._name_masks[deco.descriptor.name]
+            self.direct_dependencies.append(direct & ~own_mask)
+            self.recursive_dependencies.append(recursive & ~own_mask)
+
+    def get_position(self, decorator):
+        """
+        Get the position of a decorator.
+
+        :param decorator: The package decorator
+        :returns: The bit position of the decorator
+        :rtype: int
+        """
+        return self._positions[decorator]
+
+    def get_mask(self, decorators):
+        """
+        Get the bitset of a collection of decorators.
+
+        :param decorators: The package decorators
+        :rtype: int
+        """
+        mask = 0
+        for deco in decorators:
+            mask |= 1 << self._positions[deco]
+        return mask
+
+    def get_name_mask(self, name):
+        """
+        Get the bitset of all decorators with a specific name.
+
+        :param str name: The package name
+        :rtype: int
+        """
+        return self._name_masks.get(name, 0)
+
+    def get_dependents(self):
+        """
+        Get the transposed dependencies.
+
+        The result is computed on the first call and reused by later calls.
+
+        :returns: A tuple with two lists containing the bitsets of the direct
+          and recursive dependents for each decorator
+        :rtype: tuple
+        """
+        if self._dependents is None:
+            direct_dependents = [0] * len(self.decorators)
+            recursive_dependents = [0] * len(self.decorators)
+            for i, mask in enumerate(self.direct_dependencies):
+                bit = 1 << i
+                for j in iterate_bits(mask):
+                    direct_dependents[j] |= bit
+            for i, mask in enumerate(self.recursive_dependencies):
+                bit = 1 << i
+                for j in iterate_bits(mask):
+                    recursive_dependents[j] |= bit
+            self._dependents = (direct_dependents, recursive_dependents)
+        return self._dependents
+
+
+def iterate_bits(mask):
+    """
+    Iterate over the positions of the set bits in ascending order.
+
+    :param int mask: The bitset
+    :returns: The bit positions
+    :rtype: Iterator[int]
+    """
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+def count_bits(mask):
+    """
+    Count the number of set bits.
+
+    :param int mask: The bitset
+    :rtype: int
+    """
+    return bin(mask).count('1')
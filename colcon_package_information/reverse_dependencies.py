@@ -0,0 +1,111 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+from colcon_package_information.reachability import iterate_bits
+from colcon_package_information.reachability import ReachabilityIndex
+
+
+class ReverseDependencyIndex:
+    """
+    Direct and recursive dependents of package decorators by category.
+
+    The recursive dependents of a package through a category are the
+    packages which depend on it directly in that category or which depend in
+    that category on a package with it in its recursive dependencies.
+    The recursive dependencies are taken from the decorators, therefore they
+    reflect the categories which were used to populate them, e.g. by
+    :func:`colcon_core.topological_order.topological_order_packages`.
+
+    The dependents of each category are computed on first use and reused by
+    later queries.
+    """
+
+    __slots__ = (
+        'categories',
+        'reachability',
+        '_dependency_masks',
+        '_dependents',
+    )
+
+    def __init__(self, decorators):
+        """
+        Collect the direct dependencies of all decorators by category.
+
+        :param decorators: The package decorators with populated recursive
+          dependencies
+        """
+        self.reachability = ReachabilityIndex(decorators)
+        self._dependents = {}
+
+        # the bitsets of the direct dependencies of each category
+        self._dependency_masks = {}
+        for i, deco in enumerate(self.reachability.decorators):
+            # ignore circular dependencies
+            own_mask = self.reachability.get_name_mask(deco.descriptor.name)
+            for category, deps in deco.descriptor.dependencies.items():
+                mask = 0
+                for dep in deps:
+                    mask |= self.reachability.get_name_mask(dep)
+                masks = self._dependency_masks.get(category)
+                if masks is None:
+                    masks = self._dependency_masks[category] = \
+                        [0] * len(self.reachability.decorators)
+                masks[i] = mask & ~own_mask
+        self.categories = sorted(self._dependency_masks.keys())
+
+    def get_dependents(self, decorators, *, categories=None, recursive=False):
+        """
+        Get the packages depending on any of the passed packages.
+
+        :param decorators: The package decorators to get the dependents of
+        :param categories: The dependency categories to consider, if `None`
+          all categories are considered
+        :param bool recursive: The flag if recursive dependents should be
+          included
+        :returns: The dependent decorators in the order they were passed to
+          the constructor
+        :rtype: list
+        """
+        if categories is None and recursive:
+            # the dependents through any category are already known
+            tables = [self.reachability.get_dependents()[1]]
+        elif categories is None:
+            tables = [self.reachability.get_dependents()[0]]
+        else:
+            tables = [
+                self._get_dependents(category, recursive)
+                for category in categories
+                if category in self._dependency_masks]
+
+        mask = 0
+        for deco in decorators:
+            position = self.reachability.get_position(deco)
+            for table in tables:
+                mask |= table[position]
+        return [self.reachability.decorators[i] for i in iterate_bits(mask)]
+
+    def _get_dependents(self, category, recursive):
+        key = (category, recursive)
+        dependents = self._dependents.get(key)
+        if dependents is not None:
+            return dependents
+
+        masks = self._dependency_masks[category]
+        if recursive:
+            recursive_dependencies = self.reachability.recursive_dependencies
+            masks = list(masks)
+            for i, mask in enumerate(masks):
+                for j in iterate_bits(mask):
+                    mask |= recursive_dependencies[j]
+                own_mask = self.reachability.get_name_mask(
+                    self.reachability.decorators[i].descriptor.name)
+                masks[i] = mask & ~own_mask
+
+        # transpose the dependencies
+        dependents = [0] * len(masks)
+        for i, mask in enumerate(masks):
+            bit = 1 << i
+            for j in iterate_bits(mask):
+                dependents[j] |= bit
+        self._dependents[key] = dependents
+        return dependents
@@ -0,0 +1,64 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+from collections import defaultdict
+
+
+def get_shards(decorators, count, *, weights=None):
+    """
+    Partition the selected packages into shards of balanced weight.
+
+    The packages are assigned in reverse topological order, each to the
+    shard containing the largest weight of packages which recursively
+    depend on it as long as that shard doesn't exceed its share of the
+    total weight, otherwise to the shard with the smallest weight.
+    This keeps the dependencies of a shard which are part of other shards
+    small.
+    Ties are resolved by the index of the shard, therefore the same
+    packages always result in the same shards.
+
+    :param decorators: The topologically ordered package decorators
+    :param int count: The number of shards
+    :param dict weights: The weights indexed by package name, packages
+      without a weight take the average weight, if `None` every package has
+      the same weight
+    :returns: The shards, each a list of decorators in the order they were
+      passed
+    :rtype: list
+    """
+    shown_decorators = [d for d in decorators if d.selected]
+    default_weight = 1.0
+    if weights:
+        default_weight = sum(weights.values()) / len(weights)
+    package_weights = [
+        weights.get(d.descriptor.name, default_weight)
+        if weights is not None else default_weight
+        for d in shown_decorators]
+    # the largest weight of a shard before it stops attracting dependencies
+    capacity = sum(package_weights) / count
+
+    shards = [[] for _ in range(count)]
+    loads = [0.0] * count
+    # the weight of the assigned dependents in each shard indexed by name
+    affinities = defaultdict(lambda: [0.0] * count)
+    for deco, weight in zip(
+        reversed(shown_decorators), reversed(package_weights)
+    ):
+        shard_affinities = affinities.get(deco.descriptor.name)
+        candidates = []
+        if shard_affinities is not None:
+            candidates = [
+                i for i in range(count)
+                if shard_affinities[i] and loads[i] + weight <= capacity]
+        if candidates:
+            shard = max(candidates, key=lambda i: (shard_affinities[i], -i))
+        else:
+            shard = min(range(count), key=lambda i: (loads[i], i))
+        shards[shard].append(deco)
+        loads[shard] += weight
+        for name in deco.recursive_dependencies:
+            affinities[name][shard] += weight
+
+    for shard in shards:
+        shard.reverse()
+    return shards
@@ -0,0 +1,191 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+from collections import OrderedDict
+from contextlib import contextmanager
+import os
+import sys
+import time
+
+from colcon_core.environment_variable import EnvironmentVariable
+
+"""Environment variable to report timings of the information verbs"""
+TIMINGS_ENVIRONMENT_VARIABLE = EnvironmentVariable(
+    'COLCON_PACKAGE_INFORMATION_TIMINGS',
+    'Report the time spent in each phase of the graph, info and list verbs')
+
+
+def add_timings_arguments(parser):
+    """
+    Add the command line arguments to measure the performance of a verb.
+
+    :param parser: The argument parser
+    """
+    group = parser.add_argument_group('Performance measurement')
+    group.add_argument(
+        '--timings',
+        action='store_true',
+        default=False,
+        help='Report the wall time and peak memory of each phase as well as '
+             'counters to stderr (can also be enabled with the environment '
+             'variable {TIMINGS_ENVIRONMENT_VARIABLE.name})'
+             .format_map(globals()))
+    group.add_argument(
+        '--profile',
+        metavar='PATH',
+        help='Profile the verb and dump the cProfile statistics to PATH')
+
+
+@contextmanager
+def measure(args, *, file=None):
+    """
+    Measure the performance of a verb invocation.
+
+    The timings are only collected if the argument `timings` or the
+    environment variable :data:`TIMINGS_ENVIRONMENT_VARIABLE` is set and
+    are reported when leaving the context.
+    If the argument `profile` is set the invocation is profiled.
+
+    :param args: The parsed command line arguments
+    :param file: The stream to report the timings to, defaults to
+      `sys.stderr`
+    :returns: The :class:`Timings` to record phases and counters with
+    """
+    enabled = getattr(args, 'timings', False) or \
+        bool(os.environ.get(TIMINGS_ENVIRONMENT_VARIABLE.name))
+    timings = Timings() if enabled else _DisabledTimings()
+
+    profile_path = getattr(args, 'profile', None)
+    if profile_path:
+        import cProfile
+        profile = cProfile.Profile()
+        profile.enable()
+    try:
+        yield timings
+    finally:
+        if profile_path:
+            profile.disable()
+            profile.dump_stats(profile_path)
+        if enabled:
+            for line in timings.format_report():
+                print(line, file=file or sys.stderr)
+
+
+class Timings:
+    """The wall time and peak memory of phases as well as counters."""
+
+    def __init__(self):
+        """Create an empty instance."""
+        # tuples of nesting depth, name, duration and peak memory in the
+        # order the phases started
+        self.phases = []
+        self.counters = OrderedDict()
+        self._depth = 0
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Measure a phase.
+
+        Phases can be nested.
+
+        :param str name: The name of the phase
+        """
+        index = len(self.phases)
+        self.phases.append(None)
+        depth = self._depth
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self._depth -= 1
+            self.phases[index] = (depth, name, duration, get_peak_memory())
+
+    def count(self, name, value=1):
+        """
+        Increment a counter.
+
+        :param str name: The name of the counter
+        :param int value: The value to add
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def print_lines(self, lines, *, phase='printing'):
+        """
+        Print lines and measure the time spent printing them.
+
+        The time spent generating the lines is not included.
+
+        :param lines: An iterable of strings
+        :param str phase: The name of the phase
+        """
+        perf_counter = time.perf_counter
+        duration = 0.0
+        count = 0
+        for line in lines:
+            start = perf_counter()
+            print(line)
+            duration += perf_counter() - start
+            count += 1
+        self.phases.append(
+            (self._depth, phase, duration, get_peak_memory()))
+        self.count('lines', count)
+
+    def format_report(self):
+        """
+        Format the timings.
+
+        :returns: The lines of the report
+        :rtype: list
+        """
+        lines = ['Timings:']
+        width = max(
+            [2 * depth + len(name) for depth, name, _, _ in self.phases] +
+            [0])
+        for depth, name, duration, peak_memory in self.phases:
+            line = '  ' + ('  ' * depth + name).ljust(width) + \
+                ' {duration:8.3f}s'.format_map(locals())
+            if peak_memory is not None:
+                line += '  peak memory {0:.1f} MiB'.format(
+                    peak_memory / 1024 / 1024)
+            lines.append(line)
+        if self.counters:
+            lines.append('Counters:')
+            for name, value in self.counters.items():
+                lines.append('  {name}: {value}'.format_map(locals()))
+        return lines
+
+
+class _DisabledTimings:
+
+    @contextmanager
+    def phase(self, name):
+        yield
+
+    def count(self, name, value=1):
+        pass
+
+    def print_lines(self, lines, *, phase='printing'):
+        for line in lines:
+            print(line)
+
+
+def get_peak_memory():
+    """
+    Get the peak memory usage of the process.
+
+    :returns: The maximum resident set size in bytes, or `None` if it can't
+      be determined on this platform
+    :rtype: int
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # the value is in kilobytes except on macOS
+    if sys.platform != 'darwin':
+        peak_memory *= 1024
+    return peak_memory
@@ -0,0 +1,102 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+from collections import OrderedDict
+from collections.abc import Mapping
+import copy
+
+from colcon_core.package_decorator import PackageDecorator
+from colcon_core.topological_order import topological_order_packages \
+    as topological_order_packages_uncached
+
+"""The maximum number of memoized results."""
+MAXIMUM_MEMOIZED_RESULTS = 8
+
+# the memoized results, only enabled for long running processes
+_memoized_results = None
+
+
+def enable_memoization():
+    """
+    Memoize the topological order for the lifetime of the process.
+
+    This is only useful for long running processes which order the same
+    packages repeatedly, like the query daemon.
+    """
+    global _memoized_results
+    if _memoized_results is None:
+        _memoized_results = OrderedDict()
+
+
+def topological_order_packages(
+    descriptors, direct_categories=None, recursive_categories=None,
+):
+    """
+    Order packages topologically.
+
+    The function has the same semantic as
+    :func:`colcon_core.topological_order.topological_order_packages`.
+    If memoization is enabled the result is reused for descriptors with the
+    same name, type, path and dependencies including their metadata.
+    The returned decorators are always new instances and their recursive
+    dependencies are copies of the memoized ones, therefore callers can
+    modify them like the result of the upstream function.
+
+    :param descriptors: the package descriptors
+    :returns: list of package decorators
+    :rtype: list of :py:class:`colcon_core.package_decorator.PackageDecorator`
+    """
+    if _memoized_results is None:
+        return topological_order_packages_uncached(
+            descriptors, direct_categories=direct_categories,
+            recursive_categories=recursive_categories)
+
+    descriptors = sorted(
+        descriptors, key=lambda d: (d.name, d.type, str(d.path)))
+    key = (
+        _freeze(direct_categories), _freeze(recursive_categories),
+        tuple(_get_descriptor_key(d) for d in descriptors))
+
+    result = _memoized_results.get(key)
+    if result is None:
+        decorators = topological_order_packages_uncached(
+            descriptors, direct_categories=direct_categories,
+            recursive_categories=recursive_categories)
+        positions = {id(d): i for i, d in enumerate(descriptors)}
+        result = [
+            (positions[id(d.descriptor)], d.recursive_dependencies)
+            for d in decorators]
+        _memoized_results[key] = result
+        while len(_memoized_results) > MAXIMUM_MEMOIZED_RESULTS:
+            _memoized_results.popitem(last=False)
+    else:
+        _memoized_results.move_to_end(key)
+
+    decorators = []
+    for position, recursive_dependencies in result:
+        decorator = PackageDecorator(descriptors[position])
+        decorator.recursive_dependencies = copy.deepcopy(
+            recursive_dependencies)
+        decorators.append(decorator)
+    return decorators
+
+
+def _get_descriptor_key(descriptor):
+    return (
+        descriptor.name, descriptor.type, str(descriptor.path),
+        tuple(sorted(
+            (
+                category, tuple(sorted(
+                    (str(dep), repr(getattr(dep, 'metadata', None)))
+                    for dep in deps)))
+            for category, deps in descriptor.dependencies.items())))
+
+
+def _freeze(categories):
+    if categories is None:
+        return None
+    if isinstance(categories, Mapping):
+        return tuple(sorted(
+            (category, _freeze(values))
+            for category, values in categories.items()))
+    return tuple(sorted(categories))
@@ -9,11 +9,26 @@ from pathlib import Path
 
 from colcon_core.package_selection import add_arguments \
     as add_packages_arguments
-from colcon_core.package_selection import get_package_descriptors
 from colcon_core.package_selection import select_package_decorators
 from colcon_core.plugin_system import satisfies_version
-from colcon_core.topological_order import topological_order_packages
 from colcon_core.verb import VerbExtensionPoint
+from colcon_package_information.argument_type import argument_collapse_by
+from colcon_package_information.argument_type import argument_positive_int
+from colcon_package_information.build_schedule import get_build_schedule
+from colcon_package_information.build_schedule import read_durations
+from colcon_package_information.descriptor_cache \
+    import add_descriptor_cache_arguments
+from colcon_package_information.descriptor_cache \
+    import get_package_descriptors
+from colcon_package_information.parallel_identification \
+    import add_discovery_workers_argument
+from colcon_package_information.reachability import count_bits
+from colcon_package_information.reachability import iterate_bits
+from colcon_package_information.reachability import ReachabilityIndex
+from colcon_package_information.timings import add_timings_arguments
+from colcon_package_information.timings import measure
+from colcon_package_information.topological_order \
+    import topological_order_packages
 
 
 class GraphVerb(VerbExtensionPoint):
@@ -30,6 +45,8 @@ class GraphVerb(VerbExtensionPoint):
             '--build-base',
             default='build',
             help='The base path for all build directories (default: build)')
+        add_descriptor_cache_arguments(parser)
+        add_discovery_workers_argument(parser)
 
         add_packages_arguments(parser)
 
@@ -48,6 +65,13 @@ class GraphVerb(VerbExtensionPoint):
             default=False,
             help='Output density of the graph (only without --dot)')
 
+        parser.add_argument(
+            '--sparse',
+            action='store_true',
+            default=False,
+            help='Output only the marked cells of each row instead of the '
+                 'full matrix (only without --dot)')
+
         parser.add_argument(
             '--legend',
             action='store_true',
@@ -58,260 +82,645 @@ class GraphVerb(VerbExtensionPoint):
             '--dot-cluster',
             action='store_true',
             default=False,
-            help='Cluster packages by their filesystem path (only affects '
-                 '--dot)')
+            help='Cluster packages by their filesystem path, nested '
+                 'following the directory hierarchy (only affects --dot)')
+        parser.add_argument(
+            '--dot-cluster-depth',
+            type=argument_positive_int,
+            metavar='N',
+            default=None,
+            help='Only nest clusters up to N levels, packages in deeper '
+                 'directories are part of the cluster at that level, a '
+                 'directory only containing a single subdirectory is merged '
+                 'with it into one level (only affects --dot-cluster and '
+                 '--collapse-by path, default: unlimited)')
+        parser.add_argument(
+            '--collapse-by',
+            type=argument_collapse_by,
+            metavar='{path,prefix,metadata:KEY}',
+            default=None,
+            help='Contract groups of packages into a single node each, '
+                 'grouped by their parent directory like the clusters of '
+                 '--dot-cluster (limited by --dot-cluster-depth), their name '
+                 'up to the first underscore or dash or the value of a '
+                 'metadata key, the edges between groups are labeled with the '
+                 'number of merged dependencies (only affects --dot)')
         parser.add_argument(
             '--dot-include-skipped',
             action='store_true',
             default=False,
             help='Also output skipped packages (only affects --dot)')
+        parser.add_argument(
+            '--transitive-reduction',
+            action='store_true',
+            default=False,
+            help='Omit edges which are implied by another path between the '
+                 'same packages (only affects --dot)')
+
+        parser.add_argument(
+            '--critical-path',
+            action='store_true',
+            default=False,
+            help='Output the longest chain of dependencies between the '
+                 'selected packages instead of the graph')
+        parser.add_argument(
+            '--parallelism',
+            action='store_true',
+            default=False,
+            help='Output the number of packages of each topological level, '
+                 'the maximum number of useful workers and the average '
+                 'parallelism instead of the graph')
+        parser.add_argument(
+            '--durations',
+            metavar='PATH',
+            default=None,
+            help='Weight the packages of --critical-path and --parallelism '
+                 'with their durations, read from a JSON object mapping '
+                 'package names to seconds or from the event log of a '
+                 'previous build (e.g. log/latest_build/events.log), '
+                 'packages without a duration take the average duration')
+
+        add_timings_arguments(parser)
 
     def main(self, *, context):  # noqa: D102
-        args = context.args
+        with measure(context.args) as timings:
+            return self._main(context, timings)
 
-        descriptors = get_package_descriptors(args)
-
-        decorators = topological_order_packages(
-            descriptors, recursive_categories=('run', ))
-
-        select_package_decorators(args, decorators)
-
-        if not args.dot:
-            if args.legend:
-                print('+ marks when the package in this row can be processed')
-                print('* marks a direct dependency '
-                      'from the package indicated by the + in the same column '
-                      'to the package in this row')
-                print('. marks a transitive dependency')
-                print()
-
-            # draw dependency graph in ASCII
-            shown_decorators = list(filter(lambda d: d.selected, decorators))
-            max_length = max([
-                len(m.descriptor.name) for m in shown_decorators] + [0])
-            lines = [
-                m.descriptor.name.ljust(max_length + 2)
-                for m in shown_decorators]
-            depends = [
-                m.descriptor.get_dependencies() for m in shown_decorators]
-            rec_depends = [
-                m.descriptor.get_recursive_dependencies(
-                    [d.descriptor for d in decorators],
-                    recursive_categories=('run', ))
-                for m in shown_decorators]
-
-            empty_cells = 0
-            for i, decorator in enumerate(shown_decorators):
-                for j in range(len(lines)):
-                    if j == i:
-                        # package i is being processed
-                        lines[j] += '+'
-                    elif shown_decorators[j].descriptor.name in depends[i]:
-                        # package i directly depends on package j
-                        lines[j] += '*'
-                    elif shown_decorators[j].descriptor.name in rec_depends[i]:
-                        # package i recursively depends on package j
-                        lines[j] += '.'
-                    else:
-                        # package i doesn't depend on package j
-                        lines[j] += ' '
-                        empty_cells += 1
-            if args.density:
-                empty_fraction = \
-                    empty_cells / (len(lines) * (len(lines) - 1)) \
-                    if len(lines) > 1 else 1.0
-                # normalize to 200% since half of the matrix should be empty
-                density_percentage = 200.0 * (1.0 - empty_fraction)
-                print('dependency density %.2f %%' % density_percentage)
-                print()
-
-        else:  # --dot
-            lines = ['digraph graphname {']
-
-            decorators_by_name = defaultdict(set)
-            for deco in decorators:
-                decorators_by_name[deco.descriptor.name].add(deco)
-
-            selected_pkg_names = [
-                m.descriptor.name for m in decorators
-                if m.selected or args.dot_include_skipped]
-            has_duplicate_names = \
-                len(selected_pkg_names) != len(set(selected_pkg_names))
-            selected_pkg_names = set(selected_pkg_names)
-
-            # collect selected package decorators and their parent path
-            nodes = OrderedDict()
-            for deco in reversed(decorators):
-                if deco.selected or args.dot_include_skipped:
-                    nodes[deco] = Path(deco.descriptor.path).parent
-
-            # collect direct dependencies
-            direct_edges = defaultdict(set)
-            for deco in reversed(decorators):
+    def _main(self, context, timings):
+        args = context.args
+        schedule = args.critical_path or args.parallelism
+        if schedule and args.dot:
+            return 'The options --critical-path and --parallelism can not ' \
+                'be used together with --dot'
+        durations = None
+        if args.durations is not None:
+            try:
+                durations = read_durations(args.durations)
+            except (OSError, ValueError) as e:  # noqa: F841
+                return "Failed to read the durations from '{args.durations}'" \
+                    ': {e}'.format_map(locals())
+
+        with timings.phase('discovery'):
+            descriptors = get_package_descriptors(args)
+        timings.count('packages', len(descriptors))
+
+        with timings.phase('topological order'):
+            decorators = topological_order_packages(
+                descriptors, recursive_categories=('run', ))
+
+        with timings.phase('selection'):
+            select_package_decorators(args, decorators)
+
+        if schedule:
+            lines = self._get_schedule_lines(
+                args, decorators, durations, timings)
+        elif not args.dot:
+            lines = self._get_ascii_lines(args, decorators, timings)
+        else:
+            lines = self._get_dot_lines(args, decorators, timings)
+
+        with timings.phase('output'):
+            timings.print_lines(lines)
+
+    def _get_schedule_lines(self, args, decorators, durations, timings):
+        with timings.phase('schedule'):
+            schedule = get_build_schedule(decorators, durations=durations)
+        timings.count('levels', len(schedule.level_widths))
+
+        if args.critical_path:
+            line = 'critical path: %d packages' % len(schedule.critical_path)
+            if durations is not None:
+                line += ', %.1fs' % schedule.critical_duration
+            yield line
+            for decorator in schedule.critical_path:
+                line = '  ' + decorator.descriptor.name
+                if durations is not None:
+                    line += '  %.1fs' % schedule.durations[decorator]
+                yield line
+
+        if args.critical_path and args.parallelism:
+            yield ''
+
+        if args.parallelism:
+            for i, width in enumerate(schedule.level_widths, start=1):
+                yield 'level %d: %d packages' % (i, width)
+            yield 'maximum useful workers: %d' % schedule.max_workers
+            if durations is not None:
+                yield 'total duration: %.1fs' % schedule.total_duration
+            average = schedule.total_duration / schedule.critical_duration \
+                if schedule.critical_duration else 0.0
+            yield 'average parallelism: %.2f' % average
+
+    def _get_ascii_lines(self, args, decorators, timings):
+        if args.legend and args.sparse:
+            yield '*<name> marks a direct dependency ' \
+                'from the package <name> to the package in this row'
+            yield '.<name> marks a transitive dependency'
+            yield ''
+        elif args.legend:
+            yield '+ marks when the package in this row can be processed'
+            yield '* marks a direct dependency ' \
+                'from the package indicated by the + in the same column ' \
+                'to the package in this row'
+            yield '. marks a transitive dependency'
+            yield ''
+
+        # draw dependency graph in ASCII
+        with timings.phase('reachability index'):
+            index = ReachabilityIndex(decorators)
+        shown_decorators = list(filter(lambda d: d.selected, decorators))
+        timings.count('nodes', len(shown_decorators))
+        shown_mask = index.get_mask(shown_decorators)
+        max_length = max([
+            len(m.descriptor.name) for m in shown_decorators] + [0])
+
+        if args.density:
+            # each package in a column can't depend on itself
+            cell_count = \
+                len(shown_decorators) * (len(shown_decorators) - 1)
+            # the number of direct and transitive edges between shown packages
+            dependency_count = sum(
+                count_bits(
+                    index.recursive_dependencies[
+                        index.get_position(m)] & shown_mask)
+                for m in shown_decorators)
+            empty_fraction = \
+                (cell_count - dependency_count) / cell_count \
+                if cell_count else 1.0
+            # normalize to 200% since half of the matrix should be empty
+            density_percentage = 200.0 * (1.0 - empty_fraction)
+            yield 'dependency density %.2f %%' % density_percentage
+            yield ''
+
+        with timings.phase('dependents'):
+            direct_dependents, recursive_dependents = index.get_dependents()
+        if args.sparse:
+            for decorator in shown_decorators:
+                position = index.get_position(decorator)
+                direct_mask = direct_dependents[position]
+                # the bit positions are ordered like the columns
+                cells = [
+                    ('*' if direct_mask & (1 << i) else '.') +
+                    index.decorators[i].descriptor.name
+                    for i in iterate_bits(
+                        recursive_dependents[position] & shown_mask)]
+                yield (
+                    decorator.descriptor.name.ljust(max_length + 2) +
+                    ' '.join(cells)).rstrip()
+            return
+
+        # map the position of each shown package to its column
+        columns = {
+            index.get_position(m): i
+            for i, m in enumerate(shown_decorators)}
+        for j, decorator in enumerate(shown_decorators):
+            position = index.get_position(decorator)
+            # package j doesn't depend on package i
+            cells = [' '] * len(shown_decorators)
+            for i in iterate_bits(
+                recursive_dependents[position] & shown_mask
+            ):
+                # package i recursively depends on package j
+                cells[columns[i]] = '.'
+            for i in iterate_bits(
+                direct_dependents[position] & shown_mask
+            ):
+                # package i directly depends on package j
+                cells[columns[i]] = '*'
+            # package j is being processed
+            cells[j] = '+'
+            yield decorator.descriptor.name.ljust(max_length + 2) + \
+                ''.join(cells)
+
+    def _get_dot_lines(self, args, decorators, timings):
+        yield 'digraph graphname {'
+
+        # use lists to output the edges to packages with the same name in a
+        # deterministic order
+        decorators_by_name = defaultdict(list)
+        for deco in decorators:
+            decorators_by_name[deco.descriptor.name].append(deco)
+
+        selected_pkg_names = [
+            m.descriptor.name for m in decorators
+            if m.selected or args.dot_include_skipped]
+        has_duplicate_names = \
+            len(selected_pkg_names) != len(set(selected_pkg_names))
+        selected_pkg_names = set(selected_pkg_names)
+
+        # collect selected package decorators and their parent path
+        nodes = OrderedDict()
+        for deco in reversed(decorators):
+            if deco.selected or args.dot_include_skipped:
+                nodes[deco] = Path(deco.descriptor.path).parent
+
+        try:
+            # HACK Python 3.5 can't handle Path objects
+            common_path = os.path.commonpath(
+                [str(p) for p in nodes.values()])
+        except ValueError:
+            common_path = None
+        timings.count('nodes', len(nodes))
+
+        def get_node_data(decorator):
+            if not has_duplicate_names:
+                # use name where possible so the dot code is easy to read
+                return decorator.descriptor.name, \
+                    '' if (
+                        decorator.selected or
+                        not args.dot_include_skipped
+                    ) else '[color = "gray" fontcolor = "gray"]'
+            # otherwise append the descriptor id to make each node unique
+            descriptor_id = id(decorator.descriptor)
+            return (
+                '{decorator.descriptor.name}_{descriptor_id}'
+                .format_map(locals()),
+                ' [label = "{decorator.descriptor.name}"]'
+                .format_map(locals()),
+            )
+
+        # the node name and attributes of each package are only formatted
+        # once and then looked up for every node and edge
+        node_data = {deco: get_node_data(deco) for deco in decorators}
+
+        if args.collapse_by is not None:
+            # output a node for each group of packages
+            groups = self._get_groups(args, nodes, common_path)
+            yield from self._get_group_lines(groups)
+            timings.count('groups', len(set(groups.values())))
+        elif not args.dot_cluster or common_path is None:
+            # output nodes
+            for deco in nodes.keys():
                 if (
                     not deco.selected and
                     not args.dot_include_skipped
                 ):
                     continue
-                # iterate over dependency categories
-                for category, deps in deco.descriptor.dependencies.items():
-                    # iterate over dependencies
-                    for dep in deps:
-                        if dep not in selected_pkg_names:
-                            continue
-                        # store the category of each dependency
-                        # use the decorator
-                        # since there might be packages with the same name
-                        direct_edges[(deco, dep)].add(category)
-
-            # collect indirect dependencies
-            indirect_edges = defaultdict(set)
-            for deco in reversed(decorators):
-                if not deco.selected:
-                    continue
-                # iterate over dependency categories
-                for category, deps in deco.descriptor.dependencies.items():
-                    # iterate over dependencies
-                    for dep in deps:
-                        # ignore direct dependencies
-                        if dep in selected_pkg_names:
-                            continue
-                        # ignore unknown dependencies
-                        if dep not in decorators_by_name.keys():
-                            continue
-                        # iterate over recursive dependencies
-                        for rdep in itertools.chain.from_iterable(
-                            d.recursive_dependencies
-                            for d in decorators_by_name[dep]
-                        ):
-                            if rdep not in selected_pkg_names:
-                                continue
-                            # skip edges which are redundant to direct edges
-                            if (deco, rdep) in direct_edges:
-                                continue
-                            indirect_edges[(deco, rdep)].add(category)
-
-            try:
-                # HACK Python 3.5 can't handle Path objects
-                common_path = os.path.commonpath(
-                    [str(p) for p in nodes.values()])
-            except ValueError:
-                common_path = None
-
-            def get_node_data(decorator):
-                nonlocal args
-                nonlocal has_duplicate_names
-                if not has_duplicate_names:
-                    # use name where possible so the dot code is easy to read
-                    return decorator.descriptor.name, \
-                        '' if (
-                            decorator.selected or
-                            not args.dot_include_skipped
-                        ) else '[color = "gray" fontcolor = "gray"]'
-                # otherwise append the descriptor id to make each node unique
-                descriptor_id = id(decorator.descriptor)
-                return (
-                    '{decorator.descriptor.name}_{descriptor_id}'
-                    .format_map(locals()),
-                    ' [label = "{decorator.descriptor.name}"]'
-                    .format_map(locals()),
-                )
-
-            if not args.dot_cluster or common_path is None:
-                # output nodes
-                for deco in nodes.keys():
-                    if (
-                        not deco.selected and
-                        not args.dot_include_skipped
-                    ):
+                node_name, attributes = node_data[deco]
+                yield (
+                    '  "{node_name}"{attributes};'.format_map(locals()))
+        else:
+            # output clusters nested like the directories of the packages
+            root = _Directory()
+            for deco, path in nodes.items():
+                root.add(path.relative_to(common_path).parts, deco)
+            cluster_ids = itertools.count()
+            yield from self._get_cluster_lines(
+                root, node_data, cluster_ids, args.dot_cluster_depth)
+            timings.count('clusters', next(cluster_ids))
+
+        with timings.phase('edge collection'):
+            direct_edges, indirect_edges = self._get_edges(
+                args, decorators, decorators_by_name, selected_pkg_names)
+        timings.count('direct edges', len(direct_edges))
+        timings.count('indirect edges', len(indirect_edges))
+
+        if args.transitive_reduction:
+            with timings.phase('transitive reduction'):
+                index = ReachabilityIndex(decorators)
+                implied_masks = self._get_implied_masks(
+                    index, (direct_edges, indirect_edges))
+
+        # output edges
+        color_mapping = OrderedDict((
+            ('build', '#0000ff'),  # blue
+            ('run', '#ff0000'),  # red
+            ('test', '#d2b48c'),  # tan
+        ))
+        if args.transitive_reduction:
+            # skip edges which are implied by another path
+            def is_implied(deco_start, deco):
+                return implied_masks[index.get_position(deco_start)] & \
+                    (1 << index.get_position(deco))
+        else:
+            is_implied = None
+        if args.collapse_by is not None:
+            yield from self._get_collapsed_edge_lines(
+                groups, (direct_edges, indirect_edges), decorators_by_name,
+                color_mapping, is_implied)
+        else:
+            yield from self._get_edge_lines(
+                node_data, (direct_edges, indirect_edges), decorators_by_name,
+                color_mapping, is_implied)
+
+        if args.legend:
+            yield '  subgraph cluster_legend {'
+            yield '    color=gray'
+            yield '    label="Legend";'
+            yield '    margin=0;'
+            # invisible nodes between the dependency edges
+            yield '    node [label="", shape=none];'
+
+            previous_node = '_legend_first'
+            # an edge for each dependency type
+            for dependency_type, color in color_mapping.items():
+                next_node = '_legend_' + dependency_type
+                yield (
+                    '    {previous_node} -> {next_node} '
+                    '[label="{dependency_type} dep.", color="{color}"];'
+                    .format_map(locals()))
+                previous_node = next_node
+            yield (
+                '    {previous_node} -> _legend_last '
+                '[label="indirect dep.", style="dashed"];'
+                .format_map(locals()))
+
+            # layout all legend nodes on the same rank
+            yield '    {'
+            yield '      rank=same;'
+            yield '      _legend_first;'
+            for dependency_type in color_mapping.keys():
+                yield (
+                    '      _legend_{dependency_type};'
+                    .format_map(locals()))
+            yield '      _legend_last;'
+            yield '    }'
+
+            yield '  }'
+
+        yield '}'
+
+    def _get_edge_lines(
+        self, node_data, edges_collection, decorators_by_name, color_mapping,
+        is_implied,
+    ):
+        quoted_names = {
+            deco: '"' + node_name + '"'
+            for deco, (node_name, _) in node_data.items()}
+        # the attributes of an edge only depend on its categories, if both
+        # packages are selected and its style
+        edge_attributes = {}
+        for style, edges in zip(
+            ('', ', style="dashed"'), edges_collection,
+        ):
+            for (deco_start, node_end), categories in edges.items():
+                start = '  ' + quoted_names[deco_start] + ' -> '
+                categories = frozenset(categories)
+                for deco in decorators_by_name[node_end]:
+                    if is_implied and is_implied(deco_start, deco):
                         continue
-                    node_name, attributes = get_node_data(deco)
-                    lines.append(
-                        '  "{node_name}"{attributes};'.format_map(locals()))
-            else:
-                # output clusters
-                clusters = defaultdict(set)
-                for deco, path in nodes.items():
-                    clusters[path.relative_to(common_path)].add(deco)
-                for i, cluster in zip(range(len(clusters)), clusters.items()):
-                    path, decos = cluster
-                    if path.name:
-                        # wrap cluster in subgraph
-                        lines.append(
-                            '  subgraph cluster_{i} {{'.format_map(locals()))
-                        lines.append(
-                            '    label = "{path}";'.format_map(locals()))
-                        indent = '    '
-                    else:
-                        indent = '  '
-                    for deco in decos:
-                        node_name, attributes = get_node_data(deco)
-                        lines.append(
-                            '{indent}"{node_name}"{attributes};'
-                            .format_map(locals()))
-                    if path.name:
-                        lines.append('  }')
-
-            # output edges
-            color_mapping = OrderedDict((
-                ('build', '#0000ff'),  # blue
-                ('run', '#ff0000'),  # red
-                ('test', '#d2b48c'),  # tan
-            ))
-            for style, edges in zip(
-                ('', ', style="dashed"'),
-                (direct_edges, indirect_edges),
-            ):
-                for (deco_start, node_end), categories in edges.items():
-                    start_name, _ = get_node_data(deco_start)
-                    for deco in decorators_by_name[node_end]:
-                        end_name, _ = get_node_data(deco)
-                        edge_alpha = '' \
-                            if deco_start.selected and deco.selected else '77'
+                    key = (
+                        categories, deco_start.selected and deco.selected,
+                        style)
+                    attributes = edge_attributes.get(key)
+                    if attributes is None:
+                        edge_alpha = '' if key[1] else '77'
                         colors = ':'.join([
                             color + edge_alpha
                             for category, color in color_mapping.items()
                             if category in categories])
-                        lines.append(
-                            '  "{start_name}" -> "{end_name}" '
-                            '[color="{colors}"{style}];'.format_map(locals()))
-
-            if args.legend:
-                lines.append('  subgraph cluster_legend {')
-                lines.append('    color=gray')
-                lines.append('    label="Legend";')
-                lines.append('    margin=0;')
-                # invisible nodes between the dependency edges
-                lines.append('    node [label="", shape=none];')
-
-                previous_node = '_legend_first'
-                # an edge for each dependency type
-                for dependency_type, color in color_mapping.items():
-                    next_node = '_legend_' + dependency_type
-                    lines.append(
-                        '    {previous_node} -> {next_node} '
-                        '[label="{dependency_type} dep.", color="{color}"];'
-                        .format_map(locals()))
-                    previous_node = next_node
-                lines.append(
-                    '    {previous_node} -> _legend_last '
-                    '[label="indirect dep.", style="dashed"];'
+                        attributes = edge_attributes[key] = (
+                            ' [color="{colors}"{style}];'
+                            .format_map(locals()))
+                    yield start + quoted_names[deco] + attributes
+
+    def _get_groups(self, args, nodes, common_path):
+        kind, _, key = args.collapse_by.partition(':')
+        if kind == 'path':
+            # group by the same directories as the nested clusters
+            root = _Directory()
+            for deco, path in nodes.items():
+                if common_path is not None:
+                    path = path.relative_to(common_path)
+                root.add(path.parts, deco)
+            path_groups = {}
+            self._add_path_groups(
+                root, path_groups, args.dot_cluster_depth)
+        groups = OrderedDict()
+        for deco in nodes.keys():
+            desc = deco.descriptor
+            if kind == 'path':
+                group = path_groups[deco]
+            elif kind == 'prefix':
+                group = desc.name.split('_', 1)[0].split('-', 1)[0]
+            else:
+                value = desc.metadata.get(key)
+                group = '(none)' if value is None else str(value)
+            groups[deco] = group
+        return groups
+
+    def _add_path_groups(
+        self, directory, groups, max_depth, *, depth=0, path=None,
+    ):
+        # the packages in deeper directories are part of the last group
+        if max_depth is not None and depth >= max_depth:
+            decos = directory.get_all_decorators()
+            subdirectories = ()
+        else:
+            decos = directory.decorators
+            subdirectories = directory.get_merged_subdirectories()
+        for deco in decos:
+            groups[deco] = path or '.'
+        for name, subdirectory in subdirectories:
+            self._add_path_groups(
+                subdirectory, groups, max_depth, depth=depth + 1,
+                path=os.path.join(path, name) if path else name)
+
+    def _get_group_lines(self, groups):
+        # the number of packages and if any of them is selected
+        package_counts = OrderedDict()
+        selected_groups = set()
+        for deco, group in groups.items():
+            package_counts[group] = package_counts.get(group, 0) + 1
+            if deco.selected:
+                selected_groups.add(group)
+        for group, count in package_counts.items():
+            attributes = '' if group in selected_groups \
+                else ' color = "gray" fontcolor = "gray"'
+            group = _escape(group)
+            yield (
+                '  "{group}" [label = "{group} ({count})"{attributes}];'
+                .format_map(locals()))
+
+    def _get_collapsed_edge_lines(
+        self, groups, edges_collection, decorators_by_name, color_mapping,
+        is_implied,
+    ):
+        for style, edges in zip(
+            ('', ', style="dashed"'), edges_collection,
+        ):
+            # the number of merged edges and their categories
+            group_edges = OrderedDict()
+            for (deco_start, node_end), categories in edges.items():
+                start_group = groups[deco_start]
+                for deco in decorators_by_name[node_end]:
+                    # ignore packages which aren't part of the graph
+                    end_group = groups.get(deco)
+                    if end_group is None or end_group == start_group:
+                        continue
+                    if is_implied and is_implied(deco_start, deco):
+                        continue
+                    group_edge = group_edges.get((start_group, end_group))
+                    if group_edge is None:
+                        group_edge = group_edges[(start_group, end_group)] = \
+                            [0, set(), False]
+                    group_edge[0] += 1
+                    group_edge[1] |= categories
+                    # the edge is only translucent if all merged edges
+                    # involve a skipped package
+                    if deco_start.selected and deco.selected:
+                        group_edge[2] = True
+
+            for (start_group, end_group), group_edge in group_edges.items():
+                count, categories, selected = group_edge
+                edge_alpha = '' if selected else '77'
+                colors = ':'.join([
+                    color + edge_alpha
+                    for category, color in color_mapping.items()
+                    if category in categories])
+                label = ', '.join(
+                    category for category in color_mapping.keys()
+                    if category in categories)
+                start_group = _escape(start_group)
+                end_group = _escape(end_group)
+                yield (
+                    '  "{start_group}" -> "{end_group}" '
+                    '[label="{count} ({label})", color="{colors}"{style}];'
                     .format_map(locals()))
 
-                # layout all legend nodes on the same rank
-                lines.append('    {')
-                lines.append('      rank=same;')
-                lines.append('      _legend_first;')
-                for dependency_type in color_mapping.keys():
-                    lines.append(
-                        '      _legend_{dependency_type};'
-                        .format_map(locals()))
-                lines.append('      _legend_last;')
-                lines.append('    }')
-
-                lines.append('  }')
-
-            lines.append('}')
-
-        for line in lines:
-            print(line)
+    def _get_cluster_lines(
+        self, directory, node_data, cluster_ids, max_depth, *, depth=0,
+        indent='  ',
+    ):
+        # the packages in deeper directories are part of the last cluster
+        if max_depth is not None and depth >= max_depth:
+            decos = directory.get_all_decorators()
+            subdirectories = ()
+        else:
+            decos = directory.decorators
+            subdirectories = directory.get_merged_subdirectories()
+        for deco in decos:
+            node_name, attributes = node_data[deco]
+            yield '{indent}"{node_name}"{attributes};'.format_map(locals())
+
+        for path, subdirectory in subdirectories:
+            i = next(cluster_ids)
+            yield '{indent}subgraph cluster_{i} {{'.format_map(locals())
+            yield '{indent}  label = "{path}";'.format_map(locals())
+            yield from self._get_cluster_lines(
+                subdirectory, node_data, cluster_ids, max_depth,
+                depth=depth + 1, indent=indent + '  ')
+            yield indent + '}'
+
+    def _get_edges(
+        self, args, decorators, decorators_by_name, selected_pkg_names,
+    ):
+        # collect direct dependencies
+        direct_edges = defaultdict(set)
+        for deco in reversed(decorators):
+            if (
+                not deco.selected and
+                not args.dot_include_skipped
+            ):
+                continue
+            # iterate over dependency categories
+            for category, deps in deco.descriptor.dependencies.items():
+                # iterate over dependencies in a deterministic order
+                for dep in sorted(deps):
+                    if dep not in selected_pkg_names:
+                        continue
+                    # store the category of each dependency
+                    # use the decorator
+                    # since there might be packages with the same name
+                    direct_edges[(deco, dep)].add(category)
+
+        # collect indirect dependencies
+        indirect_edges = defaultdict(set)
+        # the selected package names reachable through each skipped dependency
+        # are only computed once and then reused for all dependent packages
+        reachable_pkg_names = {}
+        for deco in reversed(decorators):
+            if not deco.selected:
+                continue
+            # iterate over dependency categories
+            for category, deps in deco.descriptor.dependencies.items():
+                # iterate over dependencies in a deterministic order
+                for dep in sorted(deps):
+                    # ignore direct dependencies
+                    if dep in selected_pkg_names:
+                        continue
+                    # ignore unknown dependencies
+                    if dep not in decorators_by_name.keys():
+                        continue
+                    rdeps = reachable_pkg_names.get(dep)
+                    if rdeps is None:
+                        # collect the selected recursive dependencies
+                        # sorted and without duplicates
+                        rdeps = sorted({
+                            rdep for rdep in itertools.chain.from_iterable(
+                                d.recursive_dependencies
+                                for d in decorators_by_name[dep])
+                            if rdep in selected_pkg_names})
+                        reachable_pkg_names[dep] = rdeps
+                    # iterate over recursive dependencies
+                    for rdep in rdeps:
+                        # skip edges which are redundant to direct edges
+                        if (deco, rdep) in direct_edges:
+                            continue
+                        indirect_edges[(deco, rdep)].add(category)
+        return direct_edges, indirect_edges
+
+    def _get_implied_masks(self, index, edges_collection):
+        # the bitset of the target nodes of each node
+        successors = [0] * len(index.decorators)
+        for edges in edges_collection:
+            for deco_start, node_end in edges.keys():
+                successors[index.get_position(deco_start)] |= \
+                    index.get_name_mask(node_end)
+
+        # the bitset of the nodes reachable from each node
+        reachable = [0] * len(index.decorators)
+        # the bitset of the nodes reachable through another target node
+        implied = [0] * len(index.decorators)
+        # the dependencies of each node are ordered before the node itself
+        for position, mask in enumerate(successors):
+            for i in iterate_bits(mask):
+                implied[position] |= reachable[i]
+            reachable[position] = mask | implied[position]
+        return implied
+
+
+def _escape(value):
+    # escape a value to be used within a quoted DOT string
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+class _Directory:
+    """A directory containing packages and subdirectories with packages."""
+
+    __slots__ = ('decorators', 'subdirectories')
+
+    def __init__(self):
+        # the packages in this directory in the order they were added
+        self.decorators = []
+        # the subdirectories indexed by their name
+        self.subdirectories = {}
+
+    def add(self, parts, decorator):
+        directory = self
+        for part in parts:
+            subdirectory = directory.subdirectories.get(part)
+            if subdirectory is None:
+                subdirectory = directory.subdirectories[part] = _Directory()
+            directory = subdirectory
+        directory.decorators.append(decorator)
+
+    def get_all_decorators(self):
+        decorators = list(self.decorators)
+        for name in sorted(self.subdirectories.keys()):
+            decorators += self.subdirectories[name].get_all_decorators()
+        return decorators
+
+    def get_merged_subdirectories(self):
+        # the subdirectories sorted by name, directories which only contain a
+        # single subdirectory are merged with it into a single level
+        for name in sorted(self.subdirectories.keys()):
+            subdirectory = self.subdirectories[name]
+            names = [name]
+            while (
+                not subdirectory.decorators and
+                len(subdirectory.subdirectories) == 1
+            ):
+                (name, subdirectory), = subdirectory.subdirectories.items()
+                names.append(name)
+            yield os.path.join(*names), subdirectory
@@ -6,11 +6,24 @@ import sys
 
 from colcon_core.package_selection import add_arguments \
     as add_packages_arguments
-from colcon_core.package_selection import get_package_descriptors
 from colcon_core.package_selection import select_package_decorators
 from colcon_core.plugin_system import satisfies_version
-from colcon_core.topological_order import topological_order_packages
 from colcon_core.verb import VerbExtensionPoint
+from colcon_package_information.descriptor_cache \
+    import add_descriptor_cache_arguments
+from colcon_package_information.descriptor_cache \
+    import get_package_descriptors
+from colcon_package_information.output_format import add_format_argument
+from colcon_package_information.output_format import get_package_data
+from colcon_package_information.output_format import write_json
+from colcon_package_information.parallel_identification \
+    import add_discovery_workers_argument
+from colcon_package_information.reverse_dependencies \
+    import ReverseDependencyIndex
+from colcon_package_information.timings import add_timings_arguments
+from colcon_package_information.timings import measure
+from colcon_package_information.topological_order \
+    import topological_order_packages
 
 
 class InfoVerb(VerbExtensionPoint):
@@ -32,15 +45,37 @@ class InfoVerb(VerbExtensionPoint):
             '--build-base',
             default='build',
             help='The base path for all build directories (default: build)')
+        add_descriptor_cache_arguments(parser)
+        add_discovery_workers_argument(parser)
 
         add_packages_arguments(parser)
 
+        parser.add_argument(
+            '--dependents',
+            action='store_true',
+            default=False,
+            help='Also show the packages which directly and recursively '
+                 'depend on each package by dependency category')
+
+        add_format_argument(parser)
+
+        add_timings_arguments(parser)
+
     def main(self, *, context):  # noqa: D102
-        descriptors = get_package_descriptors(
-            context.args, additional_argument_names=['*'])
-        decorators = topological_order_packages(
-            descriptors, recursive_categories=('run', ))
-        select_package_decorators(context.args, decorators)
+        with measure(context.args) as timings:
+            return self._main(context, timings)
+
+    def _main(self, context, timings):
+        with timings.phase('discovery'):
+            descriptors = get_package_descriptors(
+                context.args, additional_argument_names=['*'])
+        timings.count('packages', len(descriptors))
+        with timings.phase('topological order'):
+            decorators = topological_order_packages(
+                descriptors, recursive_categories=('run', ))
+        with timings.phase('selection'):
+            select_package_decorators(context.args, decorators)
+        all_decorators = decorators
 
         if context.args.package_names:
             all_package_names = {d.descriptor.name for d in decorators}
@@ -59,10 +94,50 @@ class InfoVerb(VerbExtensionPoint):
         if not decorators:
             return 'No packages found'
 
-        for decorator in sorted(decorators, key=lambda d: d.descriptor.name):
-            if not decorator.selected:
-                continue
-            pkg = decorator.descriptor
+        selected_decorators = [
+            d for d in sorted(decorators, key=lambda d: d.descriptor.name)
+            if d.selected]
+        pkgs = [d.descriptor for d in selected_decorators]
+        dependents = None
+        if context.args.dependents:
+            with timings.phase('reverse dependency index'):
+                # the dependents of the shown packages include all packages
+                index = ReverseDependencyIndex(all_decorators)
+                dependents = [
+                    self._get_dependents(index, d)
+                    for d in selected_decorators]
+        if context.args.format != 'text':
+            with timings.phase('output'):
+                write_json(
+                    self._get_package_data(pkgs, dependents),
+                    context.args.format)
+            return
+
+        with timings.phase('output'):
+            self._print_packages(pkgs, dependents)
+
+    def _get_dependents(self, index, decorator):
+        # the names of the direct and recursive dependents by category
+        dependents = ({}, {})
+        for category in index.categories:
+            for names, recursive in zip(dependents, (False, True)):
+                decos = index.get_dependents(
+                    [decorator], categories=[category], recursive=recursive)
+                if decos:
+                    names[category] = sorted({
+                        d.descriptor.name for d in decos})
+        return dependents
+
+    def _get_package_data(self, pkgs, dependents):
+        for i, pkg in enumerate(pkgs):
+            data = get_package_data(pkg)
+            if dependents is not None:
+                data['dependents'], data['recursive_dependents'] = \
+                    dependents[i]
+            yield data
+
+    def _print_packages(self, pkgs, dependents=None):
+        for i, pkg in enumerate(pkgs):
             print('path:', pkg.path)
             print('  type:', pkg.type)
             print('  name:', pkg.name)
@@ -72,6 +147,17 @@ class InfoVerb(VerbExtensionPoint):
                     print(
                         '    {category}:'.format_map(locals()),
                         ' '.join(sorted(pkg.dependencies[category])))
+            if dependents is not None:
+                for label, names in zip(
+                    ('dependents', 'recursive dependents'), dependents[i],
+                ):
+                    if not names:
+                        continue
+                    print('  {label}:'.format_map(locals()))
+                    for category in sorted(names.keys()):
+                        print(
+                            '    {category}:'.format_map(locals()),
+                            ' '.join(names[category]))
             if pkg.hooks:
                 print('  hooks:', ' '.join(pkg.hooks))
             if pkg.metadata:
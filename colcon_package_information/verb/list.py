@@ -1,14 +1,37 @@
 # Copyright 2016-2018 Dirk Thomas
 # Licensed under the Apache License, Version 2.0
 
+import sys
+
 from colcon_core.command import get_prog_name
 from colcon_core.package_selection import add_arguments \
     as add_packages_arguments
-from colcon_core.package_selection import get_package_descriptors
 from colcon_core.package_selection import select_package_decorators
 from colcon_core.plugin_system import satisfies_version
-from colcon_core.topological_order import topological_order_packages
 from colcon_core.verb import VerbExtensionPoint
+from colcon_package_information.argument_type import argument_shard
+from colcon_package_information.build_schedule \
+    import get_topological_levels
+from colcon_package_information.build_schedule import read_durations
+from colcon_package_information.changed_packages import get_changed_paths
+from colcon_package_information.changed_packages import PathTrie
+from colcon_package_information.changed_packages import read_changed_paths
+from colcon_package_information.descriptor_cache \
+    import add_descriptor_cache_arguments
+from colcon_package_information.descriptor_cache \
+    import get_package_descriptors
+from colcon_package_information.output_format import add_format_argument
+from colcon_package_information.output_format import write_json
+from colcon_package_information.parallel_identification \
+    import add_discovery_workers_argument
+from colcon_package_information.reverse_dependencies \
+    import ReverseDependencyIndex
+from colcon_package_information.sharding import get_shards
+from colcon_package_information.timings import add_timings_arguments
+from colcon_package_information.timings import measure
+from colcon_package_information.topological_order \
+    import topological_order_packages
+from colcon_package_information.verb.info import argument_package_name
 
 
 class ListVerb(VerbExtensionPoint):
@@ -25,6 +48,8 @@ class ListVerb(VerbExtensionPoint):
             '--build-base',
             default='build',
             help='The base path for all build directories (default: build)')
+        add_descriptor_cache_arguments(parser)
+        add_discovery_workers_argument(parser)
 
         add_packages_arguments(parser)
 
@@ -33,6 +58,15 @@ class ListVerb(VerbExtensionPoint):
             action='store_true',
             default=False,
             help='Order output based on topological ordering (breadth-first)')
+        parser.add_argument(
+            '--levels',
+            action='store_true',
+            default=False,
+            help='Output one line per level of packages which only depend on '
+                 'packages of earlier levels and can be processed in '
+                 'parallel, as a JSON array per level with --format, ordered '
+                 'alphabetically within each level unless '
+                 '--topological-order is passed')
 
         group = parser.add_mutually_exclusive_group()
         group.add_argument(
@@ -46,6 +80,63 @@ class ListVerb(VerbExtensionPoint):
             default=False,
             help='Output only the path of each package but not the name')
 
+        group = parser.add_argument_group('Reverse dependencies')
+        group.add_argument(
+            '--reverse-deps-of',
+            nargs='+', metavar='PKG_NAME',
+            type=argument_package_name,
+            help='Only list packages which depend on any of the passed '
+                 'packages, recursively unless --reverse-deps-direct is '
+                 'passed')
+        group.add_argument(
+            '--reverse-deps-direct',
+            action='store_true',
+            default=False,
+            help='Only consider direct dependencies (only affects '
+                 '--reverse-deps-of)')
+        group.add_argument(
+            '--reverse-deps-categories',
+            nargs='+', metavar='CATEGORY',
+            help='Only consider dependents which directly depend in one of '
+                 'the passed categories (only affects --reverse-deps-of, '
+                 'default: all categories)')
+
+        group = parser.add_argument_group('Changed packages')
+        group.add_argument(
+            '--changed-since',
+            metavar='GIT_REF',
+            default=None,
+            help='Only list packages containing files which changed since '
+                 'the git reference in the repository of the current '
+                 'working directory as well as their recursive dependents, '
+                 "pass '-' to read the changed paths from stdin instead, "
+                 'one per line')
+
+        group = parser.add_argument_group('Sharding')
+        group.add_argument(
+            '--shard',
+            type=argument_shard,
+            metavar='K/N',
+            default=None,
+            help='Only list the packages of the K-th of N shards, which '
+                 'balance the weight of the selected packages while keeping '
+                 'the dependencies on packages of other shards small, every '
+                 'invocation with the same packages results in the same '
+                 'shards')
+        group.add_argument(
+            '--shard-weights',
+            metavar='PATH',
+            default=None,
+            help='Weight the packages with their durations, read from a JSON '
+                 'object mapping package names to seconds or from the event '
+                 'log of a previous build (e.g. log/latest_build/events.log), '
+                 'packages without a duration take the average duration '
+                 '(only affects --shard)')
+
+        add_format_argument(parser)
+
+        add_timings_arguments(parser)
+
         group = parser.add_argument_group('Obsolete arguments')
         command_name = get_prog_name()
         self._add_obsolete_argument(
@@ -100,16 +191,97 @@ class ListVerb(VerbExtensionPoint):
             arg.completer = SuppressCompleter()
         return arg
 
+    def _get_package_data(self, args, pkg):
+        if args.names_only:
+            return {'name': pkg.name}
+        if args.paths_only:
+            return {'path': str(pkg.path)}
+        return {'name': pkg.name, 'path': str(pkg.path), 'type': pkg.type}
+
+    def _get_reverse_dependencies(self, args, decorators):
+        # warn about passed package names which are unknown
+        all_package_names = {d.descriptor.name for d in decorators}
+        for pkg_name in args.reverse_deps_of:
+            if pkg_name not in all_package_names:
+                print(
+                    "Package '{pkg_name}' not found".format_map(locals()),
+                    file=sys.stderr)
+
+        index = ReverseDependencyIndex(decorators)
+        return index.get_dependents(
+            [
+                d for d in decorators
+                if d.descriptor.name in args.reverse_deps_of],
+            categories=args.reverse_deps_categories,
+            recursive=not args.reverse_deps_direct)
+
+    def _get_changed_packages(self, args, decorators, timings):
+        with timings.phase('changed paths'):
+            if args.changed_since == '-':
+                paths = read_changed_paths(sys.stdin)
+            else:
+                paths = get_changed_paths(args.changed_since)
+        timings.count('changed paths', len(paths))
+
+        with timings.phase('path trie'):
+            trie = PathTrie(decorators)
+            changed_decorators = set()
+            for path in paths:
+                changed_decorators.update(trie.get_decorators(path))
+        timings.count('changed packages', len(changed_decorators))
+
+        with timings.phase('reverse dependencies'):
+            index = ReverseDependencyIndex(decorators)
+            changed_decorators.update(index.get_dependents(
+                [d for d in decorators if d in changed_decorators],
+                recursive=True))
+        return [d for d in decorators if d in changed_decorators]
+
+    def _get_level_lines(self, args, levels):
+        if not args.topological_order:
+            levels = [
+                sorted(level, key=lambda d: d.descriptor.name)
+                for level in levels]
+
+        if args.format != 'text':
+            write_json(
+                (
+                    [self._get_package_data(args, d.descriptor) for d in level]
+                    for level in levels),
+                args.format)
+            return
+
+        for level in levels:
+            if args.paths_only:
+                yield ' '.join(str(d.descriptor.path) for d in level)
+            else:
+                yield ' '.join(d.descriptor.name for d in level)
+
     def main(self, *, context):  # noqa: D102
+        with measure(context.args) as timings:
+            return self._main(context, timings)
+
+    def _main(self, context, timings):
         args = context.args
+        weights = None
+        if args.shard is not None and args.shard_weights is not None:
+            try:
+                weights = read_durations(args.shard_weights)
+            except (OSError, ValueError) as e:  # noqa: F841
+                return 'Failed to read the shard weights from ' \
+                    "'{args.shard_weights}': {e}".format_map(locals())
 
-        descriptors = get_package_descriptors(args)
+        with timings.phase('discovery'):
+            descriptors = get_package_descriptors(args)
+        timings.count('packages', len(descriptors))
 
         # always perform topological order for the select package extensions
-        decorators = topological_order_packages(
-            descriptors, recursive_categories=('run', ))
+        with timings.phase('topological order'):
+            decorators = topological_order_packages(
+                descriptors, recursive_categories=('run', ))
 
-        select_package_decorators(args, decorators)
+        with timings.phase('selection'):
+            select_package_decorators(args, decorators)
 
         if args.topological_graph or args.topological_graph_dot:
             additional_options = []
@@ -144,9 +316,45 @@ class ListVerb(VerbExtensionPoint):
             return 'The option --topological-graph-dot-include-skipped must ' \
                 'be used together with --topological-graph-dot'
 
+        if args.changed_since is not None:
+            try:
+                decorators = self._get_changed_packages(
+                    args, decorators, timings)
+            except RuntimeError as e:
+                return str(e)
+
+        if args.reverse_deps_of:
+            with timings.phase('reverse dependencies'):
+                decorators = self._get_reverse_dependencies(args, decorators)
+
+        if args.shard is not None:
+            index, count = args.shard
+            with timings.phase('sharding'):
+                decorators = get_shards(
+                    decorators, count, weights=weights)[index - 1]
+
+        if args.levels:
+            with timings.phase('levels'):
+                levels = get_topological_levels(decorators)
+            timings.count('levels', len(levels))
+            lines = self._get_level_lines(args, levels)
+            with timings.phase('output'):
+                timings.print_lines(lines)
+            return
+
         if not args.topological_order:
             decorators = sorted(
                 decorators, key=lambda d: d.descriptor.name)
+
+        if args.format != 'text':
+            with timings.phase('output'):
+                write_json(
+                    (
+                        self._get_package_data(args, d.descriptor)
+                        for d in decorators if d.selected),
+                    args.format)
+            return
+
         lines = []
         for decorator in decorators:
             if not decorator.selected:
@@ -163,5 +371,5 @@ class ListVerb(VerbExtensionPoint):
             # output names and / or paths in alphabetical order
             lines.sort()
 
-        for line in lines:
-            print(line)
+        with timings.phase('output'):
+            timings.print_lines(lines)
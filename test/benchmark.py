@@ -0,0 +1,317 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+"""
+Benchmark the information verbs on synthetic workspaces.
+
+The packages are generated in memory, therefore the results only cover the
+processing after the discovery of the packages::
+
+  python test/benchmark.py --packages 2000 > result.json
+
+The results are written as JSON to allow comparing them between revisions.
+"""
+
+import argparse
+from contextlib import redirect_stdout
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+from colcon_core.command import add_subparsers
+from colcon_core.command import CommandContext
+from colcon_core.command import create_parser
+from colcon_core.dependency_descriptor import DependencyDescriptor
+from colcon_core.package_descriptor import PackageDescriptor
+from colcon_package_information import __version__
+from colcon_package_information.package_augmentation.\
+    check_dependency_constraint \
+    import CheckDependencyConstraintPackageAugmentation
+from colcon_package_information.verb.graph import GraphVerb
+from colcon_package_information.verb.info import InfoVerb
+from colcon_package_information.verb.list import ListVerb
+
+"""
+The verb invocations being timed.
+
+Each scenario is described by the command line arguments and a flag if
+every second package should be skipped.
+"""
+SCENARIOS = (
+    (['graph'], False),
+    (['graph', '--density'], False),
+    (['graph', '--sparse'], False),
+    (['graph', '--dot'], False),
+    (['graph', '--dot', '--dot-cluster'], False),
+    (['graph', '--dot', '--dot-include-skipped'], True),
+    (['graph', '--dot', '--transitive-reduction'], False),
+    (['graph', '--dot', '--collapse-by', 'prefix'], False),
+    (['graph', '--critical-path', '--parallelism'], False),
+    (['list', '-t'], False),
+    (['list', '--levels'], False),
+    (['list', '--shard', '1/4'], False),
+    (['list', '--reverse-deps-of', 'pkg_00000', 'pkg_00001'], False),
+    (['info'], False),
+    (['info', '--dependents'], False),
+)
+
+"""The dependency categories of the generated packages."""
+CATEGORIES = ('build', 'run', 'test')
+
+
+def create_descriptors(
+    packages, *, dependencies=3, duplicates=0, depth=10, seed=0,
+):
+    """
+    Create package descriptors of a synthetic workspace.
+
+    The packages are distributed over `depth` layers and only depend on
+    packages in lower layers, so the dependency graph doesn't contain
+    cycles.
+    The path of each package is nested according to its layer to provide
+    clusters for the DOT output.
+    Every dependency is constrained to a version range which all packages
+    satisfy.
+
+    :param int packages: The number of unique package names
+    :param int dependencies: The average number of dependencies per package
+    :param int duplicates: The number of additional packages reusing the name
+      (and layer) of another package
+    :param int depth: The number of layers
+    :param int seed: The seed of the random number generator
+    :returns: The package descriptors
+    :rtype: set
+    """
+    rng = random.Random(seed)
+    depth = max(1, min(depth, packages))
+    layers = [[] for _ in range(depth)]
+    for i in range(packages):
+        layers[i * depth // packages].append('pkg_%05d' % i)
+
+    def create_descriptor(name, layer, path):
+        desc = PackageDescriptor(path)
+        desc.type = 'synthetic'
+        desc.name = name
+        desc.metadata['version'] = '1.0.%d' % rng.randrange(100)
+        lower_names = [n for lower in layers[:layer] for n in lower]
+        count = min(
+            len(lower_names), rng.randint(0, 2 * dependencies))
+        for category in CATEGORIES:
+            desc.dependencies[category] = set()
+        for dep_name in rng.sample(lower_names, count):
+            desc.dependencies[rng.choice(CATEGORIES)].add(
+                DependencyDescriptor(dep_name, metadata={
+                    'version_gte': '1.0', 'version_lt': '2.0'}))
+        return desc
+
+    descs = set()
+    for layer, names in enumerate(layers):
+        for name in names:
+            path = os.path.join(
+                'src', *('layer_%d' % i for i in range(layer + 1)), name)
+            descs.add(create_descriptor(name, layer, path))
+    for i in range(duplicates):
+        layer = rng.randrange(depth)
+        name = rng.choice(layers[layer])
+        descs.add(create_descriptor(
+            name, layer, os.path.join('underlay_%d' % i, name)))
+    return descs
+
+
+def create_verb_parser():
+    """
+    Create the argument parser for the information verbs.
+
+    :returns: The argument parser
+    """
+    verb_extensions = {
+        'graph': GraphVerb(),
+        'info': InfoVerb(),
+        'list': ListVerb(),
+    }
+    for name, extension in verb_extensions.items():
+        extension.VERB_NAME = name
+    parser = create_parser()
+    add_subparsers(parser, 'colcon', verb_extensions, attribute='verb_name')
+    return parser
+
+
+def run_benchmark(descs, *, repeat=3, scenarios=None):
+    """
+    Time the information verbs and the constraint augmentation.
+
+    The output of the verbs is written to the null device.
+
+    :param descs: The package descriptors
+    :param int repeat: The number of times each scenario is timed
+    :param scenarios: The names of the scenarios to run, which are the
+      space separated arguments of the verbs or
+      `check_dependency_constraint`, if `None` all scenarios are run
+    :returns: A list with one dictionary per scenario containing the keys
+      `name`, `argv`, `min`, `median` and `max` (the times in seconds)
+    :rtype: list
+    """
+    parser = create_verb_parser()
+    results = []
+
+    def add_result(name, argv, function):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+        results.append({
+            'name': name,
+            'argv': argv,
+            'min': min(times),
+            'median': statistics.median(times),
+            'max': max(times),
+        })
+
+    with open(os.devnull, 'w') as devnull:
+        for argv, skip in SCENARIOS:
+            name = ' '.join(argv)
+            if scenarios is not None and name not in scenarios:
+                continue
+            args = parser.parse_args(args=argv)
+            context = CommandContext(command_name='colcon', args=args)
+            verb = args.main.__self__
+            module = sys.modules[type(verb).__module__]
+
+            def select_package_decorators(args, decorators, skip=skip):
+                if skip:
+                    for decorator in decorators[::2]:
+                        decorator.selected = False
+
+            def invoke():
+                with patch.object(
+                    module, 'get_package_descriptors', return_value=descs
+                ), patch.object(
+                    module, 'select_package_decorators',
+                    side_effect=select_package_decorators
+                ), redirect_stdout(devnull):
+                    rc = verb.main(context=context)
+                assert not rc, rc
+
+            add_result(name, argv, invoke)
+
+    name = 'check_dependency_constraint'
+    if scenarios is None or name in scenarios:
+        extension = CheckDependencyConstraintPackageAugmentation()
+        add_result(name, None, lambda: extension.augment_packages(descs))
+
+    return results
+
+
+def main(argv=None):
+    """
+    Run the benchmark and output the results as JSON.
+
+    :param list argv: The command line arguments
+    :returns: The return code
+    """
+    parser = argparse.ArgumentParser(
+        prog='benchmark.py',
+        description='Benchmark the information verbs on a synthetic '
+                    'workspace')
+    parser.add_argument(
+        '--packages', type=int, default=500,
+        help='The number of unique package names (default: 500)')
+    parser.add_argument(
+        '--dependencies', type=int, default=3,
+        help='The average number of dependencies per package (default: 3)')
+    parser.add_argument(
+        '--duplicates', type=int, default=0,
+        help='The number of additional packages with the same name as '
+             'another package (default: 0)')
+    parser.add_argument(
+        '--depth', type=int, default=10,
+        help='The number of layers of the dependency graph (default: 10)')
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='The seed of the random number generator (default: 0)')
+    parser.add_argument(
+        '--repeat', type=int, default=3,
+        help='The number of times each scenario is timed (default: 3)')
+    parser.add_argument(
+        '--scenarios', nargs='*', metavar='NAME',
+        choices=[' '.join(argv) for argv, _ in SCENARIOS] + [
+            'check_dependency_constraint'],
+        help='Only run a subset of the scenarios, each passed as a single '
+             'argument')
+    parser.add_argument(
+        '--baseline', metavar='PATH',
+        help='Compare the results to a previous result file and fail if any '
+             'scenario is slower than the tolerance allows')
+    parser.add_argument(
+        '--tolerance', type=float, default=0.2,
+        help='The relative slowdown compared to the baseline which is '
+             'tolerated (default: 0.2)')
+    args = parser.parse_args(argv)
+
+    parameters = {
+        'packages': args.packages,
+        'dependencies': args.dependencies,
+        'duplicates': args.duplicates,
+        'depth': args.depth,
+        'seed': args.seed,
+        'repeat': args.repeat,
+    }
+    descs = create_descriptors(
+        args.packages, dependencies=args.dependencies,
+        duplicates=args.duplicates, depth=args.depth, seed=args.seed)
+    results = run_benchmark(
+        descs, repeat=args.repeat, scenarios=args.scenarios)
+
+    json.dump({
+        'version': __version__,
+        'python': platform.python_version(),
+        'parameters': parameters,
+        'results': results,
+    }, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+    if args.baseline:
+        with open(args.baseline, 'r') as h:
+            baseline = json.load(h)
+        regressions = get_regressions(
+            baseline['results'], results, tolerance=args.tolerance)
+        if regressions:
+            return 'Slower than the baseline: ' + ', '.join(
+                '{0} ({1:.3f}s instead of {2:.3f}s)'.format(*r)
+                for r in regressions)
+    return 0
+
+
+def get_regressions(baseline, results, *, tolerance):
+    """
+    Compare benchmark results to a baseline.
+
+    The fastest time of each scenario is compared.
+
+    :param baseline: The results of a previous run
+    :param results: The current results
+    :param float tolerance: The relative slowdown which is tolerated
+    :returns: A list of tuples containing the scenario name, the current and
+      the baseline time for each scenario being slower than tolerated
+    :rtype: list
+    """
+    baseline_times = {r['name']: r['min'] for r in baseline}
+    regressions = []
+    for result in results:
+        baseline_time = baseline_times.get(result['name'])
+        if baseline_time is None:
+            continue
+        if result['min'] > baseline_time * (1 + tolerance):
+            regressions.append(
+                (result['name'], result['min'], baseline_time))
+    return regressions
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
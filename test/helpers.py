@@ -0,0 +1,44 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+import argparse
+
+from colcon_core.package_descriptor import PackageDescriptor
+
+
+def create_descriptor(name, path, **dependencies):
+    """
+    Create a package descriptor.
+
+    :param str name: The package name
+    :param path: The package path
+    :param dependencies: The names of the dependencies by category
+    :returns: The package descriptor
+    """
+    desc = PackageDescriptor(path)
+    desc.type = 'test'
+    desc.name = name
+    for category, deps in dependencies.items():
+        desc.dependencies[category] = set(deps)
+    return desc
+
+
+def get_verb_args(extension, **kwargs):
+    """
+    Get the parsed arguments of a verb with their default values.
+
+    :param extension: The verb extension adding its arguments
+    :param kwargs: The values of the arguments which differ from the default
+    :returns: The parsed arguments
+    :raises AttributeError: if an argument isn't added by the verb
+    """
+    parser = argparse.ArgumentParser()
+    extension.add_arguments(parser=parser)
+    args = parser.parse_args([])
+    for name, value in kwargs.items():
+        if not hasattr(args, name):
+            raise AttributeError(
+                "The verb doesn't have an argument '{name}'"
+                .format_map(locals()))
+        setattr(args, name, value)
+    return args
@@ -0,0 +1,33 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+import argparse
+
+from colcon_package_information.argument_type import argument_collapse_by
+from colcon_package_information.argument_type import argument_positive_int
+from colcon_package_information.argument_type import argument_shard
+import pytest
+
+
+def test_argument_collapse_by():
+    assert argument_collapse_by('path') == 'path'
+    assert argument_collapse_by('metadata:key') == 'metadata:key'
+    for value in ('name', 'metadata:', 'metadata'):
+        with pytest.raises(argparse.ArgumentTypeError):
+            argument_collapse_by(value)
+
+
+def test_argument_positive_int():
+    assert argument_positive_int('1') == 1
+    assert argument_positive_int('32') == 32
+    for value in ('0', '-1', '1.5', 'many'):
+        with pytest.raises(argparse.ArgumentTypeError):
+            argument_positive_int(value)
+
+
+def test_argument_shard():
+    assert argument_shard('1/1') == (1, 1)
+    assert argument_shard('2/3') == (2, 3)
+    for value in ('0/2', '3/2', '1/0', '1', 'a/b', '1/2/3'):
+        with pytest.raises(argparse.ArgumentTypeError):
+            argument_shard(value)
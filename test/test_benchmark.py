@@ -0,0 +1,61 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+import json
+
+from benchmark import create_descriptors
+from benchmark import get_regressions
+from benchmark import main
+from benchmark import SCENARIOS
+
+
+def test_create_descriptors():
+    descs = create_descriptors(50, dependencies=2, duplicates=3, depth=5)
+    assert len(descs) == 53
+    assert len({d.name for d in descs}) == 50
+    assert {
+        (d.name, str(d.path), tuple(sorted(d.get_dependencies())))
+        for d in descs
+    } == {
+        (d.name, str(d.path), tuple(sorted(d.get_dependencies())))
+        for d in create_descriptors(
+            50, dependencies=2, duplicates=3, depth=5)
+    }
+    # packages in the lowest layer don't have dependencies
+    assert not any(
+        d.get_dependencies() for d in descs
+        if d.name < 'pkg_%05d' % 10 and 'underlay' not in str(d.path))
+
+
+def test_main(capsys, tmp_path):
+    rc = main([
+        '--packages', '20', '--duplicates', '2', '--depth', '3',
+        '--repeat', '1'])
+    assert rc == 0
+    data = json.loads(capsys.readouterr().out)
+    assert data['parameters']['packages'] == 20
+    assert [r['name'] for r in data['results']] == [
+        ' '.join(argv) for argv, _ in SCENARIOS
+    ] + ['check_dependency_constraint']
+    assert all(r['min'] <= r['median'] <= r['max'] for r in data['results'])
+
+    # compare with a baseline
+    for result in data['results']:
+        result['min'] = 1e-9
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps(data))
+    rc = main([
+        '--packages', '20', '--repeat', '1', '--scenarios', 'list -t',
+        '--baseline', str(baseline)])
+    assert rc.startswith('Slower than the baseline: list -t (')
+
+
+def test_get_regressions():
+    baseline = [{'name': 'a', 'min': 1.0}, {'name': 'b', 'min': 1.0}]
+    results = [
+        {'name': 'a', 'min': 1.1},
+        {'name': 'b', 'min': 1.3},
+        {'name': 'c', 'min': 5.0},
+    ]
+    assert get_regressions(baseline, results, tolerance=0.2) == [
+        ('b', 1.3, 1.0)]
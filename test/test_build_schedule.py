@@ -0,0 +1,91 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+import json
+import random
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from colcon_core.topological_order import topological_order_packages
+from colcon_package_information.build_schedule import get_build_schedule
+from colcon_package_information.build_schedule \
+    import get_topological_levels
+from colcon_package_information.verb.list import ListVerb
+from helpers import create_descriptor
+from helpers import get_verb_args
+
+
+def test_levels_match_schedule():
+    rng = random.Random(3)
+    descs = set()
+    for i in range(40):
+        descs.add(create_descriptor(
+            'pkg_%d' % i, '/tmp/pkg_%d' % i, **{
+                category: {
+                    'pkg_%d' % j for j in range(i) if rng.random() < 0.05}
+                for category in ('build', 'run', 'test')}))
+    decorators = topological_order_packages(
+        descs, recursive_categories=('run', ))
+    for deco in decorators:
+        deco.selected = rng.random() < 0.7
+
+    levels = get_topological_levels(decorators)
+    # every selected package is part of exactly one level
+    assert sorted(id(d) for level in levels for d in level) == \
+        sorted(id(d) for d in decorators if d.selected)
+    # each package depends only on packages of earlier levels
+    seen = set()
+    for level in levels:
+        names = {d.descriptor.name for d in level}
+        for deco in level:
+            assert not names & set(deco.recursive_dependencies)
+        seen |= names
+        for deco in level:
+            dependencies = {
+                d.descriptor.name for d in decorators if d.selected} & \
+                set(deco.recursive_dependencies)
+            assert dependencies <= seen
+    schedule = get_build_schedule(decorators)
+    assert [len(level) for level in levels] == schedule.level_widths
+
+
+def _get_descriptors():
+    return {
+        create_descriptor('pkg_a', '/ws/src/pkg_a'),
+        create_descriptor('pkg_b', '/ws/src/pkg_b'),
+        create_descriptor('pkg_c', '/ws/src/pkg_c', build={'pkg_b'}),
+        create_descriptor(
+            'pkg_d', '/ws/src/pkg_d', build={'pkg_a'}, run={'pkg_c'}),
+        create_descriptor('pkg_e', '/ws/src/pkg_e', test={'pkg_d'}),
+    }
+
+
+def test_list_levels(capsys):
+    def list_packages(**kwargs):
+        args = get_verb_args(ListVerb(), levels=True, **kwargs)
+        rc = ListVerb().main(context=SimpleNamespace(args=args))
+        assert not rc
+        return capsys.readouterr().out.splitlines()
+
+    with patch(
+        'colcon_package_information.verb.list.get_package_descriptors',
+        return_value=_get_descriptors()
+    ), patch(
+        'colcon_package_information.verb.list.select_package_decorators'
+    ):
+        assert list_packages() == [
+            'pkg_a pkg_b',
+            'pkg_c',
+            'pkg_d',
+            'pkg_e',
+        ]
+        assert list_packages(paths_only=True)[0] == \
+            '/ws/src/pkg_a /ws/src/pkg_b'
+
+        lines = list_packages(names_only=True, format='jsonl')
+        assert [json.loads(line) for line in lines] == [
+            [{'name': 'pkg_a'}, {'name': 'pkg_b'}],
+            [{'name': 'pkg_c'}],
+            [{'name': 'pkg_d'}],
+            [{'name': 'pkg_e'}],
+        ]
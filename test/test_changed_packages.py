@@ -0,0 +1,135 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+import io
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from colcon_core.topological_order import topological_order_packages
+from colcon_package_information.changed_packages import get_changed_paths
+from colcon_package_information.changed_packages import PathTrie
+from colcon_package_information.changed_packages import read_changed_paths
+from colcon_package_information.verb.list import ListVerb
+from helpers import create_descriptor
+from helpers import get_verb_args
+import pytest
+
+
+def _get_descriptors(base_path):
+    return {
+        create_descriptor('pkg_a', base_path / 'src' / 'pkg_a'),
+        create_descriptor(
+            'pkg_b', base_path / 'src' / 'pkg_b', build={'pkg_a'}),
+        create_descriptor(
+            'pkg_c', base_path / 'src' / 'pkg_b' / 'nested' / 'pkg_c'),
+        create_descriptor(
+            'pkg_d', base_path / 'src' / 'pkg_d', run={'pkg_c'}),
+        create_descriptor(
+            'pkg_e', base_path / 'src' / 'pkg_e', test={'pkg_d'}),
+    }
+
+
+def test_path_trie(tmp_path):
+    decorators = topological_order_packages(_get_descriptors(tmp_path))
+    trie = PathTrie(decorators)
+
+    def get_names(*parts):
+        path = os.path.join(str(tmp_path), *parts)
+        return [d.descriptor.name for d in trie.get_decorators(path)]
+
+    assert get_names('src', 'pkg_a', 'package.xml') == ['pkg_a']
+    assert get_names('src', 'pkg_a') == ['pkg_a']
+    assert get_names('src', 'pkg_b', 'nested', 'file') == ['pkg_b']
+    # the innermost package contains the path
+    assert get_names('src', 'pkg_b', 'nested', 'pkg_c', 'file') == ['pkg_c']
+    # a common prefix of the name isn't a parent directory
+    assert get_names('src', 'pkg_a_suffix', 'file') == []
+    assert get_names('src', 'file') == []
+    assert get_names() == []
+    # the paths are normalized
+    assert get_names('src', 'pkg_b', '..', 'pkg_a', 'file') == ['pkg_a']
+    assert [
+        d.descriptor.name for d in trie.get_decorators(
+            str(tmp_path) + '/src/pkg_a/file')
+    ] == ['pkg_a']
+
+
+def test_read_changed_paths(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    paths = read_changed_paths(io.StringIO('src/file\n\n/abs/file\r\n'))
+    assert paths == [
+        os.path.abspath(str(tmp_path / 'src' / 'file')),
+        os.path.abspath('/abs/file')]
+
+
+def _git(path, *args):
+    subprocess.run(
+        ['git', '-c', 'user.name=test', '-c', 'user.email=test@test'] +
+        list(args),
+        cwd=str(path), check=True, stdout=subprocess.DEVNULL)
+
+
+def _create_repository(path):
+    for name in ('a', 'b', 'c'):
+        (path / name).mkdir()
+        (path / name / 'file').write_text(name)
+    _git(path, 'init', '-q')
+    _git(path, 'add', '.')
+    _git(path, 'commit', '-q', '-m', 'initial')
+
+
+def test_get_changed_paths(tmp_path):
+    _create_repository(tmp_path)
+    assert get_changed_paths('HEAD', cwd=str(tmp_path / 'a')) == []
+
+    (tmp_path / 'a' / 'file').write_text('changed')
+    _git(tmp_path, 'mv', 'b/file', 'c/moved')
+    _git(tmp_path, 'commit', '-q', '-m', 'move')
+    (tmp_path / 'c' / 'untracked').write_text('')
+    toplevel = os.path.realpath(str(tmp_path))
+    paths = get_changed_paths('HEAD~1', cwd=str(tmp_path / 'a'))
+    assert sorted(paths) == [
+        os.path.abspath(os.path.join(toplevel, *parts)) for parts in (
+            ('a', 'file'), ('b', 'file'), ('c', 'moved'),
+            ('c', 'untracked'))]
+
+    with pytest.raises(RuntimeError, match="'git diff'"):
+        get_changed_paths('unknown', cwd=str(tmp_path))
+
+
+def _list_packages(capsys, base_path, **kwargs):
+    kwargs.setdefault('changed_since', '-')
+    args = get_verb_args(
+        ListVerb(), topological_order=True, names_only=True, **kwargs)
+
+    with patch(
+        'colcon_package_information.verb.list.get_package_descriptors',
+        return_value=_get_descriptors(base_path)
+    ), patch(
+        'colcon_package_information.verb.list.select_package_decorators'
+    ):
+        rc = ListVerb().main(context=SimpleNamespace(args=args))
+    return rc, capsys.readouterr().out.splitlines()
+
+
+def test_list_changed_since(capsys, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, 'stdin', io.StringIO(
+        'src/pkg_b/nested/pkg_c/CMakeLists.txt\n'
+        'src/unrelated/file\n'))
+    rc, lines = _list_packages(capsys, tmp_path)
+    assert not rc
+    # the changed package and its recursive dependents
+    assert lines == ['pkg_c', 'pkg_d', 'pkg_e']
+
+    _create_repository(tmp_path)
+    rc, lines = _list_packages(capsys, tmp_path, changed_since='HEAD')
+    assert not rc
+    assert lines == []
+
+    rc, lines = _list_packages(capsys, tmp_path, changed_since='unknown')
+    assert rc.startswith("Failed to invoke 'git diff': ")
+    assert lines == []
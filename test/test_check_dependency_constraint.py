@@ -1,6 +1,7 @@
 # Copyright 2024 Open Source Robotics Foundation, Inc.
 # Licensed under the Apache License, Version 2.0
 
+import json
 from unittest.mock import patch
 
 from colcon_core.dependency_descriptor import DependencyDescriptor
@@ -8,6 +9,17 @@ from colcon_core.package_descriptor import PackageDescriptor
 from colcon_package_information.package_augmentation.\
     check_dependency_constraint \
     import CheckDependencyConstraintPackageAugmentation
+from colcon_package_information.package_augmentation.\
+    check_dependency_constraint \
+    import CONSTRAINT_REPORT_ENVIRONMENT_VARIABLE
+from colcon_package_information.package_augmentation.\
+    check_dependency_constraint \
+    import CONSTRAINT_REPORT_FILE_ENVIRONMENT_VARIABLE
+from colcon_package_information.package_augmentation.\
+    check_dependency_constraint \
+    import reuse_dependency_constraints
+from packaging.specifiers import SpecifierSet
+from packaging.version import Version
 import pytest
 
 
@@ -116,3 +128,280 @@ def test_dependency_invalid_version_operator():
 
     extension = CheckDependencyConstraintPackageAugmentation()
     extension.augment_packages({pkg_a, pkg_b})
+
+
+def test_versions_parsed_once():
+    pkg_a = PackageDescriptor('/tmp/pkg_a')
+    pkg_a.name = 'pkg_a'
+    pkg_a.metadata['version'] = '2.0'
+
+    descs = {pkg_a}
+    for i in range(10):
+        pkg = PackageDescriptor('/tmp/pkg_%d' % i)
+        pkg.name = 'pkg_%d' % i
+        pkg.metadata['version'] = '1.0'
+        pkg.dependencies['build'] = {
+            DependencyDescriptor('pkg_a', metadata={
+                'version_gte': '1.0', 'version_lt': '3.0'}),
+        }
+        descs.add(pkg)
+
+    extension = CheckDependencyConstraintPackageAugmentation()
+    with patch(
+        'colcon_package_information.package_augmentation.'
+        'check_dependency_constraint._parse_version', wraps=Version
+    ) as version, patch(
+        'colcon_package_information.package_augmentation.'
+        'check_dependency_constraint.logger.warning'
+    ) as warning:
+        extension.augment_packages(descs)
+    assert warning.call_count == 0
+    assert version.call_count == 3
+
+
+class ConstraintsProvider:
+
+    def __init__(self):
+        self.constraints = {}
+        self.unchanged = set()
+
+    def get_constraints(self, location):
+        if location not in self.unchanged:
+            return None
+        return self.constraints.get(location)
+
+    def set_constraints(self, location, constraints):
+        self.constraints[location] = constraints
+
+
+def test_reused_constraints():
+    pkg_a = PackageDescriptor('/tmp/pkg_a')
+    pkg_a.name = 'pkg_a'
+    pkg_a.metadata['version'] = '2.0'
+    pkg_b = PackageDescriptor('/tmp/pkg_b')
+    pkg_b.name = 'pkg_b'
+    pkg_b.dependencies['build'] = {
+        DependencyDescriptor('pkg_a', metadata={'version_lt': '2.0'}),
+        DependencyDescriptor('pkg_c'),
+    }
+    pkg_c = PackageDescriptor('/tmp/pkg_c')
+    pkg_c.name = 'pkg_c'
+    pkg_c.dependencies['build'] = {
+        DependencyDescriptor('pkg_a', metadata={'version_gte': '2.0'}),
+    }
+    descs = {pkg_a, pkg_b, pkg_c}
+
+    extension = CheckDependencyConstraintPackageAugmentation()
+    provider = ConstraintsProvider()
+
+    def check():
+        with reuse_dependency_constraints(provider), patch.object(
+            PackageDescriptor, 'get_dependencies', autospec=True,
+            side_effect=PackageDescriptor.get_dependencies
+        ) as get_dependencies, patch(
+            'colcon_package_information.package_augmentation.'
+            'check_dependency_constraint._parse_version', wraps=Version
+        ) as version, patch(
+            'colcon_package_information.package_augmentation.'
+            'check_dependency_constraint.logger.warning'
+        ) as warning:
+            extension.augment_packages(descs)
+        return (
+            get_dependencies.call_count, version.call_count,
+            warning.call_count)
+
+    assert check() == (3, 1, 1)
+    assert provider.constraints['/tmp/pkg_b'][0] == [
+        ('pkg_a', [('version_lt', '2.0')])]
+
+    # the dependencies of unchanged packages aren't collected again and the
+    # outcomes are replayed
+    provider.unchanged = {'/tmp/pkg_a', '/tmp/pkg_b', '/tmp/pkg_c'}
+    assert check() == (0, 0, 1)
+
+    # only the constraints on a changed version are checked again
+    pkg_a.metadata['version'] = '1.0'
+    assert check() == (0, 2, 1)
+
+    # changed packages collect their dependencies again
+    provider.unchanged = {'/tmp/pkg_a', '/tmp/pkg_c'}
+    pkg_b.dependencies['build'] = set()
+    assert check() == (1, 0, 1)
+
+
+def test_violation_report(tmp_path, monkeypatch):
+    pkg_a = PackageDescriptor('/tmp/pkg_a')
+    pkg_a.name = 'pkg_a'
+    pkg_a.metadata['version'] = '2.0'
+
+    descs = {pkg_a}
+    for name, version_lt in (('pkg_c', '2.0'), ('pkg_b', '1.5')):
+        pkg = PackageDescriptor('/tmp/' + name)
+        pkg.name = name
+        pkg.metadata['version'] = '1.0'
+        pkg.dependencies['build'] = {
+            DependencyDescriptor('pkg_a', metadata={
+                'version_lt': version_lt}),
+        }
+        descs.add(pkg)
+    pkg_b = next(d for d in descs if d.name == 'pkg_b')
+    pkg_b.dependencies['run'] = {
+        DependencyDescriptor('pkg_c', metadata={'version_gt': '1.0'})}
+
+    report_file = tmp_path / 'report.json'
+    monkeypatch.setenv(
+        CONSTRAINT_REPORT_FILE_ENVIRONMENT_VARIABLE.name, str(report_file))
+    extension = CheckDependencyConstraintPackageAugmentation()
+    with patch(
+        'colcon_package_information.package_augmentation.'
+        'check_dependency_constraint.logger.warning'
+    ) as warning:
+        extension.augment_packages(descs)
+    assert warning.call_count == 1
+    assert warning.call_args[0][0].splitlines() == [
+        '3 dependency constraints are violated:',
+        '- pkg_a 2.0 is expected by pkg_b (less than 1.5), '
+        'pkg_c (less than 2.0)',
+        '- pkg_c 1.0 is expected by pkg_b (greater than 1.0)',
+    ]
+    assert json.loads(report_file.read_text()) == [
+        {
+            'dependency': 'pkg_a',
+            'path': '/tmp/pkg_a',
+            'version': '2.0',
+            'dependents': [
+                {'package': 'pkg_b', 'path': '/tmp/pkg_b',
+                 'operator': 'version_lt', 'constraint': '1.5'},
+                {'package': 'pkg_c', 'path': '/tmp/pkg_c',
+                 'operator': 'version_lt', 'constraint': '2.0'},
+            ],
+        },
+        {
+            'dependency': 'pkg_c',
+            'path': '/tmp/pkg_c',
+            'version': '1.0',
+            'dependents': [
+                {'package': 'pkg_b', 'path': '/tmp/pkg_b',
+                 'operator': 'version_gt', 'constraint': '1.0'},
+            ],
+        },
+    ]
+
+    # without violations no summary is logged
+    monkeypatch.delenv(CONSTRAINT_REPORT_FILE_ENVIRONMENT_VARIABLE.name)
+    monkeypatch.setenv(CONSTRAINT_REPORT_ENVIRONMENT_VARIABLE.name, '1')
+    with patch(
+        'colcon_package_information.package_augmentation.'
+        'check_dependency_constraint.logger.warning'
+    ) as warning:
+        extension.augment_packages({pkg_a})
+    assert warning.call_count == 0
+
+
+def test_duplicate_package_names(monkeypatch):
+    pkg_a_v1 = PackageDescriptor('/tmp/overlay/pkg_a')
+    pkg_a_v1.name = 'pkg_a'
+    pkg_a_v1.metadata['version'] = '1.0'
+    pkg_a_v2 = PackageDescriptor('/tmp/underlay/pkg_a')
+    pkg_a_v2.name = 'pkg_a'
+    pkg_a_v2.metadata['version'] = '2.0'
+
+    # both packages with the same name are being checked
+    descs = set()
+    for path in ('/tmp/overlay/pkg_b', '/tmp/underlay/pkg_b'):
+        pkg_b = PackageDescriptor(path)
+        pkg_b.name = 'pkg_b'
+        pkg_b.dependencies['build'] = {
+            DependencyDescriptor('pkg_a', metadata={'version_gte': '2.0'}),
+        }
+        descs.add(pkg_b)
+    descs |= {pkg_a_v1, pkg_a_v2}
+    assert len(descs) == 4
+
+    extension = CheckDependencyConstraintPackageAugmentation()
+    with patch(
+        'colcon_package_information.package_augmentation.'
+        'check_dependency_constraint.logger.warning'
+    ) as warning:
+        extension.augment_packages(descs)
+    assert warning.call_count == 2
+
+    monkeypatch.setenv(CONSTRAINT_REPORT_ENVIRONMENT_VARIABLE.name, '1')
+    with patch(
+        'colcon_package_information.package_augmentation.'
+        'check_dependency_constraint.logger.warning'
+    ) as warning:
+        extension.augment_packages(descs)
+    assert warning.call_count == 1
+    assert warning.call_args[0][0].splitlines() == [
+        '2 dependency constraints are violated:',
+        '- pkg_a 1.0 is expected by '
+        'pkg_b in /tmp/overlay/pkg_b (greater than or equal to 2.0), '
+        'pkg_b in /tmp/underlay/pkg_b (greater than or equal to 2.0)',
+    ]
+
+
+@pytest.mark.parametrize(
+    'specifier,expect_violation', [
+        ('>=1.2,<2.0,!=1.5.*', 0),
+        ('<2.0, >=1.2', 0),
+        ('>=1.2,<2.0,!=1.4.*', 1),
+        ('>=2.0', 1),
+        ('~=1.3', 0),
+        ('==1.4.2rc1', 1),
+    ])
+def test_specifier(specifier, expect_violation):
+    pkg_a = PackageDescriptor('/tmp/pkg_a')
+    pkg_a.name = 'pkg_a'
+    pkg_a.metadata['version'] = '1.4.2'
+
+    pkg_b = PackageDescriptor('/tmp/pkg_b')
+    pkg_b.name = 'pkg_b'
+    pkg_b.dependencies['build'] = {
+        DependencyDescriptor('pkg_a', metadata={
+            'version_specifier': specifier}),
+    }
+
+    extension = CheckDependencyConstraintPackageAugmentation()
+    with patch(
+        'colcon_package_information.package_augmentation.'
+        'check_dependency_constraint.logger.warning'
+    ) as warning:
+        extension.augment_packages({pkg_a, pkg_b})
+    assert warning.call_count == expect_violation
+
+
+def test_specifier_compiled_once():
+    pkg_core = PackageDescriptor('/tmp/core')
+    pkg_core.name = 'core'
+    pkg_core.metadata['version'] = '3.1'
+
+    descs = {pkg_core}
+    for i in range(20):
+        pkg = PackageDescriptor('/tmp/pkg_%d' % i)
+        pkg.name = 'pkg_%d' % i
+        pkg.dependencies['build'] = {
+            DependencyDescriptor('core', metadata={
+                'version_specifier': '>=3' if i % 2 else '>= 3'}),
+        }
+        descs.add(pkg)
+    pkg = PackageDescriptor('/tmp/pkg_invalid')
+    pkg.name = 'pkg_invalid'
+    pkg.dependencies['build'] = {
+        DependencyDescriptor('core', metadata={
+            'version_specifier': 'totally!invalid&specifier'}),
+    }
+    descs.add(pkg)
+
+    extension = CheckDependencyConstraintPackageAugmentation()
+    with patch(
+        'colcon_package_information.package_augmentation.'
+        'check_dependency_constraint._parse_specifier', wraps=SpecifierSet
+    ) as specifier_set, patch(
+        'colcon_package_information.package_augmentation.'
+        'check_dependency_constraint.logger'
+    ) as logger:
+        extension.augment_packages(descs)
+    assert specifier_set.call_count == 3
+    assert logger.warning.call_count == 0
+    assert logger.error.call_count == 1
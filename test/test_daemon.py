@@ -0,0 +1,213 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+import json
+import os
+import socket
+import stat
+import threading
+import time
+from unittest.mock import patch
+
+from colcon_core.logging import colcon_logger
+from colcon_core.package_descriptor import PackageDescriptor
+from colcon_package_information.daemon import get_verb_error
+from colcon_package_information.daemon import main
+from colcon_package_information.daemon import query
+from colcon_package_information.daemon import QueryDaemon
+from colcon_package_information.daemon import stop
+import pytest
+
+requires_unix_sockets = pytest.mark.skipif(
+    not hasattr(socket, 'AF_UNIX'),
+    reason='Unix domain sockets are not supported')
+
+
+def _get_descriptors():
+    descs = set()
+    for name, deps in (('pkg_a', set()), ('pkg_b', {'pkg_a'})):
+        desc = PackageDescriptor('/ws/src/' + name)
+        desc.type = 'test'
+        desc.name = name
+        desc.dependencies['run'] = deps
+        descs.add(desc)
+    return descs
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    # the daemon enables process wide caches
+    with patch(
+        'colcon_package_information.descriptor_cache._caches_in_memory', None
+    ), patch(
+        'colcon_package_information.topological_order._memoized_results', None
+    ):
+        yield str(tmp_path / 'daemon.sock')
+
+
+def _start_daemon(socket_path):
+    daemon = QueryDaemon(socket_path)
+    thread = threading.Thread(target=daemon.serve)
+    thread.start()
+    # wait until the daemon accepts connections
+    for _ in range(100):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(socket_path)
+            except OSError:
+                time.sleep(0.05)
+                continue
+        break
+    return thread
+
+
+def test_get_verb_error():
+    assert get_verb_error(['list', '--names-only']) is None
+    assert get_verb_error(['--log-level', 'debug', 'list']) is None
+    assert get_verb_error(
+        ['--log-base=/tmp/log', '--log-level', 'info', 'graph']) is None
+    for argv in (
+        [], ['build'], ['--log-level', 'debug'], ['--log-level', 'build'],
+    ):
+        assert get_verb_error(argv) == \
+            'Only the verbs graph, info, list can be queried'
+    assert get_verb_error(['--unknown', 'list']) == \
+        'Only the global options --log-base, --log-level can precede the ' \
+        'verb name'
+
+
+@requires_unix_sockets
+def test_daemon(socket_path, tmp_path):
+    def get_descriptors(*args, **kwargs):
+        colcon_logger.debug('Identified the packages')
+        return _get_descriptors()
+
+    with patch(
+        'colcon_package_information.verb.list.get_package_descriptors',
+        side_effect=get_descriptors
+    ):
+        thread = _start_daemon(socket_path)
+        try:
+            with pytest.raises(RuntimeError):
+                QueryDaemon(socket_path).serve()
+
+            for _ in range(2):
+                response = query(
+                    socket_path, ['list', '--names-only'],
+                    cwd=str(tmp_path))
+                assert response == {
+                    'stdout': 'pkg_a\npkg_b\n',
+                    'stderr': '',
+                    'returncode': None,
+                }
+
+            # global options precede the verb name
+            response = query(
+                socket_path, ['--log-level', 'debug', 'list', '--names-only'],
+                cwd=str(tmp_path))
+            assert response['stdout'] == 'pkg_a\npkg_b\n'
+            assert 'Identified the packages' in response['stderr']
+
+            response = query(socket_path, ['build'])
+            assert response['returncode'] == \
+                'Only the verbs graph, info, list can be queried'
+
+            response = query(socket_path, ['list', '--unknown-option'])
+            assert response['returncode'] == 2
+            assert 'unrecognized arguments' in response['stderr']
+
+            assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+
+            # invalid requests are answered with an error
+            for request in (
+                b'{"argv": ["list"', b'[]', b'{"cwd": "/"}',
+                b'{"argv": ["list"], "cwd": 1}', b'\xff\n',
+            ):
+                with socket.socket(
+                    socket.AF_UNIX, socket.SOCK_STREAM
+                ) as sock:
+                    sock.connect(socket_path)
+                    sock.sendall(request)
+                    sock.shutdown(socket.SHUT_WR)
+                    response = json.loads(sock.makefile('rb').read())
+                assert response['returncode'].startswith('Invalid request: ')
+
+            # a client disconnecting early doesn't stop the daemon
+            for request in (
+                b'{"argv": ["list"]',
+                json.dumps({
+                    'argv': ['list'], 'cwd': str(tmp_path),
+                }).encode() + b'\n',
+            ):
+                with socket.socket(
+                    socket.AF_UNIX, socket.SOCK_STREAM
+                ) as sock:
+                    sock.connect(socket_path)
+                    sock.sendall(request)
+            response = query(
+                socket_path, ['list', '--names-only'],
+                cwd=str(tmp_path))
+            assert response['stdout'] == 'pkg_a\npkg_b\n'
+        finally:
+            stop(socket_path)
+            thread.join()
+
+    assert not os.path.exists(socket_path)
+
+
+@requires_unix_sockets
+def test_main(socket_path, capsys):
+    with patch(
+        'colcon_core.command.main', return_value=0
+    ) as colcon_main:
+        assert main(['--socket', socket_path, 'query', 'list', '-n']) == 0
+    colcon_main.assert_called_once_with(argv=['list', '-n'])
+
+    with patch(
+        'colcon_core.command.main', return_value=0
+    ) as colcon_main:
+        assert main([
+            '--socket', socket_path, 'query', '--log-level', 'debug', 'list',
+        ]) == 0
+    colcon_main.assert_called_once_with(argv=['--log-level', 'debug', 'list'])
+
+    # the fallback only invokes the verbs which the daemon answers
+    with patch('colcon_core.command.main') as colcon_main:
+        assert main(['--socket', socket_path, 'query', 'build']) == \
+            'Only the verbs graph, info, list can be queried'
+    colcon_main.assert_not_called()
+
+    assert main(['--socket', socket_path, 'stop']) == \
+        'No daemon is listening on ' + socket_path
+
+    with patch(
+        'colcon_package_information.verb.list.get_package_descriptors',
+        side_effect=lambda *args, **kwargs: _get_descriptors()
+    ):
+        thread = _start_daemon(socket_path)
+        try:
+            assert main([
+                '--socket', socket_path, 'query', 'list',
+                '--paths-only']) is None
+            assert capsys.readouterr().out == \
+                '/ws/src/pkg_a\n/ws/src/pkg_b\n'
+        finally:
+            assert main(['--socket', socket_path, 'stop']) == 0
+            thread.join()
+
+
+def test_main_without_unix_sockets(socket_path, monkeypatch):
+    monkeypatch.delattr(socket, 'AF_UNIX', raising=False)
+
+    # queries are always invoked in the client process
+    with patch(
+        'colcon_core.command.main', return_value=0
+    ) as colcon_main:
+        assert main(['--socket', socket_path, 'query', 'list']) == 0
+    colcon_main.assert_called_once_with(argv=['list'])
+
+    assert main(['--socket', socket_path, 'serve']) == \
+        'The daemon requires Unix domain sockets which are not supported ' \
+        'on this platform'
+    assert main(['--socket', socket_path, 'stop']) == \
+        'No daemon is listening on ' + socket_path
@@ -0,0 +1,293 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+import os
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from colcon_core.dependency_descriptor import DependencyDescriptor
+from colcon_core.package_descriptor import PackageDescriptor
+from colcon_core.package_identification import identify
+from colcon_core.package_identification import IgnoreLocationException
+from colcon_package_information.descriptor_cache import _get_extensions_key
+from colcon_package_information.descriptor_cache import CACHE_FILENAME
+from colcon_package_information.descriptor_cache import DescriptorCache
+from colcon_package_information.descriptor_cache \
+    import get_location_fingerprint
+from colcon_package_information.descriptor_cache \
+    import get_package_descriptors
+from colcon_package_information.descriptor_cache \
+    import IdentificationRecorder
+from colcon_package_information.package_identification \
+    import IdentificationRecord
+from colcon_package_information.package_identification \
+    import wrap_identification_extensions
+import pytest
+
+
+class ManifestIdentification:
+
+    PACKAGE_IDENTIFICATION_NAME = 'manifest'
+
+    def __init__(self):
+        self.call_count = 0
+
+    def identify(self, desc):
+        self.call_count += 1
+        if (desc.path / 'IGNORE').exists():
+            raise IgnoreLocationException()
+        manifest = desc.path / 'manifest'
+        if not manifest.exists():
+            return
+        name, *deps = manifest.read_text().split()
+        desc.type = 'manifest'
+        desc.name = name
+        desc.dependencies['build'] = {
+            DependencyDescriptor(dep, metadata={'version_gte': '1.0'})
+            for dep in deps}
+        desc.metadata['version'] = '1.0'
+
+
+class TypeIdentification:
+
+    PACKAGE_IDENTIFICATION_NAME = 'type'
+
+    def identify(self, desc):
+        if (desc.path / 'manifest').exists():
+            desc.type = 'other'
+            desc.name = 'other'
+
+
+def _create_package(path, name, *deps):
+    path.mkdir(parents=True)
+    (path / 'manifest').write_text(' '.join((name, ) + deps))
+
+
+def test_fingerprint(tmp_path):
+    assert get_location_fingerprint(tmp_path / 'missing') is None
+
+    _create_package(tmp_path / 'pkg_a', 'pkg_a')
+    fingerprint = get_location_fingerprint(tmp_path / 'pkg_a')
+    assert fingerprint == get_location_fingerprint(tmp_path / 'pkg_a')
+
+    manifest = tmp_path / 'pkg_a' / 'manifest'
+    manifest.write_text('pkg_a pkg_b')
+    assert fingerprint != get_location_fingerprint(tmp_path / 'pkg_a')
+
+
+def test_caching_identification(tmp_path):
+    ws = tmp_path / 'ws'
+    _create_package(ws / 'pkg_a', 'pkg_a', 'pkg_b')
+    _create_package(ws / 'pkg_b', 'pkg_b')
+    (ws / 'ignored').mkdir()
+    (ws / 'ignored' / 'IGNORE').touch()
+    cache_path = tmp_path / 'build' / 'cache'
+
+    def identify_all(cache, extension):
+        recorder = IdentificationRecorder(cache=cache)
+        extensions = wrap_identification_extensions(
+            {100: {'manifest': extension}}, recorder.get_record)
+        with pytest.raises(IgnoreLocationException):
+            identify(extensions, ws / 'ignored')
+        assert identify(extensions, ws) is None
+        descs = [
+            identify(extensions, ws / name) for name in ('pkg_a', 'pkg_b')]
+        recorder.update_cache(descs)
+        return descs
+
+    extension = ManifestIdentification()
+    cache = DescriptorCache(cache_path, key='key')
+    cache.load()
+    descs = identify_all(cache, extension)
+    assert extension.call_count == 4
+    assert cache.misses == 4
+    # the build base isn't created
+    cache.save()
+    assert not (tmp_path / 'build').exists()
+    (tmp_path / 'build').mkdir()
+    cache.save()
+    assert cache_path.exists()
+
+    # all results are served from the cache
+    extension = ManifestIdentification()
+    cache = DescriptorCache(cache_path, key='key')
+    cache.load()
+    cached_descs = identify_all(cache, extension)
+    assert extension.call_count == 0
+    assert cache.hits == 4
+    for desc, cached_desc in zip(descs, cached_descs):
+        assert cached_desc == desc
+        assert cached_desc.dependencies == desc.dependencies
+        assert cached_desc.metadata == desc.metadata
+    dep = next(iter(cached_descs[0].dependencies['build']))
+    assert dep.metadata == {'version_gte': '1.0'}
+
+    # only the modified location is identified again
+    (ws / 'pkg_b' / 'manifest').write_text('pkg_b pkg_c')
+    cache = DescriptorCache(cache_path, key='key')
+    cache.load()
+    cached_descs = identify_all(cache, extension)
+    assert extension.call_count == 1
+    assert cached_descs[1].dependencies['build'] == {'pkg_c'}
+    cache.save()
+
+    # a different key discards the cache
+    extension = ManifestIdentification()
+    cache = DescriptorCache(cache_path, key='other')
+    cache.load()
+    identify_all(cache, extension)
+    assert extension.call_count == 4
+
+
+def test_recorded_constraints(tmp_path):
+    _create_package(tmp_path / 'pkg_a', 'pkg_a')
+    location = str(tmp_path / 'pkg_a')
+    cache_path = tmp_path / 'cache'
+    constraints = ([('pkg_b', [('version_gte', '1.0')])], {})
+
+    def get_recorder():
+        cache = DescriptorCache(cache_path, key='key')
+        cache.load()
+        recorder = IdentificationRecorder(cache=cache)
+        recorder.get_record(location)
+        return cache, recorder
+
+    cache, recorder = get_recorder()
+    assert recorder.get_constraints(location) is None
+    recorder.set_constraints(location, constraints)
+    recorder.update_cache([])
+    cache.save()
+
+    # the constraints of an unchanged location are provided
+    cache, recorder = get_recorder()
+    assert recorder.get_constraints(location) == constraints
+    recorder.set_constraints(location, constraints)
+    recorder.update_cache([])
+    assert not cache._modified
+
+    (tmp_path / 'pkg_a' / 'manifest').write_text('pkg_a pkg_b')
+    cache, recorder = get_recorder()
+    assert recorder.get_constraints(location) is None
+
+
+def test_cache_eviction(tmp_path):
+    _create_package(tmp_path / 'pkg_a', 'pkg_a')
+    cache_path = tmp_path / 'cache'
+    cache = DescriptorCache(cache_path)
+    location = str(tmp_path / 'pkg_a')
+    fingerprint = get_location_fingerprint(location)
+    cache.put(location, fingerprint, IdentificationRecord())
+    record = IdentificationRecord()
+    record.replayable = False
+    cache.put(str(tmp_path), get_location_fingerprint(tmp_path), record)
+    cache.save()
+
+    cache = DescriptorCache(cache_path)
+    cache.load()
+    assert cache.get(location, fingerprint).outcomes == []
+    assert cache.contains(location)
+    assert not cache.contains(str(tmp_path))
+    with pytest.raises(KeyError):
+        cache.get(location, None)
+
+    (tmp_path / 'pkg_a' / 'manifest').unlink()
+    os.rmdir(location)
+    cache.save()
+    cache = DescriptorCache(cache_path)
+    cache.load()
+    with pytest.raises(KeyError):
+        cache.get(location, fingerprint)
+
+
+def test_cache_invalid_file(tmp_path):
+    cache_path = tmp_path / 'cache'
+    cache_path.write_text('invalid')
+    cache = DescriptorCache(cache_path)
+    cache.load()
+    with pytest.raises(KeyError):
+        cache.get(str(tmp_path), get_location_fingerprint(tmp_path))
+
+
+def test_get_package_descriptors(tmp_path):
+    args = SimpleNamespace(
+        build_base=str(tmp_path / 'build'), cache=False,
+        refresh_cache=False)
+    extension = ManifestIdentification()
+
+    def get_descriptors(args, **kwargs):
+        extensions = kwargs.get(
+            'identification_extensions', {100: {'manifest': extension}})
+        return {identify(extensions, tmp_path / 'pkg_a')}
+
+    _create_package(tmp_path / 'pkg_a', 'pkg_a')
+    with patch(
+        'colcon_package_information.descriptor_cache.'
+        'get_package_identification_extensions',
+        return_value={100: {'manifest': extension}}
+    ), patch(
+        'colcon_package_information.descriptor_cache.'
+        'get_package_descriptors_uncached',
+        side_effect=get_descriptors
+    ):
+        # the cache is only used if requested
+        (tmp_path / 'build').mkdir()
+        get_package_descriptors(args)
+        get_package_descriptors(args)
+        assert extension.call_count == 2
+        assert not (tmp_path / 'build' / CACHE_FILENAME).exists()
+        (tmp_path / 'build').rmdir()
+        extension.call_count = 0
+
+        args.cache = True
+        descs = get_package_descriptors(args)
+        assert {d.name for d in descs} == {'pkg_a'}
+        assert extension.call_count == 1
+
+        assert not (tmp_path / 'build').exists()
+        (tmp_path / 'build').mkdir()
+        get_package_descriptors(args)
+        assert extension.call_count == 2
+
+        get_package_descriptors(args)
+        assert extension.call_count == 2
+
+        args.refresh_cache = True
+        get_package_descriptors(args)
+        assert extension.call_count == 3
+
+
+def test_extensions_key():
+    extensions = {100: {'manifest': ManifestIdentification()}}
+
+    def get_key(version):
+        with patch(
+            'colcon_core.extension_point.get_all_extension_points',
+            return_value={'colcon_core.package_identification': {
+                'manifest': ('module:Manifest', 'colcon-manifest', version)}}
+        ):
+            return _get_extensions_key(extensions)
+
+    # the key changes when an identification extension is upgraded
+    assert get_key('1.0') == get_key('1.0')
+    assert get_key('1.0') != get_key('1.1')
+
+
+def test_get_package_descriptors_unsupported(tmp_path):
+    args = SimpleNamespace(
+        build_base=str(tmp_path), cache=True, refresh_cache=False,
+        discovery_workers=2)
+    descs = {PackageDescriptor(tmp_path)}
+
+    # older versions of colcon-core don't accept the identification
+    # extensions, therefore the packages are identified without the cache
+    def get_descriptors(args, *, additional_argument_names=None):
+        return descs
+
+    with patch(
+        'colcon_package_information.descriptor_cache.'
+        'get_package_descriptors_uncached', get_descriptors
+    ), patch(
+        'colcon_package_information.descriptor_cache.logger'
+    ) as logger:
+        assert get_package_descriptors(args) == descs
+    logger.warning.assert_called_once()
@@ -0,0 +1,53 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+import ast
+import subprocess
+import sys
+
+# the modules which are costly to import and are only needed once a verb or
+# the package augmentation is being invoked, packaging.version isn't listed
+# since colcon-core already imports it
+DEFERRED_MODULES = (
+    'concurrent.futures.process',
+    'json',
+    'multiprocessing',
+    'packaging.specifiers',
+    'pickle',
+)
+
+# load the extensions and add their arguments like every invocation does
+SCRIPT = """
+import argparse
+import sys
+
+import colcon_core.package_augmentation
+import colcon_core.package_selection
+import colcon_core.verb
+
+baseline = set(sys.modules.keys())
+
+from colcon_package_information.package_augmentation.\\
+    check_dependency_constraint import \\
+    CheckDependencyConstraintPackageAugmentation
+from colcon_package_information.verb.graph import GraphVerb
+from colcon_package_information.verb.info import InfoVerb
+from colcon_package_information.verb.list import ListVerb
+
+CheckDependencyConstraintPackageAugmentation()
+for verb in (GraphVerb(), InfoVerb(), ListVerb()):
+    verb.add_arguments(parser=argparse.ArgumentParser())
+
+print(repr(sorted(set(sys.modules.keys()) - baseline)))
+"""
+
+
+def test_deferred_imports():
+    output = subprocess.check_output(
+        [sys.executable, '-c', SCRIPT], universal_newlines=True)
+    imported = ast.literal_eval(output.strip())
+    assert imported
+    for name in DEFERRED_MODULES:
+        assert name not in imported, \
+            "'{name}' is imported when loading the extensions" \
+            .format_map(locals())
@@ -0,0 +1,106 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+import io
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from colcon_core.package_descriptor import PackageDescriptor
+from colcon_package_information.output_format import get_package_data
+from colcon_package_information.output_format import write_json
+from colcon_package_information.verb.info import InfoVerb
+from colcon_package_information.verb.list import ListVerb
+from helpers import get_verb_args
+
+
+def _get_descriptors():
+    desc_a = PackageDescriptor('/ws/src/pkg_a')
+    desc_a.type = 'python'
+    desc_a.name = 'pkg_a'
+    desc_a.metadata['description'] = 'first line\nsecond line'
+    desc_a.metadata['maintainers'] = {'b', 'a'}
+    desc_b = PackageDescriptor('/ws/src/pkg_b')
+    desc_b.type = 'other'
+    desc_b.name = 'pkg_b'
+    desc_b.dependencies['run'] = {'pkg_a', 'other'}
+    desc_b.dependencies['build'] = {'pkg_a'}
+    desc_b.hooks.append('share/pkg_b/hook/path.sh')
+    return {desc_a, desc_b}
+
+
+def test_write_json():
+    for output_format, expected in (('json', '[]\n'), ('jsonl', '')):
+        file = io.StringIO()
+        write_json([], output_format, file=file)
+        assert file.getvalue() == expected
+
+    objects = [{'name': 'pkg_%d' % i} for i in range(300)]
+    file = io.StringIO()
+    write_json(objects, 'json', file=file)
+    assert json.loads(file.getvalue()) == objects
+
+    file = io.StringIO()
+    write_json(iter(objects), 'jsonl', file=file)
+    assert [json.loads(line) for line in file.getvalue().splitlines()] == \
+        objects
+
+
+def test_get_package_data():
+    desc_a, desc_b = sorted(_get_descriptors(), key=lambda d: d.name)
+    data = get_package_data(desc_a)
+    assert data == {
+        'path': str(desc_a.path),
+        'type': 'python',
+        'name': 'pkg_a',
+        'dependencies': {},
+        'hooks': [],
+        'metadata': {
+            'description': 'first line\nsecond line',
+            'maintainers': {'a', 'b'},
+        },
+    }
+    file = io.StringIO()
+    write_json([data, get_package_data(desc_b)], 'jsonl', file=file)
+    lines = file.getvalue().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])['metadata']['maintainers'] == ['a', 'b']
+    assert json.loads(lines[1])['dependencies'] == {
+        'build': ['pkg_a'], 'run': ['other', 'pkg_a']}
+
+
+def test_verbs(capsys):
+    with patch(
+        'colcon_package_information.verb.info.get_package_descriptors',
+        return_value=_get_descriptors()
+    ), patch(
+        'colcon_package_information.verb.info.select_package_decorators'
+    ):
+        rc = InfoVerb().main(context=SimpleNamespace(args=SimpleNamespace(
+            package_names=[], dependents=False, format='json')))
+    assert not rc
+    data = json.loads(capsys.readouterr().out)
+    assert [d['name'] for d in data] == ['pkg_a', 'pkg_b']
+    assert data[1]['hooks'] == ['share/pkg_b/hook/path.sh']
+
+    args = get_verb_args(
+        ListVerb(), topological_order=True, format='jsonl')
+    with patch(
+        'colcon_package_information.verb.list.get_package_descriptors',
+        return_value=_get_descriptors()
+    ), patch(
+        'colcon_package_information.verb.list.select_package_decorators'
+    ):
+        rc = ListVerb().main(context=SimpleNamespace(args=args))
+        assert not rc
+        lines = capsys.readouterr().out.splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {'name': 'pkg_a', 'path': '/ws/src/pkg_a', 'type': 'python'},
+            {'name': 'pkg_b', 'path': '/ws/src/pkg_b', 'type': 'other'},
+        ]
+
+        args.names_only = True
+        ListVerb().main(context=SimpleNamespace(args=args))
+        lines = capsys.readouterr().out.splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {'name': 'pkg_a'}, {'name': 'pkg_b'}]
@@ -0,0 +1,121 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+from colcon_core.dependency_descriptor import DependencyDescriptor
+from colcon_core.package_descriptor import PackageDescriptor
+from colcon_core.package_identification import identify
+from colcon_core.package_identification import IgnoreLocationException
+from colcon_package_information.package_identification \
+    import dump_package_data
+from colcon_package_information.package_identification \
+    import IdentificationRecord
+from colcon_package_information.package_identification \
+    import load_package_data
+from colcon_package_information.package_identification \
+    import PACKAGE_DATA_ATTRIBUTES
+from colcon_package_information.package_identification \
+    import wrap_identification_extensions
+import pytest
+
+
+def _create_descriptor():
+    desc = PackageDescriptor('/ws/src/pkg_a')
+    desc.type = 'python'
+    desc.name = 'pkg_a'
+    desc.dependencies['build'] = {
+        DependencyDescriptor('pkg_b', metadata={'version_gte': '1.0'})}
+    desc.hooks.append('share/pkg_a/hook/path.sh')
+    desc.metadata['version'] = '1.0'
+    return desc
+
+
+def test_package_data():
+    desc = _create_descriptor()
+    assert set(PACKAGE_DATA_ATTRIBUTES) == \
+        set(PackageDescriptor.__slots__) - {'path'}
+
+    restored = PackageDescriptor('/ws/src/pkg_a')
+    load_package_data(restored, dump_package_data(desc))
+    for name in PackageDescriptor.__slots__:
+        assert getattr(restored, name) == getattr(desc, name)
+    assert restored.dependencies['build'] == desc.dependencies['build']
+    assert list(restored.dependencies['build'])[0].metadata == {
+        'version_gte': '1.0'}
+
+    # callables in the metadata can't be pickled
+    desc.metadata['get_options'] = lambda: {}
+    with pytest.raises(Exception):
+        dump_package_data(desc)
+
+
+class NameIdentification:
+
+    def __init__(self, package_type):
+        self.package_type = package_type
+        self.call_count = 0
+
+    def identify(self, desc):
+        self.call_count += 1
+        if (desc.path / 'IGNORE').exists():
+            raise IgnoreLocationException()
+        path = desc.path / self.package_type
+        if path.exists():
+            desc.type = self.package_type
+            desc.name = path.read_text()
+            desc.dependencies['build'].add('pkg_b')
+
+
+def test_recording_identification(tmp_path):
+    (tmp_path / 'pkg_a').mkdir()
+    (tmp_path / 'pkg_a' / 'manifest').write_text('pkg_a')
+    (tmp_path / 'ignored').mkdir()
+    (tmp_path / 'ignored' / 'IGNORE').touch()
+    (tmp_path / 'ambiguous').mkdir()
+    (tmp_path / 'ambiguous' / 'manifest').write_text('pkg_c')
+    (tmp_path / 'ambiguous' / 'other').write_text('pkg_d')
+    extension = NameIdentification('manifest')
+    other_extension = NameIdentification('other')
+    records = {}
+
+    def identify_all():
+        extensions = wrap_identification_extensions(
+            {100: {'manifest': extension, 'other': other_extension}},
+            lambda location: records.setdefault(
+                location, IdentificationRecord()))
+        assert identify(extensions, tmp_path) is None
+        for name in ('ignored', 'ambiguous'):
+            with pytest.raises(IgnoreLocationException):
+                identify(extensions, tmp_path / name)
+        return identify(extensions, tmp_path / 'pkg_a')
+
+    desc = identify_all()
+    assert (desc.type, desc.name) == ('manifest', 'pkg_a')
+    assert desc.dependencies['build'] == {'pkg_b'}
+    assert extension.call_count == 4
+
+    # the recorded outcomes are replayed
+    replayed_desc = identify_all()
+    assert extension.call_count == 4
+    assert other_extension.call_count == 3
+    for name in PackageDescriptor.__slots__:
+        assert getattr(replayed_desc, name) == getattr(desc, name)
+
+    # outcomes which can't be pickled aren't replayed
+    records.clear()
+    extension.identify = lambda desc: desc.metadata.update(
+        get_options=lambda: {})
+    extensions = wrap_identification_extensions(
+        {100: {'manifest': extension, 'other': other_extension}},
+        lambda location: records.setdefault(
+            location, IdentificationRecord()))
+    identify(extensions, tmp_path)
+    assert not records[str(tmp_path)].replayable
+    identify(extensions, tmp_path)
+    assert other_extension.call_count == 5
+
+    # without a record the extensions are invoked
+    extensions = wrap_identification_extensions(
+        {100: {'other': other_extension}}, lambda location: None)
+    identify(extensions, tmp_path)
+    identify(extensions, tmp_path)
+    assert other_extension.call_count == 7
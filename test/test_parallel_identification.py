@@ -0,0 +1,157 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+import argparse
+from concurrent.futures import wait
+import os
+
+from colcon_core.package_identification import identify
+from colcon_core.package_identification import IgnoreLocationException
+from colcon_package_information.descriptor_cache \
+    import IdentificationRecorder
+from colcon_package_information.package_identification \
+    import wrap_identification_extensions
+from colcon_package_information.parallel_identification \
+    import add_discovery_workers_argument
+from colcon_package_information.parallel_identification \
+    import ParallelPackageIdentification
+import pytest
+
+
+class ManifestIdentification:
+
+    def __init__(self, log_path):
+        self.log_path = log_path
+
+    def identify(self, desc):
+        # log the identified locations across processes
+        with open(self.log_path, 'a') as h:
+            h.write(os.path.abspath(str(desc.path)) + '\n')
+        if (desc.path / 'IGNORE').exists():
+            raise IgnoreLocationException()
+        manifest = desc.path / 'manifest'
+        if manifest.exists():
+            desc.type = 'manifest'
+            desc.name, *deps = manifest.read_text().split()
+            desc.dependencies['build'] = set(deps)
+
+
+def _crawl(extensions, base_path):
+    # same logic as the recursive crawl discovery extension
+    descs = []
+    for dirpath, dirnames, _ in os.walk(base_path):
+        try:
+            result = identify(extensions, dirpath)
+        except IgnoreLocationException:
+            del dirnames[:]
+            continue
+        if result:
+            descs.append(result)
+            del dirnames[:]
+            continue
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+    return descs
+
+
+def _wrap(extensions, parallel):
+    recorder = IdentificationRecorder(parallel=parallel)
+    return wrap_identification_extensions(extensions, recorder.get_record)
+
+
+def test_parallel_identification(tmp_path):
+    for path, content in (
+        ('src/pkg_a/manifest', 'pkg_a pkg_b'),
+        ('src/pkg_a/sub/manifest', 'nested'),
+        ('src/group/pkg_b/manifest', 'pkg_b'),
+        ('src/group/pkg_c/manifest', 'pkg_c pkg_a pkg_b'),
+        ('src/ignored/IGNORE', ''),
+        ('src/ignored/pkg_d/manifest', 'pkg_d'),
+        ('src/.hidden/pkg_e/manifest', 'pkg_e'),
+    ):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+
+    src = str(tmp_path / 'src')
+    log_path = tmp_path / 'log'
+    extension = ManifestIdentification(str(log_path))
+    expected = _crawl({100: {'manifest': extension}}, src)
+    expected_paths = sorted(log_path.read_text().splitlines())
+
+    log_path.unlink()
+    with ParallelPackageIdentification(
+        {100: {'manifest': extension}}, 4
+    ) as parallel:
+        descs = _crawl(_wrap({100: {'manifest': extension}}, parallel), src)
+    assert [
+        (str(d.path), d.type, d.name, d.dependencies) for d in descs
+    ] == [
+        (str(d.path), d.type, d.name, d.dependencies) for d in expected
+    ]
+    assert [d.name for d in descs] == ['pkg_b', 'pkg_c', 'pkg_a']
+    # every directory is only identified once
+    assert sorted(log_path.read_text().splitlines()) == expected_paths
+
+    # skipped locations are only identified when being crawled
+    log_path.unlink()
+    with ParallelPackageIdentification(
+        {100: {'manifest': extension}}, 2,
+        skip_location=lambda path: os.path.basename(path) == 'group'
+    ) as parallel:
+        descs = _crawl(_wrap({100: {'manifest': extension}}, parallel), src)
+    assert [d.name for d in descs] == ['pkg_b', 'pkg_c', 'pkg_a']
+    assert sorted(log_path.read_text().splitlines()) == expected_paths
+
+
+def test_speculation_depth(tmp_path):
+    for path, content in (
+        ('src/a/b/c/d/pkg_a/manifest', 'pkg_a'),
+        ('src/a/b/pkg_b/manifest', 'pkg_b'),
+        ('src/e/f/g/h/i/j/pkg_c/manifest', 'pkg_c'),
+    ):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+
+    src = tmp_path / 'src'
+    log_path = tmp_path / 'log'
+    extension = ManifestIdentification(str(log_path))
+
+    # a non-recursive discovery only identifies the passed path
+    with ParallelPackageIdentification(
+        {100: {'manifest': extension}}, 2, speculation_depth=2
+    ) as parallel:
+        assert identify(
+            _wrap({100: {'manifest': extension}}, parallel), src) is None
+        # let all speculative identifications complete
+        while parallel._unexpanded_futures:
+            futures = list(parallel._unexpanded_futures.keys())
+            wait(futures)
+            parallel._expand(futures)
+    # the speculation stops two levels below the requested location
+    speculated_paths = set(log_path.read_text().splitlines()) - {str(src)}
+    assert speculated_paths == {
+        str(src / 'a'), str(src / 'e'),
+        str(src / 'a' / 'b'), str(src / 'e' / 'f')}
+
+    # a recursive discovery continues the speculation
+    expected = _crawl({100: {'manifest': extension}}, str(src))
+    log_path.unlink()
+    with ParallelPackageIdentification(
+        {100: {'manifest': extension}}, 2, speculation_depth=1
+    ) as parallel:
+        descs = _crawl(
+            _wrap({100: {'manifest': extension}}, parallel), str(src))
+    assert [d.name for d in descs] == [d.name for d in expected]
+    # every directory is only identified once
+    paths = log_path.read_text().splitlines()
+    assert len(paths) == len(set(paths))
+
+
+def test_discovery_workers_argument():
+    parser = argparse.ArgumentParser()
+    add_discovery_workers_argument(parser)
+    assert parser.parse_args([]).discovery_workers is None
+    assert parser.parse_args(
+        ['--discovery-workers', '8']).discovery_workers == 8
+    for value in ('0', 'many'):
+        with pytest.raises(SystemExit):
+            parser.parse_args(['--discovery-workers', value])
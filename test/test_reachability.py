@@ -0,0 +1,60 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+from benchmark import create_descriptors
+from colcon_core.topological_order import topological_order_packages
+from colcon_package_information.reachability import count_bits
+from colcon_package_information.reachability import iterate_bits
+from colcon_package_information.reachability import ReachabilityIndex
+
+
+def test_iterate_bits():
+    assert list(iterate_bits(0)) == []
+    assert list(iterate_bits(0b101001)) == [0, 3, 5]
+    assert count_bits(0b101001) == 3
+    assert count_bits(1 << 1000) == 1
+
+
+def test_reachability_matches_recursive_dependencies():
+    for duplicates in (0, 5):
+        descs = create_descriptors(
+            60, seed=duplicates, duplicates=duplicates)
+        # dependencies without a package are ignored
+        for desc in sorted(descs, key=lambda d: d.path)[::7]:
+            desc.dependencies['build'].add('unknown')
+        decorators = topological_order_packages(
+            descs, recursive_categories=('run', ))
+        index = ReachabilityIndex(decorators)
+
+        for deco in decorators:
+            position = index.get_position(deco)
+            expected_direct = {
+                d for d in deco.descriptor.get_dependencies()
+                if index.get_name_mask(d)}
+            expected_recursive = set(deco.recursive_dependencies)
+
+            direct = {
+                decorators[i].descriptor.name
+                for i in iterate_bits(index.direct_dependencies[position])}
+            recursive = {
+                decorators[i].descriptor.name
+                for i in iterate_bits(index.recursive_dependencies[position])}
+            assert direct == expected_direct
+            assert recursive == expected_recursive
+
+
+def test_dependents():
+    descs = create_descriptors(30, seed=42)
+    decorators = topological_order_packages(
+        descs, recursive_categories=('run', ))
+    index = ReachabilityIndex(decorators)
+
+    direct_dependents, recursive_dependents = index.get_dependents()
+    for i in range(len(decorators)):
+        for j in range(len(decorators)):
+            assert bool(index.direct_dependencies[i] & (1 << j)) == \
+                bool(direct_dependents[j] & (1 << i))
+            assert bool(index.recursive_dependencies[i] & (1 << j)) == \
+                bool(recursive_dependents[j] & (1 << i))
+    # the transposed result is cached
+    assert index.get_dependents() is index.get_dependents()
@@ -0,0 +1,135 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from benchmark import create_descriptors
+from colcon_core.topological_order import topological_order_packages
+from colcon_package_information.reverse_dependencies \
+    import ReverseDependencyIndex
+from colcon_package_information.verb.info import InfoVerb
+from colcon_package_information.verb.list import ListVerb
+from helpers import create_descriptor
+from helpers import get_verb_args
+
+
+def test_index_matches_dependencies():
+    for duplicates in (0, 5):
+        descs = create_descriptors(25, seed=duplicates, duplicates=duplicates)
+        decorators = topological_order_packages(
+            descs, recursive_categories=('run', ))
+        index = ReverseDependencyIndex(decorators)
+        assert index.categories == ['build', 'run', 'test']
+
+        for deco in decorators:
+            for categories in (None, ['build'], ['run', 'test']):
+                direct = index.get_dependents(
+                    [deco], categories=categories)
+                recursive = index.get_dependents(
+                    [deco], categories=categories, recursive=True)
+                expected_direct = []
+                expected_recursive = []
+                for d in decorators:
+                    if d.descriptor.name == deco.descriptor.name:
+                        continue
+                    if deco.descriptor.name in d.descriptor.get_dependencies(
+                        categories=categories
+                    ):
+                        expected_direct.append(d)
+                    recursive_dependencies = \
+                        d.descriptor.get_recursive_dependencies(
+                            descs, direct_categories=categories,
+                            recursive_categories=('run', ))
+                    if deco.descriptor.name in recursive_dependencies:
+                        expected_recursive.append(d)
+                assert direct == expected_direct
+                assert recursive == expected_recursive
+
+
+def test_index_multiple_packages():
+    descs = create_descriptors(30, seed=7)
+    decorators = topological_order_packages(
+        descs, recursive_categories=('run', ))
+    index = ReverseDependencyIndex(decorators)
+    queried = decorators[3:6]
+    expected = set()
+    for deco in queried:
+        expected.update(index.get_dependents([deco], recursive=True))
+    dependents = index.get_dependents(queried, recursive=True)
+    # the dependents are ordered topologically
+    assert dependents == [d for d in decorators if d in expected]
+    assert index.get_dependents(queried, categories=['unknown']) == []
+
+
+def _get_descriptors():
+    return {
+        create_descriptor('pkg_a', '/ws/src/pkg_a'),
+        create_descriptor('pkg_b', '/ws/src/pkg_b', build={'pkg_a'}),
+        create_descriptor(
+            'pkg_c', '/ws/src/pkg_c', run={'pkg_b'}, test={'pkg_a'}),
+        create_descriptor('pkg_d', '/ws/src/pkg_d', test={'pkg_c'}),
+    }
+
+
+def test_info_dependents(capsys):
+    args = SimpleNamespace(
+        package_names=['pkg_a'], dependents=True, format='text')
+    with patch(
+        'colcon_package_information.verb.info.get_package_descriptors',
+        return_value=_get_descriptors()
+    ), patch(
+        'colcon_package_information.verb.info.select_package_decorators'
+    ):
+        rc = InfoVerb().main(context=SimpleNamespace(args=args))
+        assert not rc
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[3:] == [
+            '  dependents:',
+            '    build: pkg_b',
+            '    test: pkg_c',
+            '  recursive dependents:',
+            '    build: pkg_b',
+            '    run: pkg_c',
+            '    test: pkg_c pkg_d',
+        ]
+
+        args.format = 'json'
+        rc = InfoVerb().main(context=SimpleNamespace(args=args))
+        assert not rc
+        data = json.loads(capsys.readouterr().out)
+        assert data[0]['dependents'] == {
+            'build': ['pkg_b'], 'test': ['pkg_c']}
+        assert data[0]['recursive_dependents']['run'] == ['pkg_c']
+
+
+def test_list_reverse_deps_of(capsys):
+    def list_packages(**kwargs):
+        kwargs.setdefault('reverse_deps_of', ['pkg_b', 'unknown'])
+        args = get_verb_args(ListVerb(), names_only=True, **kwargs)
+        rc = ListVerb().main(context=SimpleNamespace(args=args))
+        assert not rc
+        return capsys.readouterr()
+
+    with patch(
+        'colcon_package_information.verb.list.get_package_descriptors',
+        return_value=_get_descriptors()
+    ), patch(
+        'colcon_package_information.verb.list.select_package_decorators'
+    ):
+        captured = list_packages()
+        assert captured.out.splitlines() == ['pkg_c', 'pkg_d']
+        assert captured.err == "Package 'unknown' not found\n"
+
+        captured = list_packages(reverse_deps_direct=True)
+        assert captured.out.splitlines() == ['pkg_c']
+
+        captured = list_packages(
+            reverse_deps_of=['pkg_a'], reverse_deps_categories=['test'])
+        assert captured.out.splitlines() == ['pkg_c', 'pkg_d']
+
+        captured = list_packages(
+            reverse_deps_of=['pkg_a'], reverse_deps_categories=['test'],
+            reverse_deps_direct=True)
+        assert captured.out.splitlines() == ['pkg_c']
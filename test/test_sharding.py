@@ -0,0 +1,110 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+import json
+import random
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from colcon_core.topological_order import topological_order_packages
+from colcon_package_information.sharding import get_shards
+from colcon_package_information.verb.list import ListVerb
+from helpers import create_descriptor
+from helpers import get_verb_args
+
+
+def _get_descriptors():
+    return {
+        create_descriptor('base', '/ws/src/base'),
+        create_descriptor('pkg_a', '/ws/src/pkg_a', build={'base'}),
+        create_descriptor('pkg_b', '/ws/src/pkg_b', build={'pkg_a'}),
+        create_descriptor('pkg_c', '/ws/src/pkg_c', run={'pkg_b'}),
+        create_descriptor('pkg_x', '/ws/src/pkg_x', build={'base'}),
+        create_descriptor('pkg_y', '/ws/src/pkg_y', build={'pkg_x'}),
+        create_descriptor('pkg_z', '/ws/src/pkg_z', test={'pkg_y'}),
+    }
+
+
+def _get_weights():
+    weights = {desc.name: 1 for desc in _get_descriptors()}
+    weights['pkg_z'] = 9
+    return weights
+
+
+def test_shards():
+    decorators = topological_order_packages(
+        _get_descriptors(), recursive_categories=('run', ))
+    shards = get_shards(decorators, 2)
+    # the independent stacks are kept in separate shards
+    assert [[d.descriptor.name for d in shard] for shard in shards] == [
+        ['base', 'pkg_x', 'pkg_y', 'pkg_z'],
+        ['pkg_a', 'pkg_b', 'pkg_c'],
+    ]
+
+    # a heavy package is balanced by all other packages
+    shards = get_shards(decorators, 2, weights=_get_weights())
+    assert [[d.descriptor.name for d in shard] for shard in shards] == [
+        ['pkg_z'],
+        ['base', 'pkg_a', 'pkg_x', 'pkg_b', 'pkg_y', 'pkg_c'],
+    ]
+
+    # only selected packages are assigned
+    for deco in decorators:
+        deco.selected = deco.descriptor.name != 'base'
+    shards = get_shards(decorators, 3)
+    assert sum(len(shard) for shard in shards) == 6
+    assert all(shard for shard in shards)
+
+
+def test_shards_deterministic():
+    rng = random.Random(5)
+    descs = set()
+    for i in range(60):
+        descs.add(create_descriptor(
+            'pkg_%d' % i, '/tmp/pkg_%d' % i,
+            build={'pkg_%d' % j for j in range(i) if rng.random() < 0.05}))
+    shards = None
+    for _ in range(2):
+        decorators = topological_order_packages(
+            set(descs), recursive_categories=('run', ))
+        names = [
+            [d.descriptor.name for d in shard]
+            for shard in get_shards(decorators, 4)]
+        assert shards is None or names == shards
+        shards = names
+    # every package is part of exactly one shard of balanced size
+    assert sorted(n for shard in shards for n in shard) == \
+        sorted(d.name for d in descs)
+    assert [len(shard) for shard in shards] == [15, 15, 15, 15]
+
+
+def test_list_shard(capsys, tmp_path):
+    def get_args(**kwargs):
+        kwargs.setdefault('shard', (2, 2))
+        return get_verb_args(
+            ListVerb(), topological_order=True, names_only=True, **kwargs)
+
+    def list_packages(**kwargs):
+        rc = ListVerb().main(context=SimpleNamespace(args=get_args(**kwargs)))
+        assert not rc
+        return capsys.readouterr().out.splitlines()
+
+    with patch(
+        'colcon_package_information.verb.list.get_package_descriptors',
+        return_value=_get_descriptors()
+    ), patch(
+        'colcon_package_information.verb.list.select_package_decorators'
+    ):
+        assert list_packages() == ['pkg_a', 'pkg_b', 'pkg_c']
+
+        path = tmp_path / 'weights.json'
+        path.write_text(json.dumps(_get_weights()))
+        assert list_packages(shard=(1, 2), shard_weights=str(path)) == [
+            'pkg_z']
+
+    path.write_text('invalid')
+    rc = ListVerb().main(context=SimpleNamespace(
+        args=get_args(shard_weights=str(path))))
+    assert rc.startswith(
+        "Failed to read the shard weights from '{path}': ".format_map(
+            locals()))
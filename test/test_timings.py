@@ -0,0 +1,46 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+import io
+import pstats
+from types import SimpleNamespace
+
+from colcon_package_information.timings import measure
+from colcon_package_information.timings import TIMINGS_ENVIRONMENT_VARIABLE
+
+
+def test_disabled(capsys, monkeypatch):
+    monkeypatch.delenv(TIMINGS_ENVIRONMENT_VARIABLE.name, raising=False)
+    with measure(SimpleNamespace()) as timings:
+        with timings.phase('phase'):
+            timings.count('counter')
+        timings.print_lines(['line'])
+    captured = capsys.readouterr()
+    assert captured.out == 'line\n'
+    assert captured.err == ''
+
+
+def test_timings(capsys, monkeypatch):
+    monkeypatch.setenv(TIMINGS_ENVIRONMENT_VARIABLE.name, '1')
+    report = io.StringIO()
+    with measure(SimpleNamespace(), file=report) as timings:
+        with timings.phase('outer'):
+            with timings.phase('inner'):
+                timings.count('counter', 2)
+            timings.count('counter')
+            timings.print_lines(['a', 'b'])
+    assert capsys.readouterr().out == 'a\nb\n'
+    lines = report.getvalue().splitlines()
+    assert lines[0] == 'Timings:'
+    assert [line.split()[0] for line in lines[1:4]] == [
+        'outer', 'inner', 'printing']
+    assert lines[2].startswith('    inner')
+    assert lines[4:] == ['Counters:', '  counter: 3', '  lines: 2']
+
+
+def test_profile(tmp_path):
+    profile_path = tmp_path / 'profile'
+    with measure(SimpleNamespace(timings=False, profile=str(profile_path))):
+        sorted(range(10))
+    stats = pstats.Stats(str(profile_path))
+    assert stats.total_calls
@@ -0,0 +1,86 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+from unittest.mock import patch
+
+from colcon_core.dependency_descriptor import DependencyDescriptor
+from colcon_core.package_descriptor import PackageDescriptor
+from colcon_core.topological_order import topological_order_packages \
+    as topological_order_packages_uncached
+from colcon_package_information.topological_order import enable_memoization
+from colcon_package_information.topological_order \
+    import topological_order_packages
+
+
+def _get_descriptors(**dependencies):
+    descs = set()
+    for name in ('pkg_a', 'pkg_b', 'pkg_c'):
+        desc = PackageDescriptor('/ws/src/' + name)
+        desc.type = 'test'
+        desc.name = name
+        desc.dependencies['run'] = dependencies.get(name, set())
+        descs.add(desc)
+    return descs
+
+
+def _get_order(decorators):
+    return [
+        (d.descriptor.name, [str(r) for r in d.recursive_dependencies])
+        for d in decorators]
+
+
+def test_memoization():
+    with patch(
+        'colcon_package_information.topological_order._memoized_results',
+        None
+    ), patch(
+        'colcon_package_information.topological_order.'
+        'topological_order_packages_uncached',
+        wraps=topological_order_packages_uncached
+    ) as uncached:
+        uncached_decorators = topological_order_packages(
+            _get_descriptors(pkg_a={'pkg_c'}, pkg_c={'pkg_b'}),
+            recursive_categories=('run', ))
+        expected = _get_order(uncached_decorators)
+        expected_type = type(uncached_decorators[0].recursive_dependencies)
+        assert uncached.call_count == 1
+
+        enable_memoization()
+        for _ in range(2):
+            descs = _get_descriptors(pkg_a={'pkg_c'}, pkg_c={'pkg_b'})
+            decorators = topological_order_packages(
+                descs, recursive_categories=('run', ))
+            assert _get_order(decorators) == expected
+            assert {d.descriptor for d in decorators} == descs
+            assert all(d.selected for d in decorators)
+            # the same type and order as the result of the upstream function
+            assert all(
+                type(d.recursive_dependencies) is expected_type
+                for d in decorators)
+            decorators[0].selected = False
+            decorators[-1].recursive_dependencies.pop().metadata['key'] = 1
+            decorators[0].recursive_dependencies.clear()
+        assert uncached.call_count == 2
+        # the modifications don't affect the memoized result
+        decorators = topological_order_packages(
+            _get_descriptors(pkg_a={'pkg_c'}, pkg_c={'pkg_b'}),
+            recursive_categories=('run', ))
+        assert all(
+            'key' not in dep.metadata
+            for d in decorators for dep in d.recursive_dependencies)
+
+        # different dependencies or categories aren't memoized
+        topological_order_packages(
+            _get_descriptors(pkg_a={'pkg_b'}), recursive_categories=('run', ))
+        assert uncached.call_count == 3
+        topological_order_packages(
+            _get_descriptors(pkg_a={'pkg_c'}, pkg_c={'pkg_b'}))
+        assert uncached.call_count == 4
+
+        # different metadata of the dependencies isn't memoized either
+        topological_order_packages(
+            _get_descriptors(
+                pkg_a={DependencyDescriptor('pkg_c', metadata={'a': 1})},
+                pkg_c={'pkg_b'}),
+            recursive_categories=('run', ))
+        assert uncached.call_count == 5
@@ -0,0 +1,426 @@
+# Copyright 2026 Open Source Robotics Foundation, Inc.
+# Licensed under the Apache License, Version 2.0
+
+import argparse
+import io
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from colcon_package_information.verb.graph import GraphVerb
+from helpers import create_descriptor
+import pytest
+
+
+def _get_descriptors():
+    return {
+        create_descriptor('pkg_a', '/ws/src/a/pkg_a'),
+        create_descriptor(
+            'pkg_b', '/ws/src/a/pkg_b', build={'pkg_a'}, run={'pkg_a'}),
+        create_descriptor('pkg_c', '/ws/src/c/pkg_c', run={'pkg_b'}),
+        create_descriptor(
+            'pkg_d', '/ws/src/pkg_d', build={'pkg_b'}, test={'unknown'}),
+    }
+
+
+def _run_graph_verb(capsys, *, descriptors=None, selected=None, **kwargs):
+    args = {
+        'dot': False,
+        'density': False,
+        'sparse': False,
+        'legend': False,
+        'dot_cluster': False,
+        'dot_cluster_depth': None,
+        'collapse_by': None,
+        'dot_include_skipped': False,
+        'transitive_reduction': False,
+        'critical_path': False,
+        'parallelism': False,
+        'durations': None,
+    }
+    args.update(kwargs)
+
+    def select_package_decorators(args, decorators):
+        if selected is not None:
+            for decorator in decorators:
+                decorator.selected = decorator.descriptor.name in selected
+
+    with patch(
+        'colcon_package_information.verb.graph.get_package_descriptors',
+        return_value=descriptors or _get_descriptors()
+    ), patch(
+        'colcon_package_information.verb.graph.select_package_decorators',
+        side_effect=select_package_decorators
+    ):
+        rc = GraphVerb().main(context=SimpleNamespace(
+            args=SimpleNamespace(**args)))
+    assert not rc
+    return capsys.readouterr().out.splitlines()
+
+
+def test_ascii(capsys):
+    lines = _run_graph_verb(capsys)
+    assert lines == [
+        'pkg_a  +*..',
+        'pkg_b   +**',
+        'pkg_c    + ',
+        'pkg_d     +',
+    ]
+
+
+def test_ascii_selected(capsys):
+    lines = _run_graph_verb(capsys, selected={'pkg_a', 'pkg_c', 'pkg_d'})
+    assert lines == [
+        'pkg_a  +..',
+        'pkg_c   + ',
+        'pkg_d    +',
+    ]
+
+
+def test_density(capsys):
+    lines = _run_graph_verb(capsys, density=True)
+    # 5 of 12 cells are marked
+    assert lines[0] == 'dependency density 83.33 %'
+    assert lines[1] == ''
+    assert len(lines) == 6
+
+    lines = _run_graph_verb(capsys, density=True, selected={'pkg_a'})
+    assert lines[0] == 'dependency density 0.00 %'
+
+
+def test_sparse(capsys):
+    lines = _run_graph_verb(capsys, sparse=True)
+    assert lines == [
+        'pkg_a  *pkg_b .pkg_c .pkg_d',
+        'pkg_b  *pkg_c *pkg_d',
+        'pkg_c',
+        'pkg_d',
+    ]
+
+    lines = _run_graph_verb(capsys, sparse=True, legend=True)
+    assert len(lines) == 7
+    assert lines[3:] == [
+        'pkg_a  *pkg_b .pkg_c .pkg_d',
+        'pkg_b  *pkg_c *pkg_d',
+        'pkg_c',
+        'pkg_d',
+    ]
+
+
+def test_dot(capsys):
+    lines = _run_graph_verb(capsys, dot=True, selected={'pkg_a', 'pkg_c'})
+    assert lines == [
+        'digraph graphname {',
+        '  "pkg_c";',
+        '  "pkg_a";',
+        '  "pkg_c" -> "pkg_a" [color="#ff0000", style="dashed"];',
+        '}',
+    ]
+
+    lines = _run_graph_verb(capsys, dot=True, dot_include_skipped=True)
+    assert '  "pkg_b" -> "pkg_a" [color="#0000ff:#ff0000"];' in lines
+    assert '  "pkg_d" -> "pkg_b" [color="#0000ff"];' in lines
+
+
+def test_dot_duplicate_names(capsys):
+    descriptors = _get_descriptors() | {
+        create_descriptor('pkg_a', '/ws/src/other/pkg_a'),
+    }
+    lines = _run_graph_verb(
+        capsys, descriptors=descriptors, dot=True, dot_include_skipped=True,
+        selected={'pkg_a', 'pkg_c', 'pkg_d'})
+    ids = {
+        str(desc.path): '{desc.name}_{id_}'.format(desc=desc, id_=id(desc))
+        for desc in descriptors}
+    pkg_a_ids = [ids['/ws/src/a/pkg_a'], ids['/ws/src/other/pkg_a']]
+    for pkg_a_id in pkg_a_ids:
+        assert '  "{pkg_a_id}" [label = "pkg_a"];'.format_map(locals()) \
+            in lines
+    # an edge to every package with the depended-on name
+    pkg_b_id = ids['/ws/src/a/pkg_b']
+    for pkg_a_id in pkg_a_ids:
+        assert (
+            '  "{pkg_b_id}" -> "{pkg_a_id}" [color="#0000ff77:#ff000077"];'
+            .format_map(locals())) in lines
+    pkg_d_id = ids['/ws/src/pkg_d']
+    assert (
+        '  "{pkg_d_id}" -> "{pkg_b_id}" [color="#0000ff77"];'
+        .format_map(locals())) in lines
+
+
+def test_dot_cluster(capsys):
+    descriptors = _get_descriptors() | {
+        create_descriptor(
+            'pkg_e', '/ws/src/a/deep/nested/pkg_e', run={'pkg_a'}),
+    }
+    lines = _run_graph_verb(
+        capsys, descriptors=descriptors, dot=True, dot_cluster=True)
+    assert lines[:15] == [
+        'digraph graphname {',
+        '  "pkg_d";',
+        '  subgraph cluster_0 {',
+        '    label = "a";',
+        '    "pkg_b";',
+        '    "pkg_a";',
+        '    subgraph cluster_1 {',
+        '      label = "deep/nested";',
+        '      "pkg_e";',
+        '    }',
+        '  }',
+        '  subgraph cluster_2 {',
+        '    label = "c";',
+        '    "pkg_c";',
+        '  }',
+    ]
+
+    # the packages in deeper directories are part of the last cluster
+    lines = _run_graph_verb(
+        capsys, descriptors=descriptors, dot=True, dot_cluster=True,
+        dot_cluster_depth=1)
+    assert lines[:12] == [
+        'digraph graphname {',
+        '  "pkg_d";',
+        '  subgraph cluster_0 {',
+        '    label = "a";',
+        '    "pkg_b";',
+        '    "pkg_a";',
+        '    "pkg_e";',
+        '  }',
+        '  subgraph cluster_1 {',
+        '    label = "c";',
+        '    "pkg_c";',
+        '  }',
+    ]
+
+
+def test_dot_cluster_depth_argument():
+    parser = argparse.ArgumentParser()
+    GraphVerb().add_arguments(parser=parser)
+    args = parser.parse_args(['--dot-cluster-depth', '2'])
+    assert args.dot_cluster_depth == 2
+    for value in ('0', '-1', 'deep'):
+        with pytest.raises(SystemExit):
+            parser.parse_args(['--dot-cluster-depth', value])
+
+
+def test_collapse_by(capsys):
+    descriptors = _get_descriptors() | {
+        create_descriptor(
+            'lib_e', '/ws/src/a/deep/lib_e', build={'lib_f'},
+            run={'pkg_a'}),
+        create_descriptor('lib_f', '/ws/src/c/lib_f', test={'pkg_c'}),
+    }
+    lines = _run_graph_verb(
+        capsys, descriptors=descriptors, dot=True, collapse_by='path',
+        dot_cluster_depth=1)
+    assert lines == [
+        'digraph graphname {',
+        '  "a" [label = "a (3)"];',
+        '  "c" [label = "c (2)"];',
+        '  "." [label = ". (1)"];',
+        '  "a" -> "c" [label="1 (build)", color="#0000ff"];',
+        '  "." -> "a" [label="1 (build)", color="#0000ff"];',
+        '  "c" -> "a" [label="1 (run)", color="#ff0000"];',
+        '}',
+    ]
+
+    # edges between the same groups are merged
+    lines = _run_graph_verb(
+        capsys, descriptors=descriptors, dot=True, collapse_by='prefix',
+        dot_include_skipped=True, selected={'pkg_a', 'pkg_d'})
+    assert lines == [
+        'digraph graphname {',
+        '  "lib" [label = "lib (2)" color = "gray" fontcolor = "gray"];',
+        '  "pkg" [label = "pkg (4)"];',
+        '  "lib" -> "pkg" '
+        '[label="2 (run, test)", color="#ff000077:#d2b48c77"];',
+        '}',
+    ]
+
+    # directories only containing a single subdirectory are one level like
+    # the nested clusters
+    descriptors = _get_descriptors() | {
+        create_descriptor(
+            'pkg_e', '/ws/src/e/nested/deep/pkg_e', run={'pkg_a'}),
+    }
+    lines = _run_graph_verb(
+        capsys, descriptors=descriptors, dot=True, collapse_by='path',
+        dot_cluster_depth=1)
+    assert lines == [
+        'digraph graphname {',
+        '  "." [label = ". (1)"];',
+        '  "c" [label = "c (1)"];',
+        '  "e/nested/deep" [label = "e/nested/deep (1)"];',
+        '  "a" [label = "a (2)"];',
+        '  "." -> "a" [label="1 (build)", color="#0000ff"];',
+        '  "c" -> "a" [label="1 (run)", color="#ff0000"];',
+        '  "e/nested/deep" -> "a" [label="1 (run)", color="#ff0000"];',
+        '}',
+    ]
+
+
+def test_collapse_by_metadata(capsys):
+    descriptors = _get_descriptors()
+    for desc in descriptors:
+        if desc.name != 'pkg_d':
+            desc.metadata['layer'] = 'core' if desc.name == 'pkg_a' else 2
+    lines = _run_graph_verb(
+        capsys, descriptors=descriptors, dot=True,
+        collapse_by='metadata:layer')
+    assert lines == [
+        'digraph graphname {',
+        '  "(none)" [label = "(none) (1)"];',
+        '  "2" [label = "2 (2)"];',
+        '  "core" [label = "core (1)"];',
+        '  "(none)" -> "2" [label="1 (build)", color="#0000ff"];',
+        '  "2" -> "core" [label="1 (build, run)", color="#0000ff:#ff0000"];',
+        '}',
+    ]
+
+
+def test_collapse_by_escaped(capsys):
+    descriptors = _get_descriptors()
+    for desc in descriptors:
+        desc.metadata['layer'] = \
+            'say "core"' if desc.name == 'pkg_a' else 'C:\\top'
+    lines = _run_graph_verb(
+        capsys, descriptors=descriptors, dot=True,
+        collapse_by='metadata:layer')
+    assert lines == [
+        'digraph graphname {',
+        '  "C:\\\\top" [label = "C:\\\\top (3)"];',
+        '  "say \\"core\\"" [label = "say \\"core\\" (1)"];',
+        '  "C:\\\\top" -> "say \\"core\\"" '
+        '[label="1 (build, run)", color="#0000ff:#ff0000"];',
+        '}',
+    ]
+
+
+def test_dot_transitive_reduction(capsys):
+    descriptors = _get_descriptors() | {
+        create_descriptor(
+            'pkg_e', '/ws/src/pkg_e',
+            build={'pkg_a', 'pkg_c'}, test={'pkg_b'}),
+    }
+    lines = _run_graph_verb(
+        capsys, descriptors=descriptors, dot=True, transitive_reduction=True)
+    edges = [line for line in lines if '->' in line]
+    assert edges == [
+        '  "pkg_e" -> "pkg_c" [color="#0000ff"];',
+        '  "pkg_d" -> "pkg_b" [color="#0000ff"];',
+        '  "pkg_c" -> "pkg_b" [color="#ff0000"];',
+        '  "pkg_b" -> "pkg_a" [color="#0000ff:#ff0000"];',
+    ]
+
+    # the remaining edges to a skipped package are drawn as indirect edges
+    lines = _run_graph_verb(
+        capsys, descriptors=descriptors, dot=True, transitive_reduction=True,
+        selected={'pkg_a', 'pkg_c', 'pkg_e'})
+    edges = [line for line in lines if '->' in line]
+    assert edges == [
+        '  "pkg_e" -> "pkg_c" [color="#0000ff"];',
+        '  "pkg_c" -> "pkg_a" [color="#ff0000", style="dashed"];',
+    ]
+
+
+def test_critical_path(capsys):
+    lines = _run_graph_verb(capsys, critical_path=True, parallelism=True)
+    assert lines == [
+        'critical path: 3 packages',
+        '  pkg_a',
+        '  pkg_b',
+        '  pkg_c',
+        '',
+        'level 1: 1 packages',
+        'level 2: 1 packages',
+        'level 3: 2 packages',
+        'maximum useful workers: 2',
+        'average parallelism: 1.33',
+    ]
+
+    # the unselected packages are assumed to be built already
+    lines = _run_graph_verb(
+        capsys, parallelism=True, selected={'pkg_a', 'pkg_c', 'pkg_d'})
+    assert lines == [
+        'level 1: 1 packages',
+        'level 2: 2 packages',
+        'maximum useful workers: 2',
+        'average parallelism: 1.50',
+    ]
+
+
+def test_critical_path_durations(capsys, tmp_path):
+    # the packages without a duration take the average of 3.5s
+    path = tmp_path / 'durations.json'
+    path.write_text('{"pkg_a": 2, "pkg_d": 5, "unknown": 3.5}')
+    lines = _run_graph_verb(
+        capsys, critical_path=True, parallelism=True, durations=str(path))
+    assert lines == [
+        'critical path: 3 packages, 10.5s',
+        '  pkg_a  2.0s',
+        '  pkg_b  3.5s',
+        '  pkg_d  5.0s',
+        '',
+        'level 1: 1 packages',
+        'level 2: 1 packages',
+        'level 3: 2 packages',
+        'maximum useful workers: 2',
+        'total duration: 14.0s',
+        'average parallelism: 1.33',
+    ]
+
+    path = tmp_path / 'events.log'
+    path.write_text(
+        "[0.100s] (-) JobUnselected: {'identifier': 'pkg_x'}\n"
+        "[0.200s] (pkg_a) JobStarted: {'identifier': 'pkg_a'}\n"
+        "[1.200s] (pkg_a) JobEnded: {'identifier': 'pkg_a', 'rc': 0}\n"
+        "[1.300s] (pkg_b) JobStarted: {'identifier': 'pkg_b'}\n"
+        "[1.300s] (pkg_b) JobProgress: {'identifier': 'pkg_b'}\n"
+        "[4.300s] (pkg_b) JobEnded: {'identifier': 'pkg_b', 'rc': 0}\n")
+    lines = _run_graph_verb(
+        capsys, critical_path=True, durations=str(path))
+    assert lines == [
+        'critical path: 3 packages, 6.0s',
+        '  pkg_a  1.0s',
+        '  pkg_b  3.0s',
+        '  pkg_c  2.0s',
+    ]
+
+
+def test_critical_path_invalid(tmp_path):
+    args = SimpleNamespace(
+        critical_path=True, parallelism=False, dot=True, durations=None)
+    rc = GraphVerb().main(context=SimpleNamespace(args=args))
+    assert rc == 'The options --critical-path and --parallelism can not ' \
+        'be used together with --dot'
+
+    path = tmp_path / 'durations.json'
+    for content in ('{"pkg_a": "slow"}', 'no events'):
+        path.write_text(content)
+        args = SimpleNamespace(
+            critical_path=True, parallelism=False, dot=False,
+            durations=str(path))
+        rc = GraphVerb().main(context=SimpleNamespace(args=args))
+        assert rc.startswith(
+            "Failed to read the durations from '{path}': ".format_map(
+                locals()))
+
+
+def test_timings(capsys, monkeypatch):
+    report = io.StringIO()
+    monkeypatch.setattr(sys, 'stderr', report)
+    lines = _run_graph_verb(
+        capsys, dot=True, dot_cluster=True, transitive_reduction=True,
+        timings=True)
+    assert lines[0] == 'digraph graphname {'
+    report = report.getvalue()
+    for phase in (
+        'discovery', 'topological order', 'selection', 'output',
+        'edge collection', 'transitive reduction', 'printing',
+    ):
+        assert '\n  ' + phase in report or '\n    ' + phase in report
+    assert '  nodes: 4\n' in report
+    assert '  clusters: 2\n' in report
+    assert '  direct edges: 3\n' in report
+    assert '  indirect edges: 0\n' in report
+    assert '  lines: {}\n'.format(len(lines)) in report